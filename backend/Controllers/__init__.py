@@ -4,17 +4,46 @@ import logging
 logger = logging.getLogger(__name__)
 
 try:
-    from .genAi import load_gemini_model, prompt
+    from .genAi import load_gemini_model, prompt, prompt_stream, llm_cache_stats
 except ImportError as e:
     logger.error(f"Failed to import genAi functions: {e}")
     raise
 
 try:
-    from .pdfDataExtrection import pdf_to_text
+    from .llm_governor import LLMUnavailable, CircuitOpenError, LLMOverloaded, governor_stats
+except ImportError as e:
+    logger.error(f"Failed to import call governor: {e}")
+    raise
+
+try:
+    from .model_registry import get_model, model_status, start_model_warmup
+except ImportError as e:
+    logger.error(f"Failed to import model registry: {e}")
+    raise
+
+try:
+    from .pdfDataExtrection import pdf_to_text, extract_pdf, extraction_cache_stats, extraction_engine_stats
 except ImportError as e:
     logger.error(f"Failed to import pdf_to_text: {e}")
     raise
 
+try:
+    from .extraction_pool import (
+        run_extraction,
+        extraction_pool_stats,
+        ExtractionQueueFull,
+        ExtractionTimeout
+    )
+except ImportError as e:
+    logger.error(f"Failed to import extraction pool: {e}")
+    raise
+
+try:
+    from .resume_persistence import upsert_resume, upsert_resumes, ResumeBatchWriter
+except ImportError as e:
+    logger.error(f"Failed to import resume persistence: {e}")
+    raise
+
 try:
     from .resume_store import resume_store_data
 except ImportError as e:
@@ -22,16 +51,32 @@ except ImportError as e:
     raise
 
 try:
-    from .cover_letter import generate_cover_letter
+    from .resume_store_queue import enqueue_resume_store, start_resume_store_worker, resume_store_queue_stats
+except ImportError as e:
+    logger.error(f"Failed to import resume store queue: {e}")
+    raise
+
+try:
+    from .cover_letter import generate_cover_letter, generate_cover_letter_stream
 except ImportError as e:
     logger.error(f"Failed to import generate_cover_letter: {e}")
     raise
 
 try:
-    from .ats import generate_ats_score
+    from .ats import generate_ats_score, generate_ats_scores
 except ImportError as e:
     logger.error(f"Failed to import generate_ats_score: {e}")
     raise
 
+try:
+    from .screening import screening_jobs, screening_stats, read_zip_pdfs, ScreeningLimitExceeded
+except ImportError as e:
+    logger.error(f"Failed to import screening jobs: {e}")
+    raise
+
 # Export all functions for easy import
-__all__ = ['load_gemini_model', 'prompt', 'pdf_to_text', 'resume_store_data', 'generate_ats_score']
\ No newline at end of file
+__all__ = ['load_gemini_model', 'prompt', 'prompt_stream', 'llm_cache_stats', 'get_model', 'model_status', 'start_model_warmup',
+           'LLMUnavailable', 'CircuitOpenError', 'LLMOverloaded', 'governor_stats',
+           'pdf_to_text', 'extract_pdf', 'extraction_cache_stats', 'extraction_engine_stats',
+           'run_extraction', 'extraction_pool_stats', 'ExtractionQueueFull', 'ExtractionTimeout', 'upsert_resume', 'upsert_resumes', 'ResumeBatchWriter', 'resume_store_data', 'enqueue_resume_store', 'start_resume_store_worker', 'resume_store_queue_stats', 'generate_cover_letter', 'generate_cover_letter_stream', 'generate_ats_score', 'generate_ats_scores',
+           'screening_jobs', 'screening_stats', 'read_zip_pdfs', 'ScreeningLimitExceeded']
@@ -1,6 +1,11 @@
-from Controllers import prompt
+from Controllers import prompt, LLMUnavailable
+from Controllers.concurrency import map_io
+from Controllers.ats_prescore import prescore_matrix, top_k_indices, rerank
 import json
 
+# Per-item error for an LLM score refused by the call governor (breaker open, overloaded)
+AI_UNAVAILABLE_ERROR = 'AI service temporarily unavailable'
+
 def generate_ats_score(model, resume_text: str, job_description : str) -> float or None:
     """
     Generate an ATS (Applicant Tracking System) score for a resume given a job description using the provided AI model.
@@ -27,7 +32,7 @@ You are an expert ATS (Applicant Tracking System) simulator and recruitment anal
 
     try:
         # Call the model (assume OpenAI-like interface)
-        response = prompt(model, ats_prompt)
+        response = prompt(model, ats_prompt, endpoint="ats")
         print(type(response))  # Ensure the response is in the expected format
         print(f"Generated ATS score response: {response}")
         import re
@@ -40,7 +45,57 @@ You are an expert ATS (Applicant Tracking System) simulator and recruitment anal
             print("Could not find ats_score in response")
             return None
         
+    except LLMUnavailable:
+        # Let the route answer 503 instead of a generic failure
+        raise
     except Exception as e:
         # Optionally log error here if logger is available
         print(f"Error generating ATS score: {e}")
         return None
+
+def llm_score_error(error, ats_score):
+    """
+    Client-facing message for a failed LLM score, or None when it succeeded
+    """
+    if isinstance(error, LLMUnavailable):
+        return AI_UNAVAILABLE_ERROR
+    if error is not None or ats_score is None:
+        return 'ATS score generation failed'
+    return None
+
+def generate_ats_scores(model, resume_text: str, job_descriptions: list, max_concurrency: int, llm_top_k: int) -> list:
+    """
+    Score one resume against many job descriptions. Every posting gets a local
+    TF-IDF score (milliseconds, deterministic); only the llm_top_k best by local
+    score are sent to Gemini, with at most max_concurrency calls in flight.
+    Returns one entry per job description, in input order:
+    {'index', 'local_score', 'ats_score', 'llm_scored', 'llm_failed', 'rank', 'success', 'error'};
+    ats_score is the LLM score (None outside the top-k) and rank is the final
+    order after the LLM re-ranks the top-k; a top-k item whose LLM call failed
+    (llm_failed) keeps its place in the top-k by local score. A failed item
+    doesn't fail the batch.
+    """
+    local_scores = [float(score) for score in prescore_matrix([resume_text], job_descriptions)[0]]
+    shortlist = top_k_indices(local_scores, llm_top_k)
+
+    def score(index):
+        return generate_ats_score(model, resume_text, job_descriptions[index])
+
+    llm_scores = [None] * len(job_descriptions)
+    errors = [None] * len(job_descriptions)
+    for index, (ats_score, error) in zip(shortlist, map_io(score, shortlist, max_concurrency)):
+        errors[index] = llm_score_error(error, ats_score)
+        llm_scores[index] = ats_score if errors[index] is None else None
+
+    ranks = rerank(local_scores, llm_scores, shortlist)
+    shortlisted = set(shortlist)
+    return [{
+        'index': index,
+        'local_score': local_scores[index],
+        'ats_score': llm_scores[index],
+        'llm_scored': index in shortlisted,
+        'llm_failed': index in shortlisted and errors[index] is not None,
+        'rank': ranks[index],
+        'success': errors[index] is None,
+        'error': errors[index]
+    } for index in range(len(job_descriptions))]
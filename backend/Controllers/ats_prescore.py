@@ -0,0 +1,182 @@
+import re
+import logging
+from collections import Counter
+import numpy as np
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Tokens keep the characters that matter in skill names (c++, c#, node.js, ci/cd)
+TOKEN_PATTERN = re.compile(r"[a-z0-9][a-z0-9+#./-]*[a-z0-9+#]|[a-z0-9]")
+STOPWORDS = frozenset("""
+a about above after again all also am an and any are as at be been being below between both but by can could
+did do does doing down during each etc few for from further get had has have having he her here hers him his how
+i if in into is it its itself just me more most my no nor not now of off on once only or other our ours out over
+own per same she should so some such than that the their theirs them then there these they this those through to
+too under until up us very via was we were what when where which while who whom why will with within without would
+you your yours able across ability along among work working role team teams strong excellent good great new using
+use used including include includes experience experienced year years required requirements preferred plus must
+responsibilities responsible candidate candidates job position company opportunity looking seeking ideal etc
+""".split())
+# Blend of TF-IDF-weighted keyword coverage (how much of the posting the resume covers)
+# and cosine similarity (how similar the overall term profiles are)
+COVERAGE_WEIGHT = 0.7
+COSINE_WEIGHT = 0.3
+
+def tokenize(text):
+    """
+    Lower-cased unigrams and adjacent bigrams without stopwords
+    """
+    words = [w for w in TOKEN_PATTERN.findall((text or '').lower()) if w not in STOPWORDS and not w.isdigit()]
+    return words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+
+def _term_counts(documents):
+    """
+    Documents -> one Counter of token counts per document
+    """
+    return [Counter(tokenize(doc)) for doc in documents]
+
+def _term_matrix(counts, vocabulary):
+    """
+    Count matrix [n_docs, len(vocabulary)] restricted to the vocabulary's terms
+    """
+    matrix = np.zeros((len(counts), max(1, len(vocabulary))), dtype=np.float32)
+    for row, doc_counts in enumerate(counts):
+        for term, count in doc_counts.items():
+            col = vocabulary.get(term)
+            if col is not None:
+                matrix[row, col] = count
+    return matrix
+
+def prescore_matrix(resumes, job_descriptions):
+    """
+    Local ATS scores (0-100) for every resume/job pair: [len(resumes), len(job_descriptions)].
+
+    TF is sublinear (1 + log count) and IDF is smoothed over all the documents
+    being compared, so terms every document shares weigh little and rare skills
+    from the posting weigh most. Deterministic and milliseconds per batch.
+
+    Only the postings' terms get matrix columns: coverage and the cosine dot
+    product never involve anything else, and each resume's norm is summed from
+    its own counts, so memory doesn't grow with the resumes' vocabulary.
+    """
+    resumes, job_descriptions = list(resumes), list(job_descriptions)
+    if not resumes or not job_descriptions:
+        return np.zeros((len(resumes), len(job_descriptions)), dtype=np.float32)
+
+    resume_counts, job_counts = _term_counts(resumes), _term_counts(job_descriptions)
+    document_frequency = Counter()
+    for doc_counts in resume_counts + job_counts:
+        document_frequency.update(doc_counts.keys())
+    n_docs = len(resume_counts) + len(job_counts)
+
+    def idf(df):
+        return np.log((1.0 + n_docs) / (1.0 + df)) + 1.0
+
+    vocabulary = {}
+    for doc_counts in job_counts:
+        for term in doc_counts:
+            vocabulary.setdefault(term, len(vocabulary))
+    counts = _term_matrix(resume_counts + job_counts, vocabulary)
+    present = counts > 0
+    tf = np.where(present, 1.0 + np.log(np.maximum(counts, 1.0)), 0.0)
+    term_idf = np.ones(counts.shape[1])
+    for term, col in vocabulary.items():
+        term_idf[col] = idf(document_frequency[term])
+    weights = tf * term_idf
+
+    resume_w, job_w = weights[:len(resumes)], weights[len(resumes):]
+    resume_present = present[:len(resumes)].astype(np.float32)
+
+    # Share of each posting's TF-IDF mass whose terms appear in the resume
+    job_mass = job_w.sum(axis=1)
+    coverage = (resume_present @ job_w.T) / np.maximum(job_mass, 1e-9)
+
+    # Resume norms cover every resume term, not just the postings' columns
+    resume_norms = np.array([
+        np.sqrt(sum(((1.0 + np.log(count)) * idf(document_frequency[term])) ** 2
+                    for term, count in doc_counts.items()))
+        for doc_counts in resume_counts
+    ]).reshape(-1, 1)
+    resume_unit = resume_w / np.maximum(resume_norms, 1e-9)
+    job_unit = job_w / np.maximum(np.linalg.norm(job_w, axis=1, keepdims=True), 1e-9)
+    cosine = resume_unit @ job_unit.T
+
+    scores = 100.0 * (COVERAGE_WEIGHT * coverage + COSINE_WEIGHT * cosine)
+    scores[:, job_mass == 0] = 0.0
+    return np.round(np.clip(scores, 0.0, 100.0), 1)
+
+def prescore_ats(resume_text, job_description):
+    """
+    Local ATS score (0-100) for one resume against one job description
+    """
+    return float(prescore_matrix([resume_text], [job_description])[0, 0])
+
+def keyword_report(resume_text, job_description, limit=10):
+    """
+    The posting's most frequent terms (ties in order of first appearance), split
+    into those the resume matches and those it misses
+    """
+    resume_counts, job_counts = _term_counts([resume_text, job_description])
+    terms = sorted(job_counts, key=lambda term: -job_counts[term])
+    matched = [t for t in terms if resume_counts[t] > 0][:limit]
+    missing = [t for t in terms if resume_counts[t] == 0][:limit]
+    return {'matched': matched, 'missing': missing}
+
+def _ranks(values):
+    order = np.argsort(values, kind='stable')
+    ranks = np.empty(len(values), dtype=np.float64)
+    ranks[order] = np.arange(len(values), dtype=np.float64)
+    # Average the ranks of ties
+    for value in np.unique(values):
+        tied = values == value
+        ranks[tied] = ranks[tied].mean()
+    return ranks
+
+def score_agreement(local_scores, llm_scores):
+    """
+    How well the local and LLM scores agree over the pairs that have both:
+    Spearman rank correlation, Pearson correlation and mean absolute difference.
+    """
+    pairs = [(l, m) for l, m in zip(local_scores, llm_scores) if l is not None and m is not None]
+    report = {'pairs': len(pairs), 'spearman': None, 'pearson': None, 'mean_abs_diff': None}
+    if not pairs:
+        return report
+    local, llm = (np.asarray(values, dtype=np.float64) for values in zip(*pairs))
+    report['mean_abs_diff'] = round(float(np.abs(local - llm).mean()), 2)
+    if len(pairs) >= 2 and local.std() > 0 and llm.std() > 0:
+        report['pearson'] = round(float(np.corrcoef(local, llm)[0, 1]), 4)
+        local_ranks, llm_ranks = _ranks(local), _ranks(llm)
+        if local_ranks.std() > 0 and llm_ranks.std() > 0:
+            report['spearman'] = round(float(np.corrcoef(local_ranks, llm_ranks)[0, 1]), 4)
+    return report
+
+def top_k_indices(scores, k):
+    """
+    Indices of the k highest scores, best first (ties keep input order)
+    """
+    if k <= 0:
+        return []
+    order = np.argsort(-np.asarray(scores, dtype=np.float64), kind='stable')
+    return [int(i) for i in order[:k]]
+
+def rerank(local_scores, llm_scores, shortlisted=None):
+    """
+    Final ranks (1 = best): the shortlist (indices sent to the LLM; by default the
+    items that have an LLM score) comes first, ordered by LLM score, or by local
+    score where the LLM call failed, so a transient error doesn't bury the best
+    local candidate. The rest follow by local score. Ties keep input order.
+    """
+    if shortlisted is None:
+        shortlisted = [i for i, score in enumerate(llm_scores) if score is not None]
+    shortlisted = set(shortlisted)
+
+    def key(i):
+        score = llm_scores[i] if llm_scores[i] is not None else local_scores[i]
+        return (i not in shortlisted, -score, i)
+
+    order = sorted(range(len(local_scores)), key=key)
+    ranks = [0] * len(order)
+    for rank, index in enumerate(order, start=1):
+        ranks[index] = rank
+    return ranks
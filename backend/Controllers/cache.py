@@ -0,0 +1,209 @@
+import os
+import json
+import time
+import sqlite3
+import logging
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+
+class LRUCache:
+    """
+    Thread-safe in-process LRU cache with optional per-entry TTL
+    """
+
+    def __init__(self, max_items=128, ttl=None):
+        self.max_items = max(0, int(max_items))
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is _MISSING:
+                return default
+            value, expires_at = entry
+            if expires_at is not None and expires_at < time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def put(self, key, value):
+        if self.max_items == 0:
+            return
+        expires_at = time.monotonic() + self.ttl if self.ttl else None
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_items:
+                self._data.popitem(last=False)
+
+    def pop(self, key, default=None):
+        with self._lock:
+            entry = self._data.pop(key, _MISSING)
+            return default if entry is _MISSING else entry[0]
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+class SQLiteCacheStore:
+    """
+    Persistent key/value store backed by a SQLite file, shared between processes.
+    Values are stored as JSON and evicted least-recently-used first once the
+    total payload size exceeds max_bytes.
+    """
+
+    def __init__(self, path, max_bytes=256 * 1024 * 1024, ttl=None, table='cache_entries'):
+        self.path = path
+        self.max_bytes = int(max_bytes)
+        self.ttl = ttl
+        self.table = table
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {self.table} ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, size INTEGER NOT NULL, "
+                "created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            conn.execute(
+                f"CREATE INDEX IF NOT EXISTS ix_{self.table}_accessed_at ON {self.table} (accessed_at)"
+            )
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=5)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def get(self, key, default=None):
+        now = time.time()
+        with self._connect() as conn:
+            row = conn.execute(
+                f"SELECT value, created_at FROM {self.table} WHERE key = ?", (key,)
+            ).fetchone()
+            if not row:
+                return default
+            value, created_at = row
+            if self.ttl and created_at + self.ttl < now:
+                conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+                return default
+            conn.execute(f"UPDATE {self.table} SET accessed_at = ? WHERE key = ?", (now, key))
+        return json.loads(value)
+
+    def put(self, key, value):
+        payload = json.dumps(value)
+        size = len(payload.encode('utf-8'))
+        if size > self.max_bytes:
+            logger.warning(f"Cache entry of {size} bytes exceeds store limit, not persisted")
+            return
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                f"INSERT OR REPLACE INTO {self.table} (key, value, size, created_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, payload, size, now, now),
+            )
+            self._evict(conn)
+
+    def _evict(self, conn):
+        total = conn.execute(f"SELECT COALESCE(SUM(size), 0) FROM {self.table}").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        evicted = 0
+        for key, size in conn.execute(
+            f"SELECT key, size FROM {self.table} ORDER BY accessed_at ASC"
+        ).fetchall():
+            if total <= self.max_bytes:
+                break
+            conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+            total -= size
+            evicted += 1
+        logger.info(f"Evicted {evicted} entries from {self.path}")
+
+    def stats(self):
+        with self._connect() as conn:
+            entries, total = conn.execute(
+                f"SELECT COUNT(*), COALESCE(SUM(size), 0) FROM {self.table}"
+            ).fetchone()
+        return {'entries': entries, 'bytes': total, 'max_bytes': self.max_bytes}
+
+
+class TieredCache:
+    """
+    Two-tier cache: an in-process LRU in front of an optional persistent store.
+    Keeps hit/miss counters per tier so the cache can be sized from real traffic.
+    """
+
+    def __init__(self, name, memory, store=None):
+        self.name = name
+        self.memory = memory
+        self.store = store
+        self._lock = threading.Lock()
+        self._counters = {'memory_hits': 0, 'store_hits': 0, 'misses': 0, 'writes': 0, 'errors': 0}
+
+    def _count(self, counter):
+        with self._lock:
+            self._counters[counter] += 1
+
+    def get(self, key):
+        value = self.memory.get(key, _MISSING)
+        if value is not _MISSING:
+            self._count('memory_hits')
+            return value
+
+        if self.store is not None:
+            try:
+                value = self.store.get(key, _MISSING)
+            except Exception as e:
+                logger.warning(f"{self.name} cache store read failed: {e}")
+                self._count('errors')
+                value = _MISSING
+            if value is not _MISSING:
+                self._count('store_hits')
+                self.memory.put(key, value)
+                return value
+
+        self._count('misses')
+        return None
+
+    def put(self, key, value):
+        self.memory.put(key, value)
+        self._count('writes')
+        if self.store is not None:
+            try:
+                self.store.put(key, value)
+            except Exception as e:
+                logger.warning(f"{self.name} cache store write failed: {e}")
+                self._count('errors')
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._counters)
+        lookups = stats['memory_hits'] + stats['store_hits'] + stats['misses']
+        stats['hit_rate'] = round((lookups - stats['misses']) / lookups, 4) if lookups else 0.0
+        stats['memory_entries'] = len(self.memory)
+        stats['memory_max_items'] = self.memory.max_items
+        if self.store is not None:
+            try:
+                stats['store'] = self.store.stats()
+            except Exception as e:
+                stats['store'] = {'error': str(e)}
+        return stats
@@ -0,0 +1,149 @@
+import time
+import logging
+import threading
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from config import Config
+
+try:
+    import gevent
+except ImportError:  # pragma: no cover - gevent is only needed by run.py
+    gevent = None
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+def _on_gevent_hub():
+    """
+    True when called from a greenlet served by gevent's WSGIServer (main thread, no monkey patching)
+    """
+    return gevent is not None and threading.current_thread() is threading.main_thread()
+
+def wait_for(future, timeout=None):
+    """
+    Wait for a concurrent.futures.Future without blocking the gevent hub.
+    Under gevent the blocking wait is moved to the hub's native thread pool so
+    other greenlets (health checks, other requests) keep running; elsewhere it
+    is a plain future.result(). Raises concurrent.futures.TimeoutError on timeout.
+    """
+    return _cooperative(future.result, timeout)
+
+def _cooperative(fn, *args):
+    """
+    Call a blocking fn(*args) on the hub's native thread pool when running under gevent
+    """
+    if _on_gevent_hub():
+        return gevent.get_hub().threadpool.apply(fn, args)
+    return fn(*args)
+
+_io_pool = None
+_io_pool_lock = threading.Lock()
+
+def _get_io_pool():
+    global _io_pool
+    with _io_pool_lock:
+        if _io_pool is None:
+            _io_pool = ThreadPoolExecutor(max_workers=Config.LLM_WORKERS, thread_name_prefix='llm-io')
+        return _io_pool
+
+def sleep(seconds):
+    """
+    Sleep without blocking the gevent hub (gevent.sleep on the hub, time.sleep elsewhere)
+    """
+    if _on_gevent_hub():
+        gevent.sleep(seconds)
+    else:
+        time.sleep(seconds)
+
+def submit_io(fn, *args, **kwargs):
+    """
+    Run blocking network I/O (Gemini calls) on the shared native thread pool.
+    Returns a Future; wait on it with wait_for() so the gevent hub keeps serving.
+    """
+    return _get_io_pool().submit(fn, *args, **kwargs)
+
+def map_io(fn, items, max_concurrency, executor=None):
+    """
+    Run fn(item) for every item on the I/O pool (or the given executor) with at
+    most max_concurrency in flight. Returns [(result, error)] in input order;
+    one failing item doesn't affect the others.
+    """
+    items = list(items)
+    results = [None] * len(items)
+    pending = {}
+    next_index = 0
+    max_concurrency = max(1, int(max_concurrency))
+    while next_index < len(items) or pending:
+        while next_index < len(items) and len(pending) < max_concurrency:
+            future = executor.submit(fn, items[next_index]) if executor else submit_io(fn, items[next_index])
+            pending[future] = next_index
+            next_index += 1
+        done, _ = _cooperative(wait, list(pending), None, FIRST_COMPLETED)
+        for future in done:
+            index = pending.pop(future)
+            error = future.exception()
+            results[index] = (None, error) if error is not None else (future.result(), None)
+    return results
+
+def run_in_background(app, fn, *args, description=None, **kwargs):
+    """
+    Fire-and-forget fn(*args) inside an application context (needed for DB access).
+    Failures are logged, never raised to the request that started the work.
+    """
+    description = description or getattr(fn, '__name__', 'background task')
+
+    def _task():
+        try:
+            with app.app_context():
+                result = fn(*args, **kwargs)
+            logger.info(f"Background task {description} finished")
+            return result
+        except Exception as e:
+            logger.error(f"Background task {description} failed: {e}")
+            raise
+
+    return submit_io(_task)
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls with the same key: the first caller (the leader)
+    runs fn, later callers wait for its result (or exception) instead of
+    repeating the work. Nothing is remembered once the call finishes.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self._counters = {'leaders': 0, 'coalesced': 0}
+
+    def do(self, key, fn, *args, **kwargs):
+        """
+        Returns (result, shared); shared is True when another caller's result was reused
+        """
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = self._calls[key] = Future()
+                self._counters['leaders'] += 1
+            else:
+                self._counters['coalesced'] += 1
+
+        if not leader:
+            return wait_for(future), True
+
+        try:
+            result = fn(*args, **kwargs)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result, False
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+
+    def stats(self):
+        with self._lock:
+            return {**self._counters, 'in_flight': len(self._calls)}
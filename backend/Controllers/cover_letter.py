@@ -1,14 +1,10 @@
-from Controllers import prompt
+from Controllers import prompt, prompt_stream
 
-def generate_cover_letter(model, job_description: str, resume_text: str,company_name: str, hiring_manager_name: str,desired_tone: str) -> str:
+def build_cover_letter_prompt(job_description: str, resume_text: str, company_name: str, hiring_manager_name: str, desired_tone: str) -> str:
     """
-    Generate a cover letter using the AI model.
+    Build the cover letter prompt shared by the blocking and streaming endpoints.
     """
-    print(company_name)
-    print(hiring_manager_name)
-    print(desired_tone)
-
-    prompt_text = f"""
+    return f"""
 You are an expert career coach and a highly skilled copywriter specializing in creating compelling job application materials. Your task is to write a personalized and impactful cover letter based on the provided resume details, job description, and additional user preferences.
 
 **Goal:** Produce a cover letter that effectively highlights the candidate's most relevant skills and experiences, demonstrates a strong understanding of the role and company, and persuades the hiring manager to consider them for an interview.
@@ -52,6 +48,23 @@ You are an expert career coach and a highly skilled copywriter specializing in c
 * **Conciseness:** Keep the letter to a single page, ideally 3-5 paragraphs.
 * **Proofread:** Ensure there are no grammatical errors, typos, or awkward phrasing.
 """
-    response = prompt(model, prompt_text)
+
+def generate_cover_letter(model, job_description: str, resume_text: str,company_name: str, hiring_manager_name: str,desired_tone: str) -> str:
+    """
+    Generate a cover letter using the AI model.
+    """
+    print(company_name)
+    print(hiring_manager_name)
+    print(desired_tone)
+
+    prompt_text = build_cover_letter_prompt(job_description, resume_text, company_name, hiring_manager_name, desired_tone)
+    response = prompt(model, prompt_text, endpoint="cover_letter")
     print(f"Generated cover letter: {response}")
-    return response
\ No newline at end of file
+    return response
+
+def generate_cover_letter_stream(model, job_description: str, resume_text: str, company_name: str, hiring_manager_name: str, desired_tone: str):
+    """
+    Stream the cover letter as text chunks (see prompt_stream).
+    """
+    prompt_text = build_cover_letter_prompt(job_description, resume_text, company_name, hiring_manager_name, desired_tone)
+    return prompt_stream(model, prompt_text, endpoint="cover_letter")
\ No newline at end of file
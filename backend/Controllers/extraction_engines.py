@@ -0,0 +1,279 @@
+import io
+import abc
+import time
+import logging
+import threading
+import pdfplumber
+from pdfminer.pdftypes import resolve1
+from Controllers.ocr import ocr_pdf
+
+try:
+    import pypdfium2 as pdfium
+except ImportError:  # pragma: no cover - pinned in requirements, optional at runtime
+    pdfium = None
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+
+class ExtractionBudget:
+    """
+    Page and wall-clock limits for one extraction. Engines ask allow_page() before
+    every page; once a limit is hit extraction stops early and the result is
+    flagged as truncated. The deadline is wall-clock time so it survives being
+    pickled into a worker process, and OCR also hands it to poppler and tesseract
+    so a single slow page can't overrun it.
+    """
+
+    def __init__(self, max_pages=None, max_seconds=None, max_render_pixels=None):
+        self.max_pages = max_pages or None
+        self.max_render_pixels = max_render_pixels or None
+        self.deadline = time.time() + max_seconds if max_seconds else None
+        self.truncation_reason = None
+        # Pages in the whole document, recorded by whichever engine opens it first
+        self.document_pages = None
+
+    @property
+    def truncated(self):
+        return self.truncation_reason is not None
+
+    def remaining(self):
+        if self.deadline is None:
+            return None
+        return max(0.0, self.deadline - time.time())
+
+    def truncate(self, reason):
+        if self.truncation_reason is None:
+            self.truncation_reason = reason
+            logger.warning(f"Extraction stopped early: {reason} limit reached")
+
+    def allow_page(self, page_num):
+        if self.max_pages and page_num > self.max_pages:
+            self.truncate('pages')
+            return False
+        if self.deadline is not None and time.time() >= self.deadline:
+            self.truncate('time')
+            return False
+        return True
+
+
+class ExtractionEngine(abc.ABC):
+    """
+    Base class for PDF text extraction engines.
+
+    extract() takes the PDF as bytes or a path and returns one dict per page:
+    {'page', 'text', 'text_layer', 'seconds'}, plus 'blank' from engines that
+    can tell a blank page from one they failed to read. An optional ExtractionBudget
+    stops it early; pages past the limit are simply not returned.
+    Throughput (chars per second) is recorded for every run so the default
+    engine can be chosen from production numbers.
+    """
+
+    name = None
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats = {'runs': 0, 'failures': 0, 'pages': 0, 'blank_pages': 0, 'chars': 0, 'seconds': 0.0}
+
+    def is_available(self):
+        return True
+
+    @abc.abstractmethod
+    def _extract(self, source, page_numbers, budget):
+        """
+        Extract the requested pages (1-based, None for all) within budget
+        """
+
+    def extract(self, source, page_numbers=None, budget=None):
+        started = time.perf_counter()
+        budget = budget or ExtractionBudget()
+        try:
+            pages = self._extract(source, page_numbers, budget)
+        except Exception:
+            with self._lock:
+                self._stats['failures'] += 1
+            raise
+        elapsed = time.perf_counter() - started
+        with self._lock:
+            self._stats['runs'] += 1
+            self._stats['pages'] += len(pages)
+            self._stats['blank_pages'] += sum(1 for page in pages if page.get('blank'))
+            self._stats['chars'] += sum(len(page['text']) for page in pages)
+            self._stats['seconds'] += elapsed
+        return pages
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+        stats['available'] = self.is_available()
+        stats['seconds'] = round(stats['seconds'], 4)
+        stats['chars_per_second'] = round(stats['chars'] / stats['seconds'], 1) if stats['seconds'] else None
+        return stats
+
+
+class PdfplumberEngine(ExtractionEngine):
+    """
+    Text-layer extraction with pdfplumber (pure Python, layout aware, slowest)
+    """
+
+    name = 'pdfplumber'
+
+    @staticmethod
+    def _has_text_layer(page):
+        """
+        Cheap check for a text layer: the page (or a form XObject it draws) declares fonts.
+        Pages without one are image-only and skip the layout pass.
+        """
+        try:
+            resources = resolve1(page.page_obj.resources) or {}
+            if resolve1(resources.get('Font')):
+                return True
+            xobjects = resolve1(resources.get('XObject')) or {}
+            for xobject in xobjects.values():
+                stream = resolve1(xobject)
+                subtype = getattr(stream, 'attrs', {}).get('Subtype')
+                if getattr(subtype, 'name', None) == 'Form':
+                    return True
+            return False
+        except Exception:
+            # When in doubt take the text path, OCR still runs if it comes back empty
+            return True
+
+    def _extract(self, source, page_numbers, budget):
+        results = []
+        if isinstance(source, (bytes, bytearray)):
+            source = io.BytesIO(source)
+        with pdfplumber.open(source) as pdf:
+            budget.document_pages = len(pdf.pages)
+            wanted = set(page_numbers) if page_numbers else None
+            for page_num, page in enumerate(pdf.pages, start=1):
+                if wanted is not None and page_num not in wanted:
+                    continue
+                if not budget.allow_page(page_num):
+                    break
+                page_started = time.perf_counter()
+                page_text = ""
+                has_text_layer = self._has_text_layer(page)
+                if has_text_layer:
+                    try:
+                        page_text = page.extract_text() or ""
+                    except Exception as e:
+                        logger.warning(f"Failed to extract text from page {page_num}: {e}")
+                results.append({
+                    'page': page_num,
+                    'text': page_text,
+                    'text_layer': has_text_layer,
+                    'seconds': time.perf_counter() - page_started
+                })
+        return results
+
+
+class PdfiumEngine(ExtractionEngine):
+    """
+    Text-layer extraction with pypdfium2 (native PDFium, fastest)
+    """
+
+    name = 'pdfium'
+
+    def is_available(self):
+        return pdfium is not None
+
+    def _extract(self, source, page_numbers, budget):
+        if pdfium is None:
+            raise RuntimeError("pypdfium2 is not installed")
+
+        results = []
+        pdf = pdfium.PdfDocument(source)
+        try:
+            budget.document_pages = len(pdf)
+            numbers = page_numbers or range(1, len(pdf) + 1)
+            for page_num in numbers:
+                if not budget.allow_page(page_num):
+                    break
+                page_started = time.perf_counter()
+                page_text = ""
+                has_text_layer = False
+                page = pdf[page_num - 1]
+                try:
+                    textpage = page.get_textpage()
+                    try:
+                        has_text_layer = textpage.count_chars() > 0
+                        if has_text_layer:
+                            page_text = textpage.get_text_range().replace("\r\n", "\n")
+                    finally:
+                        textpage.close()
+                except Exception as e:
+                    logger.warning(f"Failed to extract text from page {page_num}: {e}")
+                finally:
+                    page.close()
+                results.append({
+                    'page': page_num,
+                    'text': page_text,
+                    'text_layer': has_text_layer,
+                    'seconds': time.perf_counter() - page_started
+                })
+        finally:
+            pdf.close()
+        return results
+
+
+class OcrEngine(ExtractionEngine):
+    """
+    Rendering + tesseract OCR, for pages without a usable text layer
+    """
+
+    name = 'ocr'
+
+    def _extract(self, source, page_numbers, budget):
+        return [
+            {'page': page['page'], 'text': page['text'], 'text_layer': False, 'blank': page['blank'],
+             'seconds': page['seconds']}
+            for page in ocr_pdf(source, page_numbers=page_numbers, budget=budget)
+        ]
+
+
+ENGINES = {engine.name: engine for engine in (PdfiumEngine(), PdfplumberEngine(), OcrEngine())}
+
+# Text-layer engines tried in order by the "auto" mode, fastest first
+AUTO_TEXT_ENGINES = ('pdfium', 'pdfplumber')
+
+def get_engine(name):
+    """
+    Look up an engine by name, raising ValueError for unknown names
+    """
+    try:
+        return ENGINES[name]
+    except KeyError:
+        raise ValueError(f"Unknown PDF extraction engine: {name}")
+
+def validate_engine_setting(mode):
+    """
+    Check a PDF_EXTRACTION_ENGINE value at startup, raising ValueError for unknown
+    engines or ones whose library is missing, so a typo fails the deploy instead
+    of every upload
+    """
+    mode = (mode or 'auto').lower()
+    if mode in ('auto', 'ocr'):
+        return mode
+    engine = get_engine(mode)
+    if not engine.is_available():
+        raise ValueError(f"PDF extraction engine {mode} is configured but not installed")
+    return mode
+
+def text_engines_for(mode):
+    """
+    Text-layer engines to try for the configured mode. The "ocr" mode has none:
+    every page is rendered and OCRed.
+    """
+    mode = (mode or 'auto').lower()
+    if mode == 'auto':
+        return [ENGINES[name] for name in AUTO_TEXT_ENGINES if ENGINES[name].is_available()]
+    if mode == 'ocr':
+        return []
+    return [get_engine(mode)]
+
+def engine_stats():
+    """
+    Throughput counters for every registered engine
+    """
+    return {name: engine.stats() for name, engine in ENGINES.items()}
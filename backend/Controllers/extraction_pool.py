@@ -0,0 +1,232 @@
+import os
+import queue
+import signal
+import logging
+import threading
+import multiprocessing
+from config import Config
+from Controllers.concurrency import _cooperative
+from Controllers.pdfDataExtrection import extract_pdf
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+
+class ExtractionQueueFull(Exception):
+    """Raised when too many extraction jobs are already queued or running"""
+
+
+class ExtractionTimeout(Exception):
+    """Raised when an extraction job exceeds its time limit"""
+
+
+def _worker_main(conn):
+    """
+    Extraction worker loop: run (fn, args) jobs received on conn until told to stop.
+    The worker leads its own process group so a timed-out job can be killed along
+    with everything it started (pdftoppm, tesseract). OCR fans pages out over
+    threads inside the worker, so nothing outlives a killed worker.
+    """
+    if hasattr(os, 'setsid'):
+        os.setsid()
+    while True:
+        try:
+            job = conn.recv()
+        except (EOFError, KeyboardInterrupt):
+            return
+        if job is None:
+            return
+        fn, args = job
+        try:
+            reply = ('ok', fn(*args))
+        except Exception as e:
+            reply = ('error', e)
+        try:
+            conn.send(reply)
+        except Exception as e:
+            # Unpicklable exception or result: report it as text instead
+            conn.send(('error', RuntimeError(f"Extraction result could not be returned: {e}")))
+
+
+class _Worker:
+    """One extraction process and the pipe its jobs go through"""
+
+    def __init__(self, context):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(target=_worker_main, args=(child_conn,), daemon=True)
+        self.process.start()
+        child_conn.close()
+        self.jobs = 0
+
+    def kill(self):
+        # The whole process group: the worker and any renderer/OCR children it spawned
+        try:
+            if hasattr(os, 'killpg'):
+                os.killpg(self.process.pid, signal.SIGKILL)
+            else:
+                self.process.kill()
+        except ProcessLookupError:
+            pass
+        except Exception as e:
+            logger.warning(f"Failed to kill extraction worker {self.process.pid}: {e}")
+        self.process.join(timeout=5)
+        self.conn.close()
+
+    def stop(self):
+        try:
+            self.conn.send(None)
+        except Exception:
+            pass
+        self.process.join(timeout=5)
+        if self.process.is_alive():
+            self.kill()
+        else:
+            self.conn.close()
+
+
+class ExtractionPool:
+    """
+    Dedicated worker processes for CPU-bound PDF extraction.
+
+    Keeps pdfplumber/tesseract work off the gevent hub and caps the number of
+    queued jobs. Each job's timeout starts when a worker picks it up, so time
+    spent queued doesn't count. A job that overruns is stopped by killing only
+    the worker (process group) running it; other jobs carry on. Workers are
+    replaced after a fixed number of jobs.
+    """
+
+    def __init__(self, workers, max_queue, timeout, max_jobs_per_worker):
+        self.workers = max(1, int(workers))
+        self.max_queue = max(1, int(max_queue))
+        self.timeout = timeout
+        self.max_jobs_per_worker = max(1, int(max_jobs_per_worker))
+        self._lock = threading.Lock()
+        # spawn keeps the gevent hub, open sockets and SQLite handles out of the workers
+        self._context = multiprocessing.get_context('spawn')
+        # Idle workers; None is a free slot where a worker is started on demand
+        self._idle = queue.Queue()
+        for _ in range(self.workers):
+            self._idle.put(None)
+        self._in_flight = 0
+        self._busy = 0
+        self._counters = {'submitted': 0, 'completed': 0, 'failed': 0, 'rejected': 0, 'timeouts': 0, 'recycles': 0}
+
+    def _checkout(self):
+        worker = self._idle.get()
+        if worker is None or not worker.process.is_alive():
+            if worker is not None:
+                worker.kill()
+            worker = _Worker(self._context)
+        with self._lock:
+            self._busy += 1
+        return worker
+
+    def _checkin(self, worker, retire=False):
+        with self._lock:
+            self._busy -= 1
+        if retire:
+            self._idle.put(None)
+            return
+        if worker.jobs >= self.max_jobs_per_worker:
+            logger.info(f"Recycling extraction worker {worker.process.pid} after {worker.jobs} jobs")
+            with self._lock:
+                self._counters['recycles'] += 1
+            worker.stop()
+            self._idle.put(None)
+            return
+        self._idle.put(worker)
+
+    def _run_blocking(self, fn, args, timeout):
+        # Runs on a native thread: waits for a free worker, then for the job itself
+        worker = self._checkout()
+        try:
+            worker.conn.send((fn, args))
+            if not worker.conn.poll(timeout):
+                logger.error(f"Extraction job exceeded {timeout}s, killing worker {worker.process.pid}")
+                with self._lock:
+                    self._counters['timeouts'] += 1
+                worker.kill()
+                self._checkin(worker, retire=True)
+                raise ExtractionTimeout(f"Extraction exceeded {timeout} seconds")
+            status, payload = worker.conn.recv()
+        except ExtractionTimeout:
+            raise
+        except (EOFError, OSError) as e:
+            worker.kill()
+            self._checkin(worker, retire=True)
+            raise RuntimeError(f"Extraction worker died: {e}")
+        worker.jobs += 1
+        self._checkin(worker)
+        if status == 'error':
+            raise payload
+        return payload
+
+    def run(self, fn, *args, timeout=None):
+        """
+        Run fn(*args) in a worker process and wait for it cooperatively
+        """
+        timeout = timeout or self.timeout
+        with self._lock:
+            if self._in_flight >= self.max_queue:
+                self._counters['rejected'] += 1
+                raise ExtractionQueueFull(f"{self._in_flight} extraction jobs already in progress")
+            self._in_flight += 1
+            self._counters['submitted'] += 1
+        try:
+            result = _cooperative(self._run_blocking, fn, args, timeout)
+            with self._lock:
+                self._counters['completed'] += 1
+            return result
+        except ExtractionTimeout:
+            raise
+        except Exception:
+            with self._lock:
+                self._counters['failed'] += 1
+            raise
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+
+    def shutdown(self):
+        while True:
+            try:
+                worker = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            if worker is not None:
+                worker.stop()
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._counters)
+            stats['in_flight'] = self._in_flight
+            stats['busy'] = self._busy
+        stats.update({
+            'workers': self.workers,
+            'max_queue': self.max_queue,
+            'timeout': self.timeout,
+            'max_jobs_per_worker': self.max_jobs_per_worker
+        })
+        return stats
+
+
+extraction_pool = ExtractionPool(
+    workers=Config.EXTRACTION_WORKERS,
+    max_queue=Config.EXTRACTION_MAX_QUEUE,
+    timeout=Config.EXTRACTION_TIMEOUT,
+    max_jobs_per_worker=Config.EXTRACTION_MAX_JOBS_PER_WORKER,
+)
+
+def extraction_pool_stats():
+    """
+    Queue depth and job counters of the extraction pool
+    """
+    return extraction_pool.stats()
+
+def run_extraction(source, hints=None):
+    """
+    extract_pdf() with the extraction itself running in the worker pool.
+    source is the PDF content (bytes) or a path to it, hints an optional preflight report.
+    Raises ExtractionQueueFull or ExtractionTimeout when the pool is saturated or the job is too slow.
+    """
+    return extract_pdf(source, runner=extraction_pool.run, hints=hints)
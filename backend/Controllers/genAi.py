@@ -1,13 +1,22 @@
 import os
+import json
+import hashlib
 import logging
+import time
+import threading
 import google.generativeai as genai
+from config import Config
+from Controllers.cache import LRUCache, SQLiteCacheStore, TieredCache
+from Controllers.concurrency import SingleFlight, submit_io, wait_for
+from Controllers.llm_governor import governor, LLMUnavailable
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
-def load_gemini_model():
+def load_gemini_model(model_name=None):
     """
-    Load and configure Gemini model with comprehensive error handling
+    Configure the SDK and build the Gemini model object. No request is sent:
+    connectivity is checked separately by the model registry's background probe.
     """
     try:
         # Check if API key is available
@@ -25,18 +34,7 @@ def load_gemini_model():
         
         # Initialize model
         try:
-            model = genai.GenerativeModel("gemini-2.5-flash")
-            
-            # Test the model with a simple prompt
-            try:
-                test_response = model.generate_content("Hello")
-                if not test_response or not test_response.text:
-                    logger.warning("Gemini model test returned empty response")
-            except Exception as e:
-                logger.warning(f"Gemini model test failed (model may still work): {e}")
-            
-            return model
-            
+            return genai.GenerativeModel(model_name or Config.GEMINI_MODEL)
         except Exception as e:
             logger.error(f"Failed to initialize Gemini model: {e}")
             return None
@@ -45,10 +43,121 @@ def load_gemini_model():
         logger.error(f"Unexpected error in load_gemini_model: {e}")
         return None
 
-def prompt(model, *args):
+def _build_response_cache():
+    """
+    In-process LRU with TTL, optionally backed by a SQLite store shared by all worker processes
+    """
+    store = None
+    if Config.LLM_CACHE_PATH:
+        try:
+            store = SQLiteCacheStore(
+                Config.LLM_CACHE_PATH,
+                max_bytes=Config.LLM_CACHE_MAX_BYTES,
+                ttl=Config.LLM_CACHE_TTL,
+                table='llm_responses',
+            )
+        except Exception as e:
+            logger.warning(f"Persistent LLM response cache unavailable, using memory only: {e}")
+    return TieredCache('llm_responses', LRUCache(Config.LLM_CACHE_MEMORY_ITEMS, ttl=Config.LLM_CACHE_TTL), store)
+
+response_cache = _build_response_cache()
+# Identical prompts already being generated are joined rather than sent again
+single_flight = SingleFlight()
+_endpoint_counters = {}
+_endpoint_lock = threading.Lock()
+
+def _count_endpoint(endpoint, counter):
+    with _endpoint_lock:
+        counters = _endpoint_counters.setdefault(endpoint or 'default', {'hits': 0, 'misses': 0, 'bypassed': 0, 'coalesced': 0})
+        counters[counter] += 1
+
+def prompt_cache_key(model, combined_prompt):
+    """
+    Cache key: model name + generation config + SHA-256 of the combined prompt
+    """
+    model_name = getattr(model, 'model_name', type(model).__name__)
+    generation_config = json.dumps(getattr(model, '_generation_config', None), sort_keys=True, default=str)
+    prompt_hash = hashlib.sha256(combined_prompt.encode('utf-8')).hexdigest()
+    return hashlib.sha256(f"{model_name}|{generation_config}|{prompt_hash}".encode('utf-8')).hexdigest()
+
+def llm_cache_stats():
+    """
+    Hit/miss counters of the response cache, overall and per endpoint, plus single-flight coalescing
+    """
+    stats = response_cache.stats()
+    stats['single_flight'] = single_flight.stats()
+    with _endpoint_lock:
+        endpoints = {name: dict(counters) for name, counters in _endpoint_counters.items()}
+    for counters in endpoints.values():
+        lookups = counters['hits'] + counters['misses']
+        counters['hit_rate'] = round(counters['hits'] / lookups, 4) if lookups else 0.0
+    stats['endpoints'] = endpoints
+    return stats
+
+def _combine_prompt(args):
+    """
+    Join the non-empty prompt arguments, one per line
+    """
+    combine_prompt = ""
+    for prompt_arg in args:
+        if prompt_arg:
+            combine_prompt += prompt_arg.strip() + "\n"
+    return combine_prompt.strip()
+
+def _cache_lookup(model, combine_prompt, endpoint, use_cache):
+    """
+    Returns (cache_key, cached_text). cache_key is None when caching is off for this call.
+    """
+    if not (use_cache and Config.LLM_CACHE_ENABLED and endpoint not in Config.LLM_CACHE_DISABLED_ENDPOINTS):
+        _count_endpoint(endpoint, 'bypassed')
+        return None, None
+    try:
+        cache_key = prompt_cache_key(model, combine_prompt)
+        cached = response_cache.get(cache_key)
+        if cached is not None:
+            _count_endpoint(endpoint, 'hits')
+            logger.info(f"LLM response cache hit ({endpoint or 'default'})")
+            return cache_key, cached
+        _count_endpoint(endpoint, 'misses')
+        return cache_key, None
+    except Exception as e:
+        logger.warning(f"LLM response cache lookup failed: {e}")
+        return None, None
+
+def _generate(model, combine_prompt, endpoint, cache_key):
+    """
+    One governed generate_content call; returns the text (cached under cache_key) or None
+    """
+    try:
+        response = governor.call(endpoint, model.generate_content, combine_prompt)
+        
+        if not response:
+            logger.error("No response received from model")
+            return None
+        
+        if not hasattr(response, 'text') or not response.text:
+            logger.error("Response has no text content")
+            return None
+
+        if cache_key:
+            response_cache.put(cache_key, response.text)
+        
+        return response.text
+        
+    except LLMUnavailable:
+        raise
+    except Exception as e:
+        logger.error(f"Error generating content: {e}")
+        return None
+
+def prompt(model, *args, endpoint=None, use_cache=True):
     """
     Generate content using Gemini model with error handling
     args: variable number of prompt arguments
+    endpoint: name used for per-endpoint cache opt-out (LLM_CACHE_DISABLED_ENDPOINTS), concurrency limits and metrics
+    use_cache: set False to always call the model (no cache, no coalescing)
+    Raises LLMUnavailable when the call governor refuses the call (breaker open,
+    overloaded) or retries are exhausted; other failures return None.
     """
     try:
         if not model:
@@ -56,33 +165,70 @@ def prompt(model, *args):
             return None
         
         # Combine all prompt arguments
-        combine_prompt = ""
-        for prompt_arg in args:
-            if prompt_arg:
-                combine_prompt += prompt_arg.strip() + "\n"
-        
-        if not combine_prompt.strip():
+        combine_prompt = _combine_prompt(args)
+        if not combine_prompt:
             logger.error("Empty prompt provided")
             return None
+
+        # Serve byte-identical prompts from the response cache
+        cache_key, cached = _cache_lookup(model, combine_prompt, endpoint, use_cache)
+        if cached is not None:
+            return cached
         
-        # Generate content with error handling
-        try:
-            response = model.generate_content(combine_prompt.strip())
-            
-            if not response:
-                logger.error("No response received from model")
-                return None
-            
-            if not hasattr(response, 'text') or not response.text:
-                logger.error("Response has no text content")
-                return None
-            
-            return response.text
-            
-        except Exception as e:
-            logger.error(f"Error generating content: {e}")
-            return None
+        # Concurrent callers with the same prompt wait on one in-flight request
+        if use_cache and Config.LLM_SINGLE_FLIGHT:
+            flight_key = cache_key or prompt_cache_key(model, combine_prompt)
+            text, shared = single_flight.do(flight_key, _generate, model, combine_prompt, endpoint, cache_key)
+            if shared:
+                _count_endpoint(endpoint, 'coalesced')
+                logger.info(f"LLM request coalesced with an in-flight call ({endpoint or 'default'})")
+            return text
+
+        return _generate(model, combine_prompt, endpoint, cache_key)
             
+    except LLMUnavailable:
+        raise
     except Exception as e:
         logger.error(f"Unexpected error in prompt function: {e}")
-        return None
\ No newline at end of file
+        return None
+
+def prompt_stream(model, *args, endpoint=None, use_cache=True):
+    """
+    Streaming variant of prompt(): yields text chunks as Gemini produces them
+    (generate_content(..., stream=True)). A cached response is yielded as one chunk,
+    and a completed stream is written to the cache. Each chunk is fetched on the
+    I/O thread pool so a slow stream doesn't block the gevent hub.
+    Raises on failure so the caller can report it to the client mid-stream.
+    """
+    if not model:
+        raise RuntimeError("AI model not available")
+
+    combine_prompt = _combine_prompt(args)
+    if not combine_prompt:
+        raise ValueError("Empty prompt provided")
+
+    cache_key, cached = _cache_lookup(model, combine_prompt, endpoint, use_cache)
+    if cached is not None:
+        yield cached
+        return
+
+    started = time.perf_counter()
+    # The governor covers opening the stream (limits, retries, breaker); chunks are read outside it
+    stream = iter(governor.call(endpoint, model.generate_content, combine_prompt, stream=True))
+    parts = []
+    while True:
+        chunk = wait_for(submit_io(next, stream, None))
+        if chunk is None:
+            break
+        text = getattr(chunk, 'text', '') or ''
+        if not text:
+            continue
+        if not parts:
+            logger.info(f"Gemini time to first chunk ({endpoint or 'default'}): {time.perf_counter() - started:.3f}s")
+        parts.append(text)
+        yield text
+
+    full_text = "".join(parts)
+    logger.info(f"Gemini stream finished ({endpoint or 'default'}): {len(full_text)} chars in {time.perf_counter() - started:.3f}s")
+    if cache_key and full_text:
+        response_cache.put(cache_key, full_text)
@@ -0,0 +1,204 @@
+import os
+import json
+import time
+import logging
+import secrets
+import sqlite3
+import threading
+from collections import namedtuple
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# A leased job: the payload plus the token that proves this worker still holds the lease
+Job = namedtuple('Job', ['id', 'queue', 'payload', 'attempts', 'lease_token'])
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    queue TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'queued',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    available_at REAL NOT NULL,
+    leased_until REAL,
+    lease_token TEXT,
+    last_error TEXT,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_ready ON jobs (queue, status, available_at);
+"""
+
+
+class JobQueue:
+    """
+    Durable job queue in a local SQLite file. Jobs survive restarts: a worker
+    leases a batch for lease_seconds and deletes the jobs once they are done.
+    A job whose lease runs out (worker crashed or the process restarted) is
+    handed out again; failed jobs are retried with exponential backoff and
+    parked as 'dead' after max_attempts.
+    """
+
+    def __init__(self, path, max_attempts=5, retry_backoff=30.0, max_retry_delay=3600.0):
+        self.path = path
+        self.max_attempts = max(1, int(max_attempts))
+        self.retry_backoff = retry_backoff
+        self.max_retry_delay = max_retry_delay
+        self._local = threading.local()
+        self._init_lock = threading.Lock()
+        self._initialized = False
+
+    def _connect(self):
+        # One connection per thread; autocommit mode so transactions are explicit (BEGIN IMMEDIATE)
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        with self._init_lock:
+            if not self._initialized:
+                conn.executescript(SCHEMA)
+                self._initialized = True
+                logger.info(f"Job queue ready at {self.path}")
+        return conn
+
+    def _transaction(self, fn):
+        conn = self._connect()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            result = fn(conn)
+            conn.execute('COMMIT')
+            return result
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+
+    def enqueue(self, queue, payload, delay=0):
+        """
+        Persist a job; returns its id. The payload must be JSON-serialisable.
+        """
+        now = time.time()
+        cursor = self._connect().execute(
+            'INSERT INTO jobs (queue, payload, available_at, created_at) VALUES (?, ?, ?, ?)',
+            (queue, json.dumps(payload), now + delay, now)
+        )
+        return cursor.lastrowid
+
+    def lease(self, queue, limit, lease_seconds):
+        """
+        Claim up to limit ready jobs (queued and due, or leased with an expired
+        lease), oldest first. Each claim counts as an attempt.
+        """
+        token = secrets.token_hex(8)
+
+        def _lease(conn):
+            now = time.time()
+            # A job that keeps losing its lease (e.g. it crashes the worker) is parked, not retried forever
+            conn.execute(
+                "UPDATE jobs SET status = 'dead', lease_token = NULL, last_error = 'Lease expired too many times' "
+                "WHERE queue = ? AND status = 'leased' AND leased_until <= ? AND attempts >= ?",
+                (queue, now, self.max_attempts)
+            )
+            rows = conn.execute(
+                "SELECT id, payload, attempts FROM jobs WHERE queue = ? AND "
+                "((status = 'queued' AND available_at <= ?) OR (status = 'leased' AND leased_until <= ?)) "
+                "ORDER BY id LIMIT ?",
+                (queue, now, now, int(limit))
+            ).fetchall()
+            conn.executemany(
+                "UPDATE jobs SET status = 'leased', leased_until = ?, lease_token = ?, attempts = attempts + 1 WHERE id = ?",
+                [(now + lease_seconds, token, row[0]) for row in rows]
+            )
+            return [Job(row[0], queue, json.loads(row[1]), row[2] + 1, token) for row in rows]
+
+        return self._transaction(_lease)
+
+    def complete(self, jobs):
+        """
+        Delete finished jobs; jobs whose lease was lost to another worker are left alone
+        """
+        if not jobs:
+            return 0
+
+        def _complete(conn):
+            cursor = conn.executemany(
+                'DELETE FROM jobs WHERE id = ? AND lease_token = ?',
+                [(job.id, job.lease_token) for job in jobs]
+            )
+            return cursor.rowcount
+
+        return self._transaction(_complete)
+
+    def retry_delay(self, attempts):
+        return min(self.max_retry_delay, self.retry_backoff * (2 ** max(0, attempts - 1)))
+
+    def fail(self, job, error, retry=True):
+        """
+        Record a failed attempt: back to the queue after a backoff, or 'dead'
+        once max_attempts are used up (or retry is False). Returns the new status.
+        """
+        status = 'queued' if retry and job.attempts < self.max_attempts else 'dead'
+        available_at = time.time() + self.retry_delay(job.attempts)
+
+        def _fail(conn):
+            conn.execute(
+                'UPDATE jobs SET status = ?, available_at = ?, leased_until = NULL, lease_token = NULL, last_error = ? '
+                'WHERE id = ? AND lease_token = ?',
+                (status, available_at, str(error)[:1000], job.id, job.lease_token)
+            )
+
+        self._transaction(_fail)
+        if status == 'dead':
+            logger.error(f"Job {job.id} ({job.queue}) gave up after {job.attempts} attempts: {error}")
+        else:
+            logger.warning(f"Job {job.id} ({job.queue}) attempt {job.attempts} failed, retrying: {error}")
+        return status
+
+    def release(self, job, delay, error=None):
+        """
+        Hand a leased job back without using up an attempt (e.g. the AI service
+        is down, which says nothing about the job itself); it is retried after delay seconds
+        """
+        def _release(conn):
+            conn.execute(
+                "UPDATE jobs SET status = 'queued', attempts = MAX(0, attempts - 1), available_at = ?, "
+                "leased_until = NULL, lease_token = NULL, last_error = COALESCE(?, last_error) "
+                "WHERE id = ? AND lease_token = ?",
+                (time.time() + delay, str(error)[:1000] if error else None, job.id, job.lease_token)
+            )
+
+        self._transaction(_release)
+
+    def requeue_dead(self, queue=None):
+        """
+        Put dead jobs back in the queue with their attempts reset; returns how many
+        """
+        where, params = ('AND queue = ?', (queue,)) if queue else ('', ())
+
+        def _requeue(conn):
+            return conn.execute(
+                f"UPDATE jobs SET status = 'queued', attempts = 0, available_at = ?, leased_until = NULL, "
+                f"lease_token = NULL WHERE status = 'dead' {where}",
+                (time.time(),) + params
+            ).rowcount
+
+        return self._transaction(_requeue)
+
+    def stats(self, queue=None):
+        """
+        Job counts by status, plus the age of the oldest waiting job in seconds
+        """
+        where, params = ('WHERE queue = ?', (queue,)) if queue else ('', ())
+        conn = self._connect()
+        counts = {'queued': 0, 'leased': 0, 'dead': 0}
+        for status, count in conn.execute(f'SELECT status, COUNT(*) FROM jobs {where} GROUP BY status', params):
+            counts[status] = count
+        oldest = conn.execute(
+            f"SELECT MIN(created_at) FROM jobs {where + ' AND' if where else 'WHERE'} status != 'dead'", params
+        ).fetchone()[0]
+        counts['oldest_age_seconds'] = round(time.time() - oldest, 1) if oldest else None
+        return counts
@@ -0,0 +1,272 @@
+import time
+import logging
+import threading
+from contextlib import contextmanager
+from tenacity import Retrying, stop_after_attempt, wait_random_exponential, retry_if_exception, RetryError
+from config import Config
+from Controllers.concurrency import _on_gevent_hub, submit_io, wait_for
+
+try:
+    from google.api_core import exceptions as google_exceptions
+except ImportError:  # pragma: no cover - installed with google-generativeai
+    google_exceptions = None
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+
+class LLMUnavailable(Exception):
+    """Raised when a Gemini call is refused or keeps failing; callers should answer 503"""
+
+    def __init__(self, message, retry_after=None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class CircuitOpenError(LLMUnavailable):
+    """Raised without calling Gemini while the circuit breaker is open"""
+
+
+class LLMOverloaded(LLMUnavailable):
+    """Raised when no concurrency slot frees up within LLM_QUEUE_TIMEOUT"""
+
+
+def _retryable_types():
+    types = [ConnectionError, TimeoutError]
+    if google_exceptions is not None:
+        types += [
+            google_exceptions.TooManyRequests,
+            google_exceptions.ResourceExhausted,
+            google_exceptions.ServiceUnavailable,
+            google_exceptions.InternalServerError,
+            google_exceptions.GatewayTimeout,
+            google_exceptions.DeadlineExceeded,
+            google_exceptions.Aborted,
+        ]
+    return tuple(types)
+
+RETRYABLE_ERRORS = _retryable_types()
+
+def is_retryable(error):
+    """
+    Rate limits, timeouts and 5xx are worth retrying; bad requests and safety blocks are not
+    """
+    return isinstance(error, RETRYABLE_ERRORS)
+
+
+class CircuitBreaker:
+    """
+    closed -> open after failure_threshold consecutive retryable failures;
+    open -> half_open after reset_timeout, letting one trial call through;
+    half_open -> closed on success, back to open on failure.
+    """
+
+    def __init__(self, failure_threshold, reset_timeout):
+        self.failure_threshold = max(1, int(failure_threshold))
+        self.reset_timeout = reset_timeout
+        self._lock = threading.Lock()
+        self._state = 'closed'
+        self._failures = 0
+        self._opened_at = None
+        self._trial_in_flight = False
+        self._counters = {'opened': 0, 'rejected': 0}
+
+    def retry_after(self):
+        with self._lock:
+            if self._opened_at is None:
+                return None
+            return max(1, int(self.reset_timeout - (time.monotonic() - self._opened_at)) + 1)
+
+    def before_call(self):
+        with self._lock:
+            if self._state == 'open' and time.monotonic() - self._opened_at >= self.reset_timeout:
+                self._state = 'half_open'
+                self._trial_in_flight = False
+            if self._state == 'closed':
+                return
+            if self._state == 'half_open' and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return
+            self._counters['rejected'] += 1
+        raise CircuitOpenError("AI service circuit breaker is open", retry_after=self.retry_after())
+
+    def release_trial(self):
+        """Give back a half-open trial that never reached the service"""
+        with self._lock:
+            self._trial_in_flight = False
+
+    def record_success(self):
+        with self._lock:
+            if self._state != 'closed':
+                logger.info("LLM circuit breaker closed")
+            self._state = 'closed'
+            self._failures = 0
+            self._opened_at = None
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._state == 'half_open' or (self._state == 'closed' and self._failures >= self.failure_threshold):
+                self._state = 'open'
+                self._opened_at = time.monotonic()
+                self._trial_in_flight = False
+                self._counters['opened'] += 1
+                logger.warning(f"LLM circuit breaker opened after {self._failures} consecutive failures")
+
+    def stats(self):
+        with self._lock:
+            state = self._state
+            if state == 'open' and time.monotonic() - self._opened_at >= self.reset_timeout:
+                state = 'half_open'
+            return {'state': state, 'consecutive_failures': self._failures, **self._counters}
+
+
+class CallGovernor:
+    """
+    Wraps every Gemini call with a global and a per-endpoint concurrency limit,
+    jittered exponential retries on retryable errors (tenacity) and a circuit
+    breaker, so bursts queue briefly or fail fast with LLMUnavailable instead of
+    piling up as unlimited parallel calls.
+    """
+
+    def __init__(self, max_concurrency, endpoint_limits, default_endpoint_limit, queue_timeout,
+                 retry_attempts, retry_max_wait, breaker):
+        self.max_concurrency = max(1, int(max_concurrency))
+        self.endpoint_limits = dict(endpoint_limits)
+        self.default_endpoint_limit = max(1, int(default_endpoint_limit))
+        self.queue_timeout = queue_timeout
+        self.retry_attempts = max(1, int(retry_attempts))
+        self.retry_max_wait = retry_max_wait
+        self.breaker = breaker
+        self._global = threading.BoundedSemaphore(self.max_concurrency)
+        self._endpoints = {}
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._counters = {'attempts': 0, 'succeeded': 0, 'failed': 0, 'retries': 0, 'overloaded': 0, 'short_circuited': 0}
+
+    def _count(self, counter, delta=1):
+        with self._lock:
+            self._counters[counter] += delta
+
+    def _endpoint_semaphore(self, endpoint):
+        with self._lock:
+            semaphore = self._endpoints.get(endpoint)
+            if semaphore is None:
+                limit = self.endpoint_limits.get(endpoint, self.default_endpoint_limit)
+                semaphore = self._endpoints[endpoint] = threading.BoundedSemaphore(max(1, int(limit)))
+            return semaphore
+
+    @contextmanager
+    def slot(self, endpoint):
+        """
+        Hold one per-endpoint and one global slot, waiting at most queue_timeout for each
+        """
+        endpoint_semaphore = self._endpoint_semaphore(endpoint)
+        deadline = time.monotonic() + self.queue_timeout
+        if not endpoint_semaphore.acquire(timeout=self.queue_timeout):
+            self._count('overloaded')
+            raise LLMOverloaded(f"Too many concurrent AI requests for {endpoint}", retry_after=1)
+        try:
+            if not self._global.acquire(timeout=max(0.0, deadline - time.monotonic())):
+                self._count('overloaded')
+                raise LLMOverloaded("Too many concurrent AI requests", retry_after=1)
+            try:
+                self._count('attempts')
+                with self._lock:
+                    self._in_flight += 1
+                yield
+            finally:
+                with self._lock:
+                    self._in_flight -= 1
+                self._global.release()
+        finally:
+            endpoint_semaphore.release()
+
+    def _attempt(self, endpoint, fn, args, kwargs):
+        self.breaker.before_call()
+        try:
+            with self.slot(endpoint):
+                try:
+                    result = fn(*args, **kwargs)
+                except Exception as e:
+                    if is_retryable(e):
+                        self.breaker.record_failure()
+                    else:
+                        # The service answered (bad request, safety block): it is up
+                        self.breaker.record_success()
+                    raise
+        except LLMOverloaded:
+            self.breaker.release_trial()
+            raise
+        self.breaker.record_success()
+        return result
+
+    def _call(self, endpoint, fn, args, kwargs):
+        retrying = Retrying(
+            stop=stop_after_attempt(self.retry_attempts),
+            wait=wait_random_exponential(multiplier=0.5, max=self.retry_max_wait),
+            retry=retry_if_exception(is_retryable),
+            before_sleep=lambda state: self._on_retry(endpoint, state),
+            reraise=False,
+        )
+        try:
+            result = retrying(self._attempt, endpoint, fn, args, kwargs)
+        except RetryError as e:
+            self._count('failed')
+            error = e.last_attempt.exception()
+            raise LLMUnavailable(
+                f"AI service failed after {self.retry_attempts} attempts: {error}",
+                retry_after=self.breaker.retry_after() or 1
+            ) from error
+        except CircuitOpenError:
+            self._count('short_circuited')
+            raise
+        except LLMOverloaded:
+            raise
+        except Exception:
+            self._count('failed')
+            raise
+        self._count('succeeded')
+        return result
+
+    def _on_retry(self, endpoint, state):
+        self._count('retries')
+        logger.warning(
+            f"Retrying Gemini call ({endpoint}) after attempt {state.attempt_number}: "
+            f"{state.outcome.exception()}"
+        )
+
+    def call(self, endpoint, fn, *args, **kwargs):
+        """
+        Run fn(*args, **kwargs) under the limits, retries and breaker.
+        Raises LLMUnavailable (CircuitOpenError, LLMOverloaded, or retries exhausted);
+        other exceptions from fn propagate unchanged.
+        """
+        endpoint = endpoint or 'default'
+        if _on_gevent_hub():
+            # Semaphore waits and retry back-off sleep; keep them off the hub
+            return wait_for(submit_io(self._call, endpoint, fn, args, kwargs))
+        return self._call(endpoint, fn, args, kwargs)
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._counters)
+            stats['in_flight'] = self._in_flight
+        stats['max_concurrency'] = self.max_concurrency
+        stats['breaker'] = self.breaker.stats()
+        return stats
+
+
+governor = CallGovernor(
+    max_concurrency=Config.LLM_MAX_CONCURRENCY,
+    endpoint_limits=Config.LLM_ENDPOINT_CONCURRENCY,
+    default_endpoint_limit=Config.LLM_DEFAULT_ENDPOINT_CONCURRENCY,
+    queue_timeout=Config.LLM_QUEUE_TIMEOUT,
+    retry_attempts=Config.LLM_RETRY_ATTEMPTS,
+    retry_max_wait=Config.LLM_RETRY_MAX_WAIT,
+    breaker=CircuitBreaker(Config.LLM_BREAKER_FAILURES, Config.LLM_BREAKER_RESET_SECONDS),
+)
+
+def governor_stats():
+    return governor.stats()
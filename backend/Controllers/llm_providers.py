@@ -0,0 +1,200 @@
+import abc
+import json
+import math
+import time
+import random
+import hashlib
+import logging
+import threading
+from config import Config
+from Controllers.genAi import load_gemini_model
+
+try:
+    from google.api_core import exceptions as google_exceptions
+except ImportError:  # pragma: no cover - installed with google-generativeai
+    google_exceptions = None
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+
+class LLMProvider(abc.ABC):
+    """
+    Base class for LLM providers. load_model(name) returns a model object with the
+    subset of the GenerativeModel interface the controllers use:
+      generate_content(prompt, stream=False) -> response with .text (or an iterator of chunks with .text)
+      count_tokens(prompt)                    -> used by the background health probe
+      model_name                              -> part of the response cache key
+    """
+
+    name = None
+
+    @abc.abstractmethod
+    def load_model(self, model_name):
+        """
+        Return a model object for model_name
+        """
+
+
+class GeminiProvider(LLMProvider):
+    """
+    Google Gemini through google.generativeai
+    """
+
+    name = 'gemini'
+
+    def load_model(self, model_name):
+        return load_gemini_model(model_name)
+
+
+def parse_latency(spec):
+    """
+    Latency distribution spec -> sampler(rng) returning seconds. Values are milliseconds:
+      fixed:800 | uniform:200,1500 | normal:800,200 | lognormal:800,0.5 (median, sigma)
+    """
+    kind, _, params = (spec or 'fixed:0').partition(':')
+    values = [float(v) for v in params.split(',') if v.strip()] or [0.0]
+    kind = kind.strip().lower()
+    if kind == 'fixed':
+        return lambda rng: values[0] / 1000.0
+    if kind == 'uniform':
+        return lambda rng: rng.uniform(values[0], values[1]) / 1000.0
+    if kind == 'normal':
+        return lambda rng: max(0.0, rng.gauss(values[0], values[1])) / 1000.0
+    if kind == 'lognormal':
+        mu = math.log(max(values[0], 1e-3))
+        sigma = values[1] if len(values) > 1 else 0.5
+        return lambda rng: rng.lognormvariate(mu, sigma) / 1000.0
+    raise ValueError(f"Unknown latency distribution: {spec}")
+
+
+class _StubResponse:
+    def __init__(self, text):
+        self.text = text
+
+
+class _StubTokenCount:
+    def __init__(self, total_tokens):
+        self.total_tokens = total_tokens
+
+
+class StubModel:
+    """
+    Offline stand-in for GenerativeModel: recognises the app's prompts and returns
+    canned responses in the shape each caller parses, after a sampled delay.
+    Responses are derived from the prompt hash, so they are stable per input but
+    vary across inputs (different ATS scores, different e-mail addresses).
+    """
+
+    def __init__(self, model_name, latency, stream_chunks, error_rate, seed=None):
+        self.model_name = f"stub/{model_name}"
+        self._generation_config = {}
+        self._sample_latency = latency
+        self._stream_chunks = max(1, int(stream_chunks))
+        self._error_rate = error_rate
+        self._rng = random.Random(seed)
+        self._rng_lock = threading.Lock()
+
+    def _draw(self, sampler):
+        with self._rng_lock:
+            return sampler(self._rng)
+
+    def _maybe_fail(self):
+        if self._error_rate and self._draw(lambda rng: rng.random()) < self._error_rate:
+            if google_exceptions is not None:
+                raise google_exceptions.ResourceExhausted("Stub provider: simulated rate limit")
+            raise ConnectionError("Stub provider: simulated rate limit")
+
+    def _respond(self, prompt_text):
+        digest = hashlib.sha256(prompt_text.encode('utf-8')).hexdigest()
+        seed = int(digest[:8], 16)
+        if '"ats_score"' in prompt_text:
+            return f'```json\n"ats_score": {40 + seed % 56}\n```'
+        if 'Return ONLY a valid JSON object' in prompt_text:
+            return json.dumps({
+                'name': f"Stub Candidate {digest[:6]}",
+                'email': f"candidate-{digest[:12]}@example.com",
+                'phone': f"+1 555 {seed % 1000:03d} {seed % 10000:04d}",
+                'education': "B.Sc. Computer Science",
+                'experience': "Software Engineer, Example Corp (2019-2024)",
+                'skills': "Python, Flask, SQL, Docker",
+                'certifications': "",
+                'projects': "Resume analyser",
+                'languages': "English",
+                'additional_info': ""
+            })
+        if 'cover letter' in prompt_text.lower():
+            return (
+                "Stub Candidate\nstub@example.com\n\nDear Hiring Manager,\n\n"
+                "I am excited to apply for this role. My experience building Python services "
+                "matches the requirements in your job description.\n\n"
+                "Thank you for your time and consideration.\n\nSincerely,\nStub Candidate"
+            )
+        if 'resume' in prompt_text.lower():
+            return (
+                "# Strengths Summary\n\n* Clear structure\n* Relevant skills\n\n"
+                "## Section-by-Section Analysis\n\nThe resume is well organised.\n\n"
+                "## Improvement Recommendations\n\n1. Quantify achievements\n2. Add keywords from the posting\n\n"
+                "**Final Verdict:** Needs Work"
+            )
+        return "Stub response"
+
+    def generate_content(self, contents, stream=False, **kwargs):
+        prompt_text = contents if isinstance(contents, str) else str(contents)
+        delay = self._draw(self._sample_latency)
+        self._maybe_fail()
+        text = self._respond(prompt_text)
+        if not stream:
+            time.sleep(delay)
+            return _StubResponse(text)
+        return self._stream(text, delay)
+
+    def _stream(self, text, delay):
+        size = max(1, -(-len(text) // self._stream_chunks))
+        pieces = [text[i:i + size] for i in range(0, len(text), size)]
+        for piece in pieces:
+            time.sleep(delay / len(pieces))
+            yield _StubResponse(piece)
+
+    def count_tokens(self, contents):
+        return _StubTokenCount(len(str(contents).split()))
+
+
+class StubProvider(LLMProvider):
+    """
+    Local provider for load tests and benchmarks: no network, no quota
+    """
+
+    name = 'stub'
+
+    def __init__(self, latency=None, stream_chunks=None, error_rate=None, seed=None):
+        self.latency = latency or Config.LLM_STUB_LATENCY
+        self.stream_chunks = stream_chunks or Config.LLM_STUB_STREAM_CHUNKS
+        self.error_rate = Config.LLM_STUB_ERROR_RATE if error_rate is None else error_rate
+        self.seed = seed
+
+    def load_model(self, model_name):
+        return StubModel(
+            model_name,
+            latency=parse_latency(self.latency),
+            stream_chunks=self.stream_chunks,
+            error_rate=self.error_rate,
+            seed=self.seed,
+        )
+
+
+PROVIDERS = {
+    GeminiProvider.name: GeminiProvider,
+    StubProvider.name: StubProvider,
+}
+
+def create_provider(name=None):
+    """
+    Build a provider by name (LLM_PROVIDER: gemini or stub)
+    """
+    name = (name or Config.LLM_PROVIDER or 'gemini').lower()
+    if name not in PROVIDERS:
+        raise ValueError(f"Unknown LLM provider: {name}")
+    if name != 'gemini':
+        logger.warning(f"Using {name} LLM provider: responses are canned, not generated")
+    return PROVIDERS[name]()
@@ -0,0 +1,154 @@
+import os
+import time
+import logging
+import datetime
+import threading
+from config import Config
+from Controllers.llm_providers import create_provider
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# A failed model load (e.g. missing API key) is retried at most this often
+LOAD_RETRY_SECONDS = 30
+
+
+class ModelRegistry:
+    """
+    Process-wide, lazily created models shared by every blueprint, built by the
+    provider selected with LLM_PROVIDER (see llm_providers).
+
+    get() only configures the SDK and builds the model object, so importing the
+    routes never touches the network. Warm-up and health probing are separate
+    and run on a daemon thread (start_background), recording the last probe
+    result for the health endpoints.
+    """
+
+    def __init__(self, provider=None):
+        self._provider = provider
+        self._lock = threading.Lock()
+        self._models = {}
+        self._failed_at = {}
+        self._pid = os.getpid()
+        self._probe_thread = None
+        self._stop = threading.Event()
+        self._health = {'status': 'unknown', 'checked_at': None, 'latency_ms': None, 'error': None, 'probes': 0}
+
+    def _reset_after_fork(self):
+        # SDK clients and the probe thread don't survive a fork; rebuild them in the child
+        if self._pid != os.getpid():
+            self._pid = os.getpid()
+            self._models = {}
+            self._failed_at = {}
+            self._probe_thread = None
+            self._stop = threading.Event()
+
+    def get(self, model_name=None):
+        """
+        The shared model for model_name (defaults to GEMINI_MODEL), or None if it can't be created
+        """
+        model_name = model_name or Config.GEMINI_MODEL
+        with self._lock:
+            self._reset_after_fork()
+            model = self._models.get(model_name)
+            if model is not None:
+                return model
+            failed_at = self._failed_at.get(model_name)
+            if failed_at is not None and time.monotonic() - failed_at < LOAD_RETRY_SECONDS:
+                return None
+            if self._provider is None:
+                self._provider = create_provider()
+            model = self._provider.load_model(model_name)
+            if model is None:
+                self._failed_at[model_name] = time.monotonic()
+                logger.warning(f"{self._provider.name} model {model_name} not initialized")
+                return None
+            self._failed_at.pop(model_name, None)
+            self._models[model_name] = model
+            logger.info(f"{self._provider.name} model {model_name} created")
+            return model
+
+    def probe(self, model_name=None):
+        """
+        Check that the API is reachable and the key is accepted. count_tokens is a
+        round trip through the same client without spending generation quota, and
+        it also warms the connection for the first real request.
+        """
+        started = time.perf_counter()
+        error = None
+        model = self.get(model_name)
+        if model is None:
+            error = 'AI model not available'
+        else:
+            try:
+                model.count_tokens("ping")
+            except Exception as e:
+                error = str(e) or type(e).__name__
+        health = {
+            'status': 'unhealthy' if error else 'healthy',
+            'checked_at': datetime.datetime.now().isoformat(),
+            'latency_ms': round((time.perf_counter() - started) * 1000, 1),
+            'error': error,
+        }
+        with self._lock:
+            health['probes'] = self._health['probes'] + 1
+            self._health = health
+        if error:
+            logger.warning(f"Gemini health probe failed: {error}")
+        else:
+            logger.info(f"Gemini health probe ok in {health['latency_ms']}ms")
+        return dict(health)
+
+    def _probe_loop(self, interval):
+        self.probe()
+        while interval > 0 and not self._stop.wait(interval):
+            self.probe()
+
+    def start_background(self, interval=None):
+        """
+        Warm up (first probe) and then re-probe every interval seconds on a daemon thread.
+        Returns immediately; safe to call more than once.
+        """
+        interval = Config.LLM_HEALTH_PROBE_INTERVAL if interval is None else interval
+        with self._lock:
+            self._reset_after_fork()
+            if self._probe_thread is not None and self._probe_thread.is_alive():
+                return
+            self._probe_thread = threading.Thread(
+                target=self._probe_loop, args=(interval,), name='llm-health-probe', daemon=True
+            )
+            self._probe_thread.start()
+
+    def stop_background(self):
+        self._stop.set()
+
+    def status(self):
+        """
+        Models created so far and the result of the last background probe
+        """
+        with self._lock:
+            return {
+                'provider': self._provider.name if self._provider else Config.LLM_PROVIDER,
+                'default_model': Config.GEMINI_MODEL,
+                'loaded_models': sorted(self._models),
+                'probe': dict(self._health),
+            }
+
+
+model_registry = ModelRegistry()
+
+def get_model(model_name=None):
+    """
+    Shared, lazily created model from the configured provider (None when the API key or SDK is unavailable)
+    """
+    return model_registry.get(model_name)
+
+def model_status():
+    return model_registry.status()
+
+def start_model_warmup():
+    """
+    Kick off the background warm-up and periodic health probe (no-op when LLM_WARMUP is off)
+    """
+    if Config.LLM_WARMUP:
+        model_registry.start_background()
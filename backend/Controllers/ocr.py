@@ -0,0 +1,180 @@
+import os
+import math
+import time
+import logging
+import tempfile
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from pdf2image import convert_from_path, pdfinfo_from_path
+from config import Config
+from Controllers.ocr_backends import get_ocr_backend
+from Controllers.ocr_preprocess import preprocess_for_ocr
+
+try:
+    import pypdfium2 as pdfium
+except ImportError:  # pragma: no cover - pinned in requirements, optional at runtime
+    pdfium = None
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+def pdf_page_count(pdf_path):
+    """
+    Number of pages reported by poppler, or None if it can't be read
+    """
+    try:
+        return int(pdfinfo_from_path(pdf_path)['Pages'])
+    except Exception as e:
+        logger.warning(f"Could not read page count: {e}")
+        return None
+
+def _seconds_left(deadline):
+    return None if deadline is None else deadline - time.time()
+
+def ocr_page(pdf_path, page_number, dpi, deadline=None):
+    """
+    Render a single page, preprocess it and OCR it. Only this page is held in memory.
+    Blank pages are detected during preprocessing and skip tesseract.
+    deadline (wall-clock, from the ExtractionBudget) bounds the render and the
+    tesseract call themselves, not just the gap between pages.
+    Returns {'page', 'text', 'blank', 'timed_out', 'seconds'}.
+    """
+    started = time.perf_counter()
+    result = {'page': page_number, 'text': "", 'blank': False, 'timed_out': False}
+
+    def finish():
+        result['seconds'] = time.perf_counter() - started
+        return result
+
+    remaining = _seconds_left(deadline)
+    if remaining is not None and remaining <= 0:
+        result['timed_out'] = True
+        return finish()
+    try:
+        images = convert_from_path(pdf_path, dpi=dpi, first_page=page_number, last_page=page_number,
+                                   timeout=math.ceil(remaining) if remaining is not None else None)
+    except Exception as e:
+        result['timed_out'] = deadline is not None and time.time() >= deadline
+        logger.warning(f"Rendering failed for page {page_number}: {e}")
+        return finish()
+
+    for image in images:
+        try:
+            prepared = image
+            if Config.OCR_PREPROCESS:
+                try:
+                    prepared = preprocess_for_ocr(image)
+                except Exception as e:
+                    logger.warning(f"Preprocessing failed for page {page_number}, using the raw render: {e}")
+                    prepared = image
+            if prepared is None:
+                result['blank'] = True
+                continue
+            remaining = _seconds_left(deadline)
+            if remaining is not None and remaining <= 0:
+                result['timed_out'] = True
+                continue
+            result['text'] += get_ocr_backend().image_to_string(prepared, timeout=remaining)
+        except Exception as e:
+            result['timed_out'] = deadline is not None and time.time() >= deadline
+            logger.warning(f"OCR failed for page {page_number}: {e}")
+        finally:
+            image.close()
+    return finish()
+
+def _page_dpis(pdf_path, page_numbers, dpi, max_render_pixels):
+    """
+    Per-page render DPI, lowered where needed so no page renders to more than max_render_pixels
+    """
+    dpis = {n: dpi for n in page_numbers}
+    if not max_render_pixels or pdfium is None:
+        return dpis
+    try:
+        pdf = pdfium.PdfDocument(pdf_path)
+        try:
+            for n in page_numbers:
+                width, height = pdf.get_page_size(n - 1)  # PDF points, 72 per inch
+                pixels = (width / 72 * dpi) * (height / 72 * dpi)
+                if pixels > max_render_pixels:
+                    dpis[n] = max(36, int(72 * math.sqrt(max_render_pixels / (width * height))))
+                    logger.info(f"Page {n} rendered at {dpis[n]} DPI to stay under {max_render_pixels} pixels")
+        finally:
+            pdf.close()
+    except Exception as e:
+        logger.warning(f"Could not read page sizes, rendering at {dpi} DPI: {e}")
+    return dpis
+
+def ocr_pdf(source, page_numbers=None, dpi=None, workers=None, budget=None):
+    """
+    OCR the given pages (1-based, default all) on up to workers threads in the
+    calling process (an extraction worker on the request path). The heavy lifting
+    happens outside the GIL, in pdftoppm and tesseract, so pages run in parallel,
+    and the threads die with the worker if it is killed for overrunning. Each
+    thread holds one page at a time, so peak memory depends on the thread count
+    rather than the page count. Results keep page order and carry per-page timings.
+
+    source is the PDF content (bytes) or a path to it. poppler renders from a
+    file, so in-memory content is written once to a temporary file that lives
+    only for the duration of the OCR job.
+
+    budget (an ExtractionBudget) caps pages, render pixels and wall-clock time;
+    the deadline is passed down into poppler and tesseract, and when it runs
+    out the pages finished so far are returned.
+    """
+    if isinstance(source, (bytes, bytearray)):
+        with tempfile.NamedTemporaryFile(suffix='.pdf', delete=False) as tmp:
+            tmp.write(source)
+        try:
+            return ocr_pdf(tmp.name, page_numbers=page_numbers, dpi=dpi, workers=workers, budget=budget)
+        finally:
+            try:
+                os.unlink(tmp.name)
+            except OSError as e:
+                logger.warning(f"Could not remove temporary OCR file {tmp.name}: {e}")
+
+    pdf_path = os.path.abspath(source)
+    dpi = dpi or Config.OCR_DPI
+    workers = workers or Config.OCR_WORKERS
+
+    if page_numbers is None:
+        page_count = pdf_page_count(pdf_path)
+        if not page_count:
+            return []
+        if budget is not None:
+            budget.document_pages = page_count
+        page_numbers = range(1, page_count + 1)
+    page_numbers = list(page_numbers)
+    if budget is not None:
+        page_numbers = [n for n in page_numbers if budget.allow_page(n)]
+    if not page_numbers:
+        return []
+    dpis = _page_dpis(pdf_path, page_numbers, dpi, budget.max_render_pixels if budget else None)
+
+    deadline = budget.deadline if budget else None
+    results = []
+    if workers <= 1 or len(page_numbers) == 1:
+        for n in page_numbers:
+            if budget is not None and not budget.allow_page(n):
+                break
+            page = ocr_page(pdf_path, n, dpis[n], deadline)
+            if page['timed_out']:
+                budget.truncate('time')
+                break
+            results.append(page)
+        return results
+
+    pool = ThreadPoolExecutor(max_workers=min(workers, len(page_numbers)), thread_name_prefix='ocr')
+    try:
+        futures = [pool.submit(ocr_page, pdf_path, n, dpis[n], deadline) for n in page_numbers]
+        for future in futures:
+            try:
+                page = future.result(timeout=budget.remaining() if budget else None)
+            except FutureTimeoutError:
+                page = {'timed_out': True}
+            if page['timed_out']:
+                budget.truncate('time')
+                break
+            results.append(page)
+    finally:
+        # Pages still running stop at the deadline by themselves (poppler/tesseract timeouts)
+        pool.shutdown(wait=False, cancel_futures=True)
+    return results
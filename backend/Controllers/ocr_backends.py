@@ -0,0 +1,162 @@
+import abc
+import time
+import queue
+import logging
+import threading
+import pytesseract
+from config import Config
+
+try:
+    import tesserocr
+except ImportError:  # optional: needs libtesseract headers at install time
+    tesserocr = None
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+
+class OcrBackend(abc.ABC):
+    """
+    Base class for OCR backends: image_to_string(PIL image, timeout=None) -> str.
+    timeout is in seconds; a backend that runs out raises RuntimeError.
+    """
+
+    name = None
+
+    def __init__(self, lang):
+        self.lang = lang
+
+    def is_available(self):
+        return True
+
+    @abc.abstractmethod
+    def image_to_string(self, image, timeout=None):
+        """
+        OCR one PIL image and return its text
+        """
+
+    def close(self):
+        pass
+
+
+class PytesseractBackend(OcrBackend):
+    """
+    Starts a new tesseract process (and reloads the language model) for every image
+    """
+
+    name = 'pytesseract'
+
+    def image_to_string(self, image, timeout=None):
+        # pytesseract kills the tesseract process and raises RuntimeError once timeout passes
+        return pytesseract.image_to_string(image, lang=self.lang, timeout=timeout or 0) or ""
+
+
+class TesserocrBackend(OcrBackend):
+    """
+    Keeps warm tesseract instances through the C API (tesserocr) and reuses them
+    across pages and requests. Instances are created on demand up to max_instances
+    and handed out through a queue, so each one is used by one thread at a time.
+    """
+
+    name = 'tesserocr'
+
+    def __init__(self, lang, max_instances=1):
+        super().__init__(lang)
+        self.max_instances = max(1, int(max_instances))
+        self._idle = queue.LifoQueue()
+        self._created = 0
+        self._lock = threading.Lock()
+
+    def is_available(self):
+        return tesserocr is not None
+
+    def _acquire(self):
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            if self._created < self.max_instances:
+                self._created += 1
+                logger.info(f"Starting tesseract instance {self._created}/{self.max_instances} ({self.lang})")
+                return tesserocr.PyTessBaseAPI(lang=self.lang)
+        return self._idle.get()
+
+    def image_to_string(self, image, timeout=None):
+        api = self._acquire()
+        try:
+            api.SetImage(image)
+            # Recognize() takes milliseconds and returns False when it is cancelled by the timeout
+            if timeout and not api.Recognize(max(1, int(timeout * 1000))):
+                raise RuntimeError(f"tesseract did not finish within {timeout:.1f}s")
+            return api.GetUTF8Text() or ""
+        finally:
+            api.Clear()
+            self._idle.put(api)
+
+    def close(self):
+        while True:
+            try:
+                self._idle.get_nowait().End()
+            except queue.Empty:
+                break
+
+
+_backend = None
+_backend_lock = threading.Lock()
+
+def create_ocr_backend(name=None):
+    """
+    Build a backend by name: tesserocr, pytesseract or auto (tesserocr when installed)
+    """
+    name = (name or Config.OCR_BACKEND or 'auto').lower()
+    if name in ('auto', 'tesserocr'):
+        backend = TesserocrBackend(Config.OCR_LANG, Config.OCR_ENGINE_INSTANCES)
+        if backend.is_available():
+            return backend
+        if name == 'tesserocr':
+            logger.warning("tesserocr is not installed, falling back to pytesseract")
+    elif name != 'pytesseract':
+        raise ValueError(f"Unknown OCR backend: {name}")
+    return PytesseractBackend(Config.OCR_LANG)
+
+def get_ocr_backend():
+    """
+    Process-wide OCR backend, created on first use so each OCR worker process keeps its own warm instances
+    """
+    global _backend
+    with _backend_lock:
+        if _backend is None:
+            _backend = create_ocr_backend()
+            logger.info(f"Using OCR backend: {_backend.name}")
+        return _backend
+
+def benchmark_ocr_backends(images, repeats=3):
+    """
+    Time every available backend on the same rendered images.
+    Returns {backend: {'pages', 'mean_ms_per_page', 'first_page_ms', 'chars'}}.
+    """
+    results = {}
+    for backend in (PytesseractBackend(Config.OCR_LANG), TesserocrBackend(Config.OCR_LANG)):
+        if not backend.is_available():
+            results[backend.name] = {'available': False}
+            continue
+        try:
+            timings = []
+            chars = 0
+            for _ in range(repeats):
+                for image in images:
+                    started = time.perf_counter()
+                    chars = len(backend.image_to_string(image))
+                    timings.append((time.perf_counter() - started) * 1000)
+            results[backend.name] = {
+                'available': True,
+                'pages': len(images),
+                'repeats': repeats,
+                'first_page_ms': round(timings[0], 1) if timings else None,
+                'mean_ms_per_page': round(sum(timings) / len(timings), 1) if timings else None,
+                'chars': chars
+            }
+        finally:
+            backend.close()
+    return results
@@ -1,97 +1,252 @@
 import os
+import hashlib
 import logging
-import pdfplumber
-from pdf2image import convert_from_path
-import pytesseract
+import time
+import threading
+from config import Config
+from Controllers.cache import LRUCache, SQLiteCacheStore, TieredCache
+from Controllers.extraction_engines import ENGINES, ExtractionBudget, text_engines_for, engine_stats
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
-def pdf_to_text(pdf_path):
+def _build_extraction_cache():
     """
-    Extract text from PDF with comprehensive error handling and fallback options
+    Build the two-tier extraction cache; the on-disk tier is skipped if it can't be opened
+    """
+    store = None
+    if Config.EXTRACTION_CACHE_PATH:
+        try:
+            store = SQLiteCacheStore(
+                Config.EXTRACTION_CACHE_PATH,
+                max_bytes=Config.EXTRACTION_CACHE_MAX_BYTES,
+                table='pdf_extraction',
+            )
+        except Exception as e:
+            logger.warning(f"Persistent extraction cache unavailable, using memory only: {e}")
+    return TieredCache('pdf_text', LRUCache(Config.EXTRACTION_CACHE_MEMORY_ITEMS), store)
+
+_extraction_cache = None
+_extraction_cache_lock = threading.Lock()
+
+def get_extraction_cache():
     """
-    text = ""
-    
+    Process-wide extraction cache, built on first use so importing the module
+    (tests, flask CLI commands) doesn't create the cache database
+    """
+    global _extraction_cache
+    with _extraction_cache_lock:
+        if _extraction_cache is None:
+            _extraction_cache = _build_extraction_cache()
+        return _extraction_cache
+
+def pdf_content_hash(source):
+    """
+    SHA-256 of the PDF bytes, the content part of the extraction cache key.
+    source is the PDF content (bytes) or a path to it.
+    """
+    if isinstance(source, (bytes, bytearray)):
+        return hashlib.sha256(source).hexdigest()
+
+    digest = hashlib.sha256()
+    with open(source, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def extraction_cache_key(content_hash):
+    """
+    Cache key for one PDF under the current extraction settings: switching the
+    engine, the OCR setup or the page/render budget must not serve results
+    produced under the old ones. The time budget is left out because runs cut
+    short by it are never cached.
+    """
+    settings = '|'.join(str(value) for value in (
+        (Config.PDF_EXTRACTION_ENGINE or 'auto').lower(),
+        Config.PDF_MAX_PAGES,
+        Config.PDF_MAX_RENDER_PIXELS,
+        Config.OCR_BACKEND,
+        Config.OCR_LANG,
+        Config.OCR_DPI,
+        Config.OCR_PREPROCESS,
+    ))
+    return f"{content_hash}:{hashlib.sha256(settings.encode('utf-8')).hexdigest()[:16]}"
+
+def extraction_cache_stats():
+    """
+    Hit/miss counters of the extraction cache
+    """
+    return get_extraction_cache().stats()
+
+def extraction_engine_stats():
+    """
+    Chars-per-second throughput of each extraction engine, with the number of
+    pages OCR skipped as blank
+    """
+    return engine_stats()
+
+def extract_pdf(source, runner=None, hints=None):
+    """
+    Extract text plus a per-page report, serving repeat uploads of the same file from the extraction cache.
+    source is the PDF content (bytes) or a path to it.
+    runner(fn, *args) can move the actual extraction elsewhere (e.g. the extraction process pool);
+    the cache is always consulted in the calling process.
+    hints is a preflight_pdf() report used to plan the work (text layer).
+    """
+    cache_key = None
     try:
-        # Validate input
-        if not pdf_path:
-            logger.error("PDF path is empty or None")
-            return ""
-        
-        if not os.path.exists(pdf_path):
-            logger.error(f"PDF file does not exist: {pdf_path}")
-            return ""
-        
-        if not os.path.isfile(pdf_path):
-            logger.error(f"Path is not a file: {pdf_path}")
-            return ""
+        if isinstance(source, (bytes, bytearray)) or (source and os.path.isfile(source)):
+            cache_key = extraction_cache_key(pdf_content_hash(source))
+            cached = get_extraction_cache().get(cache_key)
+            if cached is not None:
+                logger.info(f"Extraction cache hit for {cache_key[:12]}")
+                return cached
+    except Exception as e:
+        logger.warning(f"Extraction cache lookup failed: {e}")
+
+    result = runner(_extract_pages, source, hints) if runner else _extract_pages(source, hints)
+
+    # Only successful extractions are cached so a transient failure (or a run cut short
+    # by the time budget under load) can be retried
+    if cache_key and result['text'] and result.get('truncation_reason') != 'time':
+        get_extraction_cache().put(cache_key, result)
+    return result
+
+def pdf_to_text(source):
+    """
+    Extract text from PDF with comprehensive error handling and fallback options
+    """
+    return extract_pdf(source)['text']
+
+def _empty_result():
+    return {'text': '', 'page_count': 0, 'pages_processed': 0, 'ocr_pages': 0, 'blank_pages': 0, 'seconds': 0.0, 'pages': [],
+            'truncated': False, 'truncation_reason': None}
+
+def _validate_source(source):
+    """
+    Reject empty or missing input before any engine touches it. Returns True if usable.
+    """
+    if not source:
+        logger.error("PDF source is empty or None")
+        return False
+
+    if isinstance(source, (bytes, bytearray)):
+        size = len(source)
+        label = "in-memory PDF"
+    else:
+        if not os.path.exists(source):
+            logger.error(f"PDF file does not exist: {source}")
+            return False
         
+        if not os.path.isfile(source):
+            logger.error(f"Path is not a file: {source}")
+            return False
+
         # Check file size (optional safety check)
         try:
-            file_size = os.path.getsize(pdf_path)
-            if file_size == 0:
-                logger.error(f"PDF file is empty: {pdf_path}")
-                return ""
-            if file_size > 50 * 1024 * 1024:  # 50MB limit
-                logger.warning(f"PDF file is very large ({file_size} bytes): {pdf_path}")
+            size = os.path.getsize(source)
         except Exception as e:
             logger.warning(f"Could not check file size: {e}")
-        
-        # Try direct text extraction using pdfplumber
-        try:
-            with pdfplumber.open(pdf_path) as pdf:
-                for page_num, page in enumerate(pdf.pages):
-                    try:
-                        page_text = page.extract_text()
-                        if page_text:
-                            text += page_text + "\n"
-                    except Exception as e:
-                        logger.warning(f"Failed to extract text from page {page_num + 1}: {e}")
-                        continue
-
-            if text.strip():
-                return text.strip()
-            else:
-                logger.info("Direct text extraction returned empty text, trying OCR fallback")
-                
-        except Exception as e:
-            logger.error(f"Direct text extraction failed: {e}")
+            return True
+        label = source
 
-        # Fallback to OCR for image-based PDFs
-        logger.info("Attempting OCR fallback for image-based PDF")
-        try:
-            # Check if pdf2image and pytesseract are available
+    if size == 0:
+        logger.error(f"PDF file is empty: {label}")
+        return False
+    if size > 50 * 1024 * 1024:  # 50MB limit
+        logger.warning(f"PDF file is very large ({size} bytes): {label}")
+    return True
+
+def _extract_pages(source, hints=None):
+    """
+    Classify every page: pages with a text layer are read by the configured
+    text engine, image-only pages (or text pages that come back empty) are sent to OCR.
+    A preflight report saying the document has no fonts skips the text pass entirely.
+    """
+    hints = hints or {}
+    started = time.perf_counter()
+    result = _empty_result()
+    budget = ExtractionBudget(
+        max_pages=Config.PDF_MAX_PAGES,
+        max_seconds=Config.PDF_MAX_SECONDS,
+        max_render_pixels=Config.PDF_MAX_RENDER_PIXELS,
+    )
+
+    try:
+        # Validate input
+        if not _validate_source(source):
+            return result
+
+        pages = {}
+        page_texts = {}
+
+        # Text-layer pass, fastest configured engine first
+        ocr_needed = None
+        text_engines = text_engines_for(Config.PDF_EXTRACTION_ENGINE)
+        if hints.get('text_layer') is False:
+            logger.info("Preflight found no fonts, sending every page straight to OCR")
+            text_engines = []
+        for engine in text_engines:
             try:
-                images = convert_from_path(pdf_path)
+                for page_result in engine.extract(source, budget=budget):
+                    page_num = page_result['page']
+                    page_texts[page_num] = page_result['text']
+                    pages[page_num] = {
+                        'page': page_num,
+                        'method': engine.name,
+                        'text_layer': page_result['text_layer'],
+                        'chars': len(page_result['text'].strip()),
+                        'seconds': round(page_result['seconds'], 4)
+                    }
+                ocr_needed = [n for n in sorted(pages) if not page_texts[n].strip()]
+                break
             except Exception as e:
-                logger.error(f"PDF to image conversion failed: {e}")
-                return text.strip()
-            
-            for image_num, image in enumerate(images):
-                try:
-                    page_text = pytesseract.image_to_string(image)
-                    if page_text:
-                        text += page_text + "\n"
-                except Exception as e:
-                    logger.warning(f"OCR failed for image {image_num + 1}: {e}")
-                    continue
-                    
-            if text.strip():
-                logger.info(f"OCR extraction successful. Extracted {len(text)} characters")
-            else:
-                logger.warning("OCR extraction returned empty text")
-                
-        except Exception as e:
-            logger.error(f"OCR fallback failed: {e}")
+                logger.error(f"Direct text extraction with {engine.name} failed: {e}")
+                pages, page_texts = {}, {}
+
+        # OCR only the pages that have no usable text layer. If no engine could read the file
+        # every page is OCRed; ocr_pdf counts them with poppler rather than trusting the
+        # preflight hint, which may include page objects the document never shows.
+        if ocr_needed is None or ocr_needed:
+            logger.info(f"Attempting OCR for {'all' if ocr_needed is None else len(ocr_needed)} image-only page(s)")
+            try:
+                for ocr_result in ENGINES['ocr'].extract(source, page_numbers=ocr_needed, budget=budget):
+                    page_num = ocr_result['page']
+                    page_texts[page_num] = ocr_result['text']
+                    report = pages.setdefault(page_num, {'page': page_num, 'text_layer': False, 'seconds': 0.0})
+                    report['method'] = 'ocr'
+                    report['chars'] = len(ocr_result['text'].strip())
+                    # Blank pages are empty on purpose, not a failed OCR
+                    report['blank'] = ocr_result['blank']
+                    report['seconds'] = round(report['seconds'] + ocr_result['seconds'], 4)
+            except Exception as e:
+                logger.error(f"OCR fallback failed: {e}")
+
+        text = ""
+        for page_num in sorted(page_texts):
+            if page_texts[page_num] and page_texts[page_num].strip():
+                text += page_texts[page_num] + "\n"
+
+        result['text'] = text.strip()
+        result['pages'] = [pages[n] for n in sorted(pages)]
+        # page_count is the document's length; fewer pages are processed when the budget cuts in
+        result['pages_processed'] = len(result['pages'])
+        result['page_count'] = budget.document_pages or hints.get('page_count') or result['pages_processed']
+        result['ocr_pages'] = sum(1 for page in result['pages'] if page['method'] == 'ocr')
+        result['blank_pages'] = sum(1 for page in result['pages'] if page.get('blank'))
+        result['seconds'] = round(time.perf_counter() - started, 4)
+        result['truncated'] = budget.truncated
+        result['truncation_reason'] = budget.truncation_reason
 
         # Final validation
-        result = text.strip()
-        if not result:
-            logger.error(f"No text could be extracted from PDF: {pdf_path}")
+        if not result['text']:
+            logger.error("No text could be extracted from PDF")
+        else:
+            timings = ", ".join(f"p{page['page']}={page['method']}:{page['seconds']}s" for page in result['pages'])
+            logger.info(f"Extracted {len(result['text'])} characters in {result['seconds']}s ({timings})")
             
         return result
         
     except Exception as e:
         logger.error(f"Unexpected error in pdf_to_text: {e}")
-        return ""
\ No newline at end of file
+        return _empty_result()
@@ -0,0 +1,170 @@
+import time
+import logging
+import threading
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from config import Config
+from models import db, ResumeData
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Columns written by an upsert; id and created_at keep their original values on conflict
+RESUME_FIELDS = ('name', 'email', 'phone', 'education', 'experience', 'skills',
+                 'certifications', 'projects', 'languages', 'additional_info')
+
+_INSERTS = {
+    'sqlite': sqlite_insert,
+    'postgresql': postgresql_insert,
+}
+
+def _fit(row):
+    """
+    Keep only the resume columns and clip strings to their column length
+    (Postgres rejects over-long values; SQLite would silently store them)
+    """
+    fitted = {}
+    for field in RESUME_FIELDS:
+        value = row.get(field)
+        length = getattr(ResumeData.__table__.c[field].type, 'length', None)
+        if isinstance(value, str) and length and len(value) > length:
+            value = value[:length]
+        fitted[field] = value
+    return fitted
+
+def _dedupe(rows):
+    """
+    Last row wins per email: one INSERT ... ON CONFLICT can't touch the same row twice.
+    Emails are compared exactly like the unique constraint does; resume_store_data normalises them.
+    """
+    latest = {}
+    for row in rows:
+        latest[row['email']] = row
+    return list(latest.values())
+
+def upsert_statement(rows, dialect_name):
+    """
+    Single INSERT ... ON CONFLICT(email) DO UPDATE for SQLite and Postgres, or None for other databases
+    """
+    insert = _INSERTS.get(dialect_name)
+    if insert is None:
+        return None
+    statement = insert(ResumeData.__table__).values(rows)
+    return statement.on_conflict_do_update(
+        index_elements=['email'],
+        set_={field: statement.excluded[field] for field in RESUME_FIELDS if field != 'email'}
+    )
+
+def _upsert_fallback(rows):
+    # Databases without ON CONFLICT: look up and update/insert inside the caller's transaction
+    for row in rows:
+        existing = ResumeData.query.filter_by(email=row['email']).first()
+        if existing is None:
+            db.session.add(ResumeData(**row))
+        else:
+            for field, value in row.items():
+                setattr(existing, field, value)
+
+def upsert_resumes(rows):
+    """
+    Insert or update many resumes (keyed by email) in one transaction and one statement.
+    Rows without an email are rejected: email is the conflict key and is NOT NULL.
+    Returns the number of rows written. Requires an application context.
+    """
+    rows = [_fit(row) for row in rows]
+    if any(not row['email'] for row in rows):
+        raise ValueError("Every resume row needs an email")
+    rows = _dedupe(rows)
+    if not rows:
+        return 0
+
+    started = time.perf_counter()
+    try:
+        statement = upsert_statement(rows, db.session.get_bind().dialect.name)
+        if statement is None:
+            _upsert_fallback(rows)
+        else:
+            db.session.execute(statement)
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+    logger.info(f"Upserted {len(rows)} resume rows in {(time.perf_counter() - started) * 1000:.1f}ms")
+    return len(rows)
+
+def upsert_resume(row):
+    """
+    Insert or update one resume in a single round trip (no read-then-write race on email)
+    """
+    return upsert_resumes([row])
+
+
+class ResumeBatchWriter:
+    """
+    Buffers resume upserts and writes them as one multi-row INSERT ... ON CONFLICT
+    per transaction, for bulk processing. Flushes when max_rows are buffered,
+    when the oldest buffered row is older than max_delay seconds (checked on add),
+    and on flush()/close(). Use inside an application context, or pass app.
+    """
+
+    def __init__(self, max_rows=None, max_delay=None, app=None):
+        self.max_rows = max(1, int(max_rows or Config.RESUME_WRITE_BATCH_SIZE))
+        self.max_delay = Config.RESUME_WRITE_MAX_DELAY if max_delay is None else max_delay
+        self.app = app
+        self._rows = []
+        self._oldest = None
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._counters = {'added': 0, 'written': 0, 'flushes': 0, 'failed_flushes': 0}
+
+    def add(self, row):
+        with self._lock:
+            self._rows.append(row)
+            self._counters['added'] += 1
+            if self._oldest is None:
+                self._oldest = time.monotonic()
+            due = len(self._rows) >= self.max_rows or time.monotonic() - self._oldest >= self.max_delay
+        if due:
+            self.flush()
+
+    def flush(self):
+        """
+        Write everything buffered so far; returns the number of rows written.
+        On failure the rows are put back so a later flush can retry them.
+        """
+        with self._flush_lock:
+            with self._lock:
+                rows, self._rows, self._oldest = self._rows, [], None
+            if not rows:
+                return 0
+            try:
+                if self.app is not None:
+                    with self.app.app_context():
+                        written = upsert_resumes(rows)
+                else:
+                    written = upsert_resumes(rows)
+            except Exception as e:
+                logger.error(f"Resume batch flush of {len(rows)} rows failed: {e}")
+                with self._lock:
+                    self._rows = rows + self._rows
+                    self._oldest = time.monotonic()
+                    self._counters['failed_flushes'] += 1
+                raise
+            with self._lock:
+                self._counters['written'] += written
+                self._counters['flushes'] += 1
+            return written
+
+    def close(self):
+        return self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.flush()
+        return False
+
+    def stats(self):
+        with self._lock:
+            return {**self._counters, 'buffered': len(self._rows)}
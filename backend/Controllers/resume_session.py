@@ -0,0 +1,120 @@
+import re
+import time
+import hashlib
+import logging
+import secrets
+import datetime
+import threading
+from config import Config
+from Controllers.cache import LRUCache
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Canonical section name -> headings that introduce it
+SECTION_HEADINGS = {
+    'summary': ('summary', 'professional summary', 'profile', 'about me', 'objective', 'career objective'),
+    'experience': ('experience', 'work experience', 'professional experience', 'employment', 'employment history', 'work history', 'internships', 'internship'),
+    'education': ('education', 'academic background', 'qualifications', 'academics'),
+    'skills': ('skills', 'technical skills', 'core skills', 'key skills', 'core competencies', 'technologies', 'tech stack'),
+    'projects': ('projects', 'personal projects', 'academic projects', 'key projects'),
+    'certifications': ('certifications', 'certificates', 'licenses', 'courses'),
+    'languages': ('languages', 'spoken languages'),
+    'achievements': ('achievements', 'awards', 'honors', 'honours', 'accomplishments'),
+}
+_HEADING_LOOKUP = {heading: section for section, headings in SECTION_HEADINGS.items() for heading in headings}
+_HEADING_CLEAN = re.compile(r'[^a-z ]+')
+
+def _section_for_line(line):
+    stripped = line.strip()
+    if not stripped or len(stripped) > 40:
+        return None
+    return _HEADING_LOOKUP.get(' '.join(_HEADING_CLEAN.sub(' ', stripped.lower()).split()))
+
+def parse_resume_sections(text):
+    """
+    Split resume text on recognised section headings.
+    Returns {section: text}; anything before the first heading is 'header' (name, contact details).
+    """
+    sections = {}
+    current = 'header'
+    lines = []
+    for line in (text or '').splitlines():
+        section = _section_for_line(line)
+        if section is None:
+            lines.append(line)
+            continue
+        if lines:
+            sections[current] = (sections.get(current, '') + '\n' + '\n'.join(lines)).strip()
+        current, lines = section, []
+    if lines:
+        sections[current] = (sections.get(current, '') + '\n' + '\n'.join(lines)).strip()
+    return {name: body for name, body in sections.items() if body}
+
+def resume_content_hash(text):
+    return hashlib.sha256((text or '').encode('utf-8')).hexdigest()
+
+
+class ResumeSessionStore:
+    """
+    Server-side resume sessions keyed by an opaque ID, so follow-up requests
+    (cover letter, ATS score) send the ID instead of the full extracted text.
+    Bounded LRU with TTL: the least recently used sessions are evicted first.
+    """
+
+    def __init__(self, max_items, ttl):
+        self._sessions = LRUCache(max_items, ttl=ttl)
+        self._lock = threading.Lock()
+        self._counters = {'created': 0, 'hits': 0, 'misses': 0}
+
+    def _count(self, counter):
+        with self._lock:
+            self._counters[counter] += 1
+
+    def create(self, text, metadata=None):
+        """
+        Store the extracted text with its content hash and parsed sections; returns the session
+        """
+        started = time.perf_counter()
+        session = {
+            'id': secrets.token_urlsafe(16),
+            'text': text,
+            'content_hash': resume_content_hash(text),
+            'sections': parse_resume_sections(text),
+            'metadata': metadata or {},
+            'created_at': datetime.datetime.now().isoformat(),
+        }
+        self._sessions.put(session['id'], session)
+        self._count('created')
+        logger.info(
+            f"Resume session created: {len(text)} chars, sections {sorted(session['sections'])} "
+            f"in {(time.perf_counter() - started) * 1000:.1f}ms"
+        )
+        return session
+
+    def get(self, session_id):
+        """
+        The session for session_id, or None if it never existed, expired or was evicted
+        """
+        session = self._sessions.get(session_id) if session_id else None
+        self._count('hits' if session is not None else 'misses')
+        return session
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._counters)
+        stats['sessions'] = len(self._sessions)
+        stats['max_sessions'] = self._sessions.max_items
+        return stats
+
+
+resume_sessions = ResumeSessionStore(Config.RESUME_SESSION_MAX_ITEMS, Config.RESUME_SESSION_TTL)
+
+def create_resume_session(text, metadata=None):
+    return resume_sessions.create(text, metadata)
+
+def get_resume_session(session_id):
+    return resume_sessions.get(session_id)
+
+def resume_session_stats():
+    return resume_sessions.stats()
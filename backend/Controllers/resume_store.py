@@ -2,7 +2,9 @@ import logging
 import json
 import datetime
 from Controllers import prompt
-from models import db, ResumeData
+from Controllers.llm_governor import LLMUnavailable
+from models import db
+from Controllers.resume_persistence import upsert_resume
 from validation import (
     clean_json_response,
     extract_basic_info_fallback,
@@ -21,9 +23,11 @@ def log_error(error_type, error_message, context=""):
         log_message += f" | Context: {context}"
     logger.error(log_message)
 
-def resume_store_data(model, resume_text):
+def resume_store_data(model, resume_text, writer=None):
     """
-    Process the resume text and store in database with comprehensive error handling
+    Process the resume text and store in database with comprehensive error handling.
+    The record is upserted on email in a single statement; bulk callers pass a
+    ResumeBatchWriter to group many records into one transaction.
     """
     try:
         # Input validation
@@ -65,7 +69,7 @@ Return only the JSON object, no additional text or explanation.
 """
             
             logger.info("Generating AI response for resume data extraction")
-            response = prompt(model, prompt_text)
+            response = prompt(model, prompt_text, endpoint="resume_store")
             
             if not response:
                 log_error("AIResponseError", "No response from model", "resume_store_data")
@@ -73,6 +77,10 @@ Return only the JSON object, no additional text or explanation.
             
             logger.info(f"Raw AI response length: {len(response)}")
             
+        except LLMUnavailable as e:
+            # Transient: the caller (the resume store worker) should retry later, not give up
+            log_error("AIUnavailable", str(e), "resume_store_data")
+            return {'error': 'AI service temporarily unavailable', 'retry_after': e.retry_after}, 503
         except Exception as e:
             log_error("AIProcessingError", str(e), "resume_store_data")
             return {'error': 'AI processing failed'}, 500
@@ -109,7 +117,8 @@ Return only the JSON object, no additional text or explanation.
         # Extract and validate data
         try:
             name = data.get('name', '').strip() if data.get('name') else None
-            email = data.get('email', '').strip() if data.get('email') else None
+            # Normalised once here: the unique constraint and the batch dedupe both compare it as-is
+            email = data.get('email', '').strip().lower() if data.get('email') else None
             phone = data.get('phone', '').strip() if data.get('phone') else None
             education = data.get('education', '').strip() if data.get('education') else None
             experience = data.get('experience', '').strip() if data.get('experience') else None
@@ -138,59 +147,34 @@ Return only the JSON object, no additional text or explanation.
             log_error("DataValidationError", str(e), "resume_store_data")
             return {'error': 'Data validation failed'}, 500
         
-        # Database operations
+        # Database operations: one INSERT ... ON CONFLICT(email) DO UPDATE (or a buffered batch)
+        if not email:
+            log_error("DataValidationError", "No valid email found", f"Name: {name}")
+            return {'error': 'A valid email is required to store resume data'}, 422
         try:
-            existing_resume = None
-            if email:
-                existing_resume = ResumeData.query.filter_by(email=email).first()
-            
-            if existing_resume:
-                # Update existing record
-                try:
-                    existing_resume.name = name
-                    existing_resume.phone = phone
-                    existing_resume.education = education
-                    existing_resume.experience = experience
-                    existing_resume.skills = skills
-                    existing_resume.certifications = certifications
-                    existing_resume.projects = projects
-                    existing_resume.languages = languages
-                    existing_resume.additional_info = additional_info
-                    existing_resume.updated_at = datetime.datetime.utcnow()
-                    
-                    db.session.commit()
-                    message = "Resume data updated successfully"
-                    logger.info(f"Updated existing resume for email: {email}")
-                    
-                except Exception as e:
-                    db.session.rollback()
-                    log_error("DatabaseUpdateError", str(e), f"Email: {email}")
-                    return {'error': 'Failed to update resume data'}, 500
+            row = {
+                'name': name,
+                'email': email,
+                'phone': phone,
+                'education': education,
+                'experience': experience,
+                'skills': skills,
+                'certifications': certifications,
+                'projects': projects,
+                'languages': languages,
+                'additional_info': additional_info
+            }
+            if writer is not None:
+                writer.add(row)
+                message = "Resume data queued for storage"
             else:
-                # Create new record
                 try:
-                    new_resume = ResumeData(
-                        name=name,
-                        email=email,
-                        phone=phone,
-                        education=education,
-                        experience=experience,
-                        skills=skills,
-                        certifications=certifications,
-                        projects=projects,
-                        languages=languages,
-                        additional_info=additional_info
-                    )
-                    
-                    db.session.add(new_resume)
-                    db.session.commit()
-                    message = "Resume data stored successfully"
-                    logger.info(f"Created new resume record for: {name}")
-                    
+                    upsert_resume(row)
                 except Exception as e:
-                    db.session.rollback()
-                    log_error("DatabaseInsertError", str(e), f"Name: {name}")
+                    log_error("DatabaseUpsertError", str(e), f"Email: {email}")
                     return {'error': 'Failed to store resume data'}, 500
+                message = "Resume data stored successfully"
+            logger.info(f"{message} for email: {email}")
             
             # Return success response
             return {
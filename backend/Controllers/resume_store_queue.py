@@ -0,0 +1,167 @@
+import time
+import logging
+import threading
+from config import Config
+from Controllers.concurrency import map_io
+from Controllers.job_queue import JobQueue
+from Controllers.model_registry import get_model
+from Controllers.resume_persistence import ResumeBatchWriter
+from Controllers.resume_store import resume_store_data
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+QUEUE_NAME = 'resume_store'
+# resume_store_data results that retrying can't fix (bad input, no email in the resume)
+PERMANENT_FAILURES = (400, 422)
+# AI service unavailable: the job is released without using up an attempt
+UNAVAILABLE = 503
+
+
+class ResumeStoreWorker:
+    """
+    Drains the durable resume_store queue on a daemon thread: leases a batch,
+    runs the structured extraction for each resume concurrently, then writes
+    the whole batch in one upsert transaction. Jobs are only deleted once their
+    rows are committed, so nothing is lost if the process stops mid-batch.
+    """
+
+    def __init__(self, queue, batch_size, concurrency, poll_seconds, lease_seconds):
+        self.queue = queue
+        self.batch_size = max(1, int(batch_size))
+        self.concurrency = max(1, int(concurrency))
+        self.poll_seconds = poll_seconds
+        self.lease_seconds = lease_seconds
+        self._app = None
+        self._thread = None
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._counters = {'enqueued': 0, 'stored': 0, 'retried': 0, 'deferred': 0, 'dead': 0, 'batches': 0}
+
+    def _count(self, counter, amount=1):
+        with self._lock:
+            self._counters[counter] += amount
+
+    def enqueue(self, resume_text, metadata=None):
+        job_id = self.queue.enqueue(QUEUE_NAME, {'resume_text': resume_text, 'metadata': metadata or {}})
+        self._count('enqueued')
+        self._wake.set()
+        return job_id
+
+    def start(self, app):
+        """
+        Start draining on a daemon thread; jobs left by a previous process are picked up
+        as soon as their lease runs out. Safe to call more than once.
+        """
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._app = app
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name='resume-store-worker', daemon=True)
+            self._thread.start()
+        logger.info(f"Resume store worker started (batch {self.batch_size}, concurrency {self.concurrency})")
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                processed = self.drain_once()
+            except Exception as e:
+                logger.error(f"Resume store worker error: {e}")
+                processed = 0
+            if not processed:
+                self._wake.wait(self.poll_seconds)
+                self._wake.clear()
+
+    def _fail(self, job, error, retry=True):
+        status = self.queue.fail(job, error, retry=retry)
+        self._count('dead' if status == 'dead' else 'retried')
+
+    def _defer(self, job, error, retry_after=None):
+        # Outages can outlast every retry; waiting them out must not dead-letter the job
+        self.queue.release(job, retry_after or self.queue.retry_backoff, error)
+        self._count('deferred')
+
+    def drain_once(self):
+        """
+        Process one leased batch; returns the number of jobs taken
+        """
+        jobs = self.queue.lease(QUEUE_NAME, self.batch_size, self.lease_seconds)
+        if not jobs:
+            return 0
+        started = time.perf_counter()
+        model = get_model()
+        if not model:
+            for job in jobs:
+                self._defer(job, 'AI model not available')
+            return len(jobs)
+
+        # Rows are buffered until every extraction in the batch has finished, then committed together
+        writer = ResumeBatchWriter(max_rows=len(jobs) + 1, max_delay=float('inf'), app=self._app)
+
+        def store(job):
+            with self._app.app_context():
+                return resume_store_data(model, job.payload['resume_text'], writer=writer)
+
+        buffered = []
+        for job, (result, error) in zip(jobs, map_io(store, jobs, self.concurrency)):
+            if error is not None:
+                self._fail(job, error)
+                continue
+            body, status = result
+            if status == 200:
+                buffered.append(job)
+            elif status == UNAVAILABLE:
+                self._defer(job, body.get('error'), body.get('retry_after'))
+            else:
+                self._fail(job, body.get('error', f'HTTP {status}'), retry=status not in PERMANENT_FAILURES)
+
+        try:
+            writer.flush()
+        except Exception as e:
+            for job in buffered:
+                self._fail(job, f'Database write failed: {e}')
+            buffered = []
+        self.queue.complete(buffered)
+        self._count('stored', len(buffered))
+        self._count('batches')
+        logger.info(
+            f"Resume store batch: {len(buffered)}/{len(jobs)} stored in {time.perf_counter() - started:.1f}s"
+        )
+        return len(jobs)
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._counters)
+        stats['running'] = self._thread is not None and self._thread.is_alive()
+        try:
+            stats['queue'] = self.queue.stats(QUEUE_NAME)
+        except Exception as e:
+            stats['queue'] = {'error': str(e)}
+        return stats
+
+
+resume_store_worker = ResumeStoreWorker(
+    JobQueue(Config.JOB_QUEUE_PATH, Config.JOB_QUEUE_MAX_ATTEMPTS, Config.JOB_QUEUE_RETRY_BACKOFF),
+    Config.JOB_QUEUE_BATCH_SIZE,
+    Config.JOB_QUEUE_CONCURRENCY,
+    Config.JOB_QUEUE_POLL_SECONDS,
+    Config.JOB_QUEUE_LEASE_SECONDS
+)
+
+def enqueue_resume_store(resume_text, metadata=None):
+    return resume_store_worker.enqueue(resume_text, metadata)
+
+def start_resume_store_worker(app):
+    resume_store_worker.start(app)
+
+def requeue_dead_resume_store_jobs():
+    return resume_store_worker.queue.requeue_dead(QUEUE_NAME)
+
+def resume_store_queue_stats():
+    return resume_store_worker.stats()
@@ -0,0 +1,313 @@
+import io
+import os
+import time
+import logging
+import secrets
+import zipfile
+import datetime
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from config import Config
+from Controllers.cache import LRUCache
+from Controllers.concurrency import map_io
+from Controllers.extraction_pool import run_extraction, ExtractionQueueFull, ExtractionTimeout
+from Controllers.ats import generate_ats_score, llm_score_error
+from Controllers.ats_prescore import prescore_ats, prescore_matrix, top_k_indices, rerank, score_agreement
+from validation import preflight_pdf
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# How often a document waits for room in the extraction queue before giving up
+EXTRACTION_QUEUE_RETRIES = 10
+EXTRACTION_QUEUE_BACKOFF = 1.0
+
+
+class ScreeningLimitExceeded(Exception):
+    """Raised when a screening upload has too many files or too many jobs are already running"""
+
+
+def read_zip_pdfs(data, max_files, max_file_bytes, max_total_bytes=None):
+    """
+    [(filename, bytes)] for every PDF in a zip archive. Member sizes are checked
+    while reading, so a zip bomb can't expand past max_file_bytes per entry or
+    max_total_bytes for the whole archive.
+    """
+    documents = []
+    total = 0
+    with zipfile.ZipFile(io.BytesIO(data)) as archive:
+        for info in archive.infolist():
+            name = info.filename
+            if info.is_dir() or not name.lower().endswith('.pdf') or '__MACOSX' in name:
+                continue
+            if len(documents) >= max_files:
+                raise ScreeningLimitExceeded(f"Archive contains more than {max_files} PDFs")
+            with archive.open(info) as member:
+                content = member.read(max_file_bytes + 1)
+            total += len(content)
+            if max_total_bytes and total > max_total_bytes:
+                raise ScreeningLimitExceeded(f"Archive expands to more than {max_total_bytes} bytes")
+            # Oversized members are kept (truncated) so preflight reports them as too large
+            documents.append((os.path.basename(name), content))
+    return documents
+
+
+class ScreeningJob:
+    """
+    One bulk screening run: many resumes ranked against one job description.
+    Progress and results are updated by the pipeline and read by the API.
+    """
+
+    def __init__(self, job_description, documents):
+        self.id = secrets.token_urlsafe(12)
+        self.job_description = job_description
+        self.created_at = datetime.datetime.now().isoformat()
+        self.finished_at = None
+        self.status = 'queued'
+        self.total = len(documents)
+        self._documents = documents
+        self._results = {}
+        self._lock = threading.Lock()
+        self._version = 0
+
+    @property
+    def version(self):
+        """Increments on every update; streaming clients use it to detect changes"""
+        return self._version
+
+    def update(self, **fields):
+        with self._lock:
+            for key, value in fields.items():
+                setattr(self, key, value)
+            self._version += 1
+
+    def record(self, index, result):
+        with self._lock:
+            self._results[index] = result
+            self._version += 1
+
+    def patch(self, index, **fields):
+        with self._lock:
+            self._results[index].update(fields)
+            self._version += 1
+
+    def ranked_results(self):
+        """
+        Processed documents in final order: the top-k by ATS score (by local score
+        where the LLM call failed, flagged llm_failed), then the rest by local
+        score; documents that failed extraction last, unranked
+        """
+        with self._lock:
+            results = [dict(result, index=index) for index, result in sorted(self._results.items())]
+        scored = [result for result in results if result['local_score'] is not None]
+        ranks = rerank(
+            [r['local_score'] for r in scored],
+            [r['ats_score'] for r in scored],
+            [i for i, r in enumerate(scored) if r['llm_scored']]
+        )
+        for result, rank in zip(scored, ranks):
+            result['rank'] = rank
+            result['llm_failed'] = result['llm_scored'] and result['llm_error'] is not None
+        failed = [dict(result, rank=None) for result in results if result['local_score'] is None]
+        return sorted(scored, key=lambda r: r['rank']) + failed
+
+    def progress(self):
+        with self._lock:
+            done = len(self._results)
+            failed = sum(1 for result in self._results.values() if not result['success'])
+            llm_scored = sum(1 for result in self._results.values() if result['ats_score'] is not None)
+            return {
+                'job_id': self.id,
+                'status': self.status,
+                'total': self.total,
+                'processed': done,
+                'failed': failed,
+                'llm_scored': llm_scored,
+                'percent': round(done * 100 / self.total, 1) if self.total else 100.0,
+                'created_at': self.created_at,
+                'finished_at': self.finished_at,
+            }
+
+    def snapshot(self):
+        snapshot = self.progress()
+        snapshot['job_description'] = self.job_description
+        snapshot['results'] = self.ranked_results()
+        snapshot['agreement'] = score_agreement(
+            [result['local_score'] for result in snapshot['results']],
+            [result['ats_score'] for result in snapshot['results']]
+        )
+        return snapshot
+
+    @property
+    def finished(self):
+        return self.status in ('completed', 'failed')
+
+    def run(self, model, concurrency, llm_top_k):
+        """
+        Stage 1: extract every document (process pool) and score it locally.
+        Stage 2: re-score all resumes with IDF over the whole set, then send the
+        llm_top_k best to Gemini (I/O pool) to re-rank the shortlist.
+        """
+        self.update(status='extracting')
+        started = time.perf_counter()
+        documents, self._documents = self._documents, None
+        texts = {}
+
+        def extract(item):
+            index, (filename, data) = item
+            result, text = extract_document(self.job_description, filename, data)
+            if text:
+                texts[index] = text
+            self.record(index, result)
+
+        def llm_score(index):
+            started_at = time.perf_counter()
+            score, error = None, None
+            try:
+                score = generate_ats_score(model, texts[index], self.job_description)
+            except Exception as e:
+                error = e
+            message = llm_score_error(error, score)
+            self.patch(index, ats_score=score if message is None else None, llm_error=message,
+                       llm_seconds=round(time.perf_counter() - started_at, 3))
+
+        try:
+            for _, error in map_io(extract, list(enumerate(documents)), concurrency, executor=_get_screening_pool()):
+                if error is not None:
+                    logger.error(f"Screening job {self.id} worker failed: {error}")
+
+            indices = sorted(texts)
+            if indices:
+                local_scores = prescore_matrix([texts[i] for i in indices], [self.job_description])[:, 0]
+                for index, score in zip(indices, local_scores):
+                    self.patch(index, local_score=float(score))
+                shortlist = [indices[i] for i in top_k_indices(local_scores, llm_top_k)]
+                for index in shortlist:
+                    self.patch(index, llm_scored=True)
+
+                self.update(status='scoring')
+                for _, error in map_io(llm_score, shortlist, concurrency, executor=_get_screening_pool()):
+                    if error is not None:
+                        logger.error(f"Screening job {self.id} scorer failed: {error}")
+
+            self.update(status='completed', finished_at=datetime.datetime.now().isoformat())
+        except Exception as e:
+            logger.error(f"Screening job {self.id} failed: {e}")
+            self.update(status='failed', finished_at=datetime.datetime.now().isoformat())
+        logger.info(f"Screening job {self.id}: {self.total} documents in {time.perf_counter() - started:.1f}s")
+
+
+_screening_pool = None
+_screening_pool_lock = threading.Lock()
+
+def _get_screening_pool():
+    """
+    Threads for screening jobs only: a document holds its thread for the whole
+    extraction (including queue backoff), which must not starve interactive
+    requests on the shared I/O pool
+    """
+    global _screening_pool
+    with _screening_pool_lock:
+        if _screening_pool is None:
+            _screening_pool = ThreadPoolExecutor(max_workers=Config.SCREENING_WORKERS, thread_name_prefix='screening')
+        return _screening_pool
+
+def _extract_with_backoff(data, hints):
+    for attempt in range(EXTRACTION_QUEUE_RETRIES):
+        try:
+            return run_extraction(data, hints=hints)
+        except ExtractionQueueFull:
+            # Interactive uploads share the extraction pool; wait for room instead of failing the document
+            time.sleep(EXTRACTION_QUEUE_BACKOFF * (attempt + 1))
+    return run_extraction(data, hints=hints)
+
+def extract_document(job_description, filename, data):
+    """
+    One document through preflight -> extraction -> provisional local score.
+    Returns (result, text); never raises, failures are reported in the result.
+    """
+    started = time.perf_counter()
+    result = {'filename': filename, 'local_score': None, 'ats_score': None, 'llm_scored': False,
+              'llm_error': None, 'success': False, 'error': None,
+              'page_count': None, 'text_length': None}
+    text = None
+    try:
+        preflight = preflight_pdf(data)
+        if not preflight['valid']:
+            result['error'] = preflight['error']
+            return result, None
+
+        extraction = _extract_with_backoff(data, preflight)
+        text = extraction['text']
+        result['page_count'] = extraction['page_count']
+        result['text_length'] = len(text)
+        if not text:
+            result['error'] = 'Failed to extract text from PDF'
+            return result, None
+        result['local_score'] = prescore_ats(text, job_description)
+        result['success'] = True
+        return result, text
+    except ExtractionQueueFull:
+        result['error'] = 'Server busy'
+    except ExtractionTimeout:
+        result['error'] = 'PDF processing timed out'
+    except Exception as e:
+        logger.error(f"Screening failed for {filename}: {e}")
+        result['error'] = 'Processing failed'
+    finally:
+        result['seconds'] = round(time.perf_counter() - started, 3)
+    return result, None
+
+
+class ScreeningJobStore:
+    """
+    Bounded registry of screening jobs; each job runs on its own daemon thread.
+    Running jobs are pinned (at most max_active of them) so they can't be evicted
+    while a client polls them; finished jobs move to an LRU and are evicted
+    least-recently-used / after their TTL.
+    """
+
+    def __init__(self, max_jobs, ttl, max_active):
+        self._jobs = LRUCache(max_jobs, ttl=ttl)
+        self._running = {}
+        self.max_active = max(1, int(max_active))
+        self._lock = threading.Lock()
+
+    def start(self, model, job_description, documents, concurrency=None, llm_top_k=None):
+        job = ScreeningJob(job_description, documents)
+        with self._lock:
+            if len(self._running) >= self.max_active:
+                raise ScreeningLimitExceeded(f"{len(self._running)} screening jobs already running")
+            self._running[job.id] = job
+
+        def _run():
+            try:
+                job.run(
+                    model,
+                    concurrency or Config.SCREENING_CONCURRENCY,
+                    Config.ATS_LLM_TOP_K if llm_top_k is None else llm_top_k
+                )
+            finally:
+                # The TTL of a finished job counts from when it finished
+                self._jobs.put(job.id, job)
+                with self._lock:
+                    self._running.pop(job.id, None)
+
+        threading.Thread(target=_run, name=f"screening-{job.id}", daemon=True).start()
+        return job
+
+    def get(self, job_id):
+        with self._lock:
+            job = self._running.get(job_id)
+        return job if job is not None else self._jobs.get(job_id)
+
+    def stats(self):
+        with self._lock:
+            active = len(self._running)
+        return {'jobs': len(self._jobs) + active, 'active': active, 'max_active': self.max_active}
+
+
+screening_jobs = ScreeningJobStore(Config.SCREENING_MAX_JOBS, Config.SCREENING_JOB_TTL, Config.SCREENING_MAX_ACTIVE_JOBS)
+
+def screening_stats():
+    return screening_jobs.stats()
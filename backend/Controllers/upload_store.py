@@ -0,0 +1,51 @@
+import os
+import time
+import logging
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+def persist_upload(data, filename, upload_folder):
+    """
+    Write an uploaded PDF to the upload folder. Only used when UPLOAD_PERSIST is enabled.
+    Returns the saved path.
+    """
+    os.makedirs(upload_folder, exist_ok=True)
+    file_path = os.path.join(upload_folder, filename)
+    with open(file_path, 'wb') as f:
+        f.write(data)
+    return file_path
+
+def prune_uploads(upload_folder, max_age_days=None, max_files=None):
+    """
+    Apply the retention policy: delete uploads older than max_age_days, then the
+    oldest files beyond max_files. Returns the number of files removed.
+    """
+    try:
+        entries = []
+        for name in os.listdir(upload_folder):
+            path = os.path.join(upload_folder, name)
+            if os.path.isfile(path):
+                entries.append((os.path.getmtime(path), path))
+    except FileNotFoundError:
+        return 0
+
+    entries.sort()
+    expired = []
+    if max_age_days:
+        cutoff = time.time() - max_age_days * 24 * 60 * 60
+        expired = [path for mtime, path in entries if mtime < cutoff]
+        entries = [(mtime, path) for mtime, path in entries if mtime >= cutoff]
+    if max_files and len(entries) > max_files:
+        expired += [path for _, path in entries[:len(entries) - max_files]]
+
+    removed = 0
+    for path in expired:
+        try:
+            os.remove(path)
+            removed += 1
+        except OSError as e:
+            logger.warning(f"Could not remove expired upload {path}: {e}")
+    if removed:
+        logger.info(f"Removed {removed} expired uploads from {upload_folder}")
+    return removed
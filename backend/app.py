@@ -5,13 +5,14 @@ from flask_cors import CORS
 from dotenv import load_dotenv
 from config import Config
 from flask_migrate import Migrate
-from models import db
+from models import db, apply_engine_profile, engine_self_check, ensure_search_index, include_object
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-migrate = Migrate()
+# The FTS5 search tables are created outside the models; keep autogenerate from dropping them
+migrate = Migrate(include_object=include_object)
 
 def create_app():
     """Create and configure Flask application"""
@@ -27,11 +28,22 @@ def create_app():
             app.config.from_object(Config)
             db.init_app(app)
             migrate.init_app(app, db)
+            # SQLite pragmas (WAL, synchronous, busy_timeout, mmap) on every new connection
+            with app.app_context():
+                apply_engine_profile(db.engine)
             logger.info("Database configuration loaded successfully")
         except Exception as e:
             logger.error(f"Database configuration failed: {e}")
             raise
         
+        # Fail fast on a misconfigured extraction engine instead of on every upload
+        try:
+            from Controllers.extraction_engines import validate_engine_setting
+            validate_engine_setting(app.config['PDF_EXTRACTION_ENGINE'])
+        except Exception as e:
+            logger.error(f"Extraction engine configuration failed: {e}")
+            raise
+        
         # Configure CORS - allow requests from frontend
         try:
             urls = os.getenv("FRONTEND_URL")
@@ -42,24 +54,26 @@ def create_app():
             logger.error(f"CORS configuration failed: {e}")
             raise
         
-        # Setup upload folder
+        # Setup upload folder (only used when UPLOAD_PERSIST is enabled)
         try:
             UPLOAD_FOLDER = 'uploads'  # Directory to save uploaded PDFs
             app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
-            os.makedirs(UPLOAD_FOLDER, exist_ok=True)  # Ensure upload folder exists
-            logger.info(f"Upload folder configured: {UPLOAD_FOLDER}")
+            if app.config['UPLOAD_PERSIST']:
+                os.makedirs(UPLOAD_FOLDER, exist_ok=True)  # Ensure upload folder exists
+                logger.info(f"Upload folder configured: {UPLOAD_FOLDER} (retention {app.config['UPLOAD_RETENTION_DAYS']} days)")
         except Exception as e:
             logger.error(f"Upload folder setup failed: {e}")
             raise
         
         # Import and register blueprints
         try:
-            from routes import api_bp, pdf_bp
+            from routes import api_bp, pdf_bp, screening_bp
             @app.route('/check')
             def check():
                 return jsonify({"status": "ok"})
             app.register_blueprint(pdf_bp, url_prefix='/api')
             app.register_blueprint(api_bp, url_prefix='/api')
+            app.register_blueprint(screening_bp, url_prefix='/api')
             logger.info("Blueprints registered successfully")
         except ImportError as e:
             logger.error(f"Blueprint import failed: {e}")
@@ -68,6 +82,14 @@ def create_app():
             logger.error(f"Blueprint registration failed: {e}")
             raise
 
+        # Register CLI commands (flask bench ...)
+        try:
+            from commands import register_commands
+            register_commands(app)
+        except Exception as e:
+            logger.error(f"CLI command registration failed: {e}")
+            raise
+
         # Add global error handlers
         @app.errorhandler(404)
         def not_found(error):
@@ -91,6 +113,9 @@ def create_app():
             with app.app_context():
                 db.create_all()
                 logger.info("Database tables created successfully")
+                engine_self_check(db.engine)
+                # Full-text search index over resume_data (SQLite FTS5, kept in sync by triggers)
+                ensure_search_index(db.engine)
         except Exception as e:
             logger.error(f"Database table creation failed: {e}")
             # Don't raise here as app can still function without tables initially
@@ -0,0 +1,227 @@
+import json
+import logging
+import click
+from flask.cli import AppGroup
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+bench_cli = AppGroup('bench', help='Performance benchmarks')
+search_cli = AppGroup('search', help='Resume full-text search index')
+jobs_cli = AppGroup('jobs', help='Durable job queue')
+
+@jobs_cli.command('stats')
+def jobs_stats():
+    """Queued, leased and dead resume store jobs"""
+    from Controllers.resume_store_queue import resume_store_worker, QUEUE_NAME
+
+    click.echo(json.dumps(resume_store_worker.queue.stats(QUEUE_NAME), indent=2))
+
+@jobs_cli.command('requeue-dead')
+def jobs_requeue_dead():
+    """Give dead resume store jobs a fresh set of attempts (e.g. after an outage)"""
+    from Controllers.resume_store_queue import requeue_dead_resume_store_jobs
+
+    click.echo(json.dumps({'requeued': requeue_dead_resume_store_jobs()}, indent=2))
+
+@search_cli.command('rebuild')
+def search_rebuild():
+    """Rebuild the FTS5 resume index from resume_data (after bulk loads or restores)"""
+    from models import db, rebuild_search_index
+
+    try:
+        rows, seconds = rebuild_search_index(db.engine)
+    except RuntimeError as e:
+        raise click.ClickException(str(e))
+    click.echo(json.dumps({'rows': rows, 'seconds': seconds}, indent=2))
+
+@bench_cli.command('ocr')
+@click.argument('pdf_path', type=click.Path(exists=True, dir_okay=False))
+@click.option('--pages', default=3, show_default=True, help='Number of pages to render')
+@click.option('--repeats', default=3, show_default=True, help='Passes over the rendered pages')
+@click.option('--dpi', default=None, type=int, help='Render DPI (defaults to OCR_DPI)')
+def bench_ocr(pdf_path, pages, repeats, dpi):
+    """Compare warm tesseract instances with the per-call pytesseract path"""
+    from pdf2image import convert_from_path
+    from config import Config
+    from Controllers.ocr_backends import benchmark_ocr_backends
+
+    images = convert_from_path(pdf_path, dpi=dpi or Config.OCR_DPI, first_page=1, last_page=pages)
+    try:
+        results = benchmark_ocr_backends(images, repeats=repeats)
+    finally:
+        for image in images:
+            image.close()
+    click.echo(json.dumps(results, indent=2))
+
+@bench_cli.command('ocr-preprocess')
+@click.argument('corpus_dir', type=click.Path(exists=True, file_okay=False))
+@click.option('--pages', default=3, show_default=True, help='Pages rendered per PDF')
+@click.option('--dpi', default=None, type=int, help='Render DPI (defaults to OCR_DPI)')
+def bench_ocr_preprocess(corpus_dir, pages, dpi):
+    """Measure OCR latency with and without preprocessing over a directory of PDFs"""
+    import os
+    from pdf2image import convert_from_path
+    from config import Config
+    from Controllers.ocr_backends import get_ocr_backend
+    from Controllers.ocr_preprocess import benchmark_preprocessing
+
+    backend = get_ocr_backend()
+    totals = {}
+    for name in sorted(os.listdir(corpus_dir)):
+        if not name.lower().endswith('.pdf'):
+            continue
+        images = convert_from_path(os.path.join(corpus_dir, name), dpi=dpi or Config.OCR_DPI,
+                                   first_page=1, last_page=pages)
+        try:
+            results = benchmark_preprocessing(images, backend)
+        finally:
+            for image in images:
+                image.close()
+        click.echo(f"{name}: {json.dumps(results)}")
+        for variant, stats in results.items():
+            total = totals.setdefault(variant, {})
+            for key, value in stats.items():
+                total[key] = round(total.get(key, 0) + value, 1)
+    click.echo(json.dumps({'backend': backend.name, 'totals': totals}, indent=2))
+
+@bench_cli.command('llm')
+@click.option('--requests', 'total', default=200, show_default=True, help='Number of prompt() calls')
+@click.option('--concurrency', default=16, show_default=True, help='Concurrent callers')
+@click.option('--endpoint', default='ats', show_default=True, help='Endpoint name used for limits and metrics')
+def bench_llm(total, concurrency, endpoint):
+    """Drive prompt() through the call governor (use LLM_PROVIDER=stub to run offline)"""
+    import time
+    from concurrent.futures import ThreadPoolExecutor
+    from Controllers import get_model, model_status, prompt, governor_stats, LLMUnavailable
+
+    model = get_model()
+    if model is None:
+        raise click.ClickException('No model available from the configured provider')
+
+    def one(i):
+        started = time.perf_counter()
+        try:
+            ok = prompt(model, f'"ats_score" benchmark request {i}', endpoint=endpoint, use_cache=False) is not None
+        except LLMUnavailable:
+            ok = False
+        return ok, (time.perf_counter() - started) * 1000
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(one, range(total)))
+    elapsed = time.perf_counter() - started
+
+    latencies = sorted(ms for _, ms in results)
+    percentile = lambda q: round(latencies[min(len(latencies) - 1, int(q * len(latencies)))], 1)
+    click.echo(json.dumps({
+        'provider': model_status()['provider'],
+        'requests': total,
+        'concurrency': concurrency,
+        'succeeded': sum(1 for ok, _ in results if ok),
+        'throughput_rps': round(total / elapsed, 1),
+        'p50_ms': percentile(0.50),
+        'p95_ms': percentile(0.95),
+        'p99_ms': percentile(0.99),
+        'governor': governor_stats()
+    }, indent=2))
+
+@bench_cli.command('search')
+@click.option('--rows', default=100000, show_default=True, help='Synthetic resumes to index')
+@click.option('--queries', default=200, show_default=True, help='Search queries to time')
+@click.option('--like-queries', default=20, show_default=True, help='Queries timed against the LIKE scan (slow)')
+@click.option('--seed', default=7, show_default=True, help='Random seed for the synthetic data')
+def bench_search(rows, queries, like_queries, seed):
+    """Search latency at scale: FTS5 vs LIKE over a throwaway SQLite database"""
+    import os
+    import random
+    import shutil
+    import tempfile
+    import time
+    from sqlalchemy import create_engine, insert
+    from models import ResumeData, apply_engine_profile, ensure_search_index, search_resumes
+    from models.resume_search import _like_search, search_terms
+
+    rng = random.Random(seed)
+    skills = ['python', 'java', 'c++', 'c#', 'go', 'rust', 'javascript', 'typescript', 'react', 'angular', 'vue',
+              'django', 'flask', 'fastapi', 'spring', 'node', 'sql', 'postgresql', 'mysql', 'mongodb', 'redis',
+              'kafka', 'spark', 'hadoop', 'airflow', 'docker', 'kubernetes', 'terraform', 'aws', 'azure', 'gcp',
+              'linux', 'git', 'pandas', 'numpy', 'pytorch', 'tensorflow', 'scikit', 'tableau', 'excel', 'figma']
+    roles = ['backend', 'frontend', 'fullstack', 'data', 'platform', 'mobile', 'ml', 'devops', 'security', 'qa']
+    certs = ['aws certified', 'azure fundamentals', 'cka', 'pmp', 'scrum master', 'gcp associate', 'ccna', 'comptia']
+    words = ['built', 'led', 'designed', 'migrated', 'scaled', 'maintained', 'optimized', 'automated', 'shipped']
+
+    def resume(i):
+        picked = rng.sample(skills, rng.randint(4, 10))
+        return {
+            'name': f'Candidate {i}', 'email': f'candidate{i}@example.com',
+            'skills': ', '.join(picked),
+            'experience': ' '.join(f"{rng.choice(words)} {rng.choice(roles)} services with {rng.choice(picked)}" for _ in range(3)),
+            'projects': f"{rng.choice(roles)} {rng.choice(picked)} project",
+            'certifications': rng.choice(certs) if rng.random() < 0.4 else None,
+        }
+
+    def percentiles(samples):
+        samples = sorted(samples)
+        at = lambda q: round(samples[min(len(samples) - 1, int(q * len(samples)))], 2)
+        return {'p50_ms': at(0.50), 'p95_ms': at(0.95), 'p99_ms': at(0.99)}
+
+    workdir = tempfile.mkdtemp(prefix='bench-search-')
+    path = os.path.join(workdir, 'search.db')
+    engine = create_engine(f'sqlite:///{path}')
+    apply_engine_profile(engine)
+    ResumeData.__table__.create(engine)
+
+    started = time.perf_counter()
+    with engine.begin() as conn:
+        for offset in range(0, rows, 5000):
+            conn.execute(insert(ResumeData.__table__), [resume(i) for i in range(offset, min(rows, offset + 5000))])
+    seed_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    if not ensure_search_index(engine):
+        raise click.ClickException('SQLite was built without FTS5')
+    index_seconds = time.perf_counter() - started
+
+    # One to three terms per query, a mix of common and rare skills
+    query_texts = [' '.join(rng.sample(skills, rng.randint(1, 3))) for _ in range(max(queries, like_queries))]
+
+    fts_ms = []
+    for query in query_texts[:queries]:
+        started = time.perf_counter()
+        search_resumes(engine, query, page=1, per_page=20)
+        fts_ms.append((time.perf_counter() - started) * 1000)
+
+    like_ms = []
+    with engine.connect() as conn:
+        for query in query_texts[:like_queries]:
+            started = time.perf_counter()
+            _like_search(conn, search_terms(query), True, 20, 0)
+            like_ms.append((time.perf_counter() - started) * 1000)
+
+    # Trigger overhead: inserts keep the index in sync row by row
+    started = time.perf_counter()
+    with engine.begin() as conn:
+        conn.execute(insert(ResumeData.__table__), [resume(i) for i in range(rows, rows + 1000)])
+    insert_ms = (time.perf_counter() - started) * 1000 / 1000
+
+    size_mb = sum(os.path.getsize(os.path.join(workdir, name)) for name in os.listdir(workdir)) / (1024 * 1024)
+    engine.dispose()
+    shutil.rmtree(workdir, ignore_errors=True)
+    click.echo(json.dumps({
+        'rows': rows,
+        'seed_seconds': round(seed_seconds, 2),
+        'index_build_seconds': round(index_seconds, 2),
+        'fts5': {'queries': len(fts_ms), **percentiles(fts_ms)},
+        'like': {'queries': len(like_ms), **percentiles(like_ms)} if like_ms else None,
+        'indexed_insert_ms_per_row': round(insert_ms, 3),
+        'database_mb': round(size_mb, 1)
+    }, indent=2))
+
+def register_commands(app):
+    """
+    Attach the maintenance and benchmark CLI groups to the app (flask bench ..., flask search ..., flask jobs ...)
+    """
+    app.cli.add_command(bench_cli)
+    app.cli.add_command(search_cli)
+    app.cli.add_command(jobs_cli)
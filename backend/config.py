@@ -2,4 +2,155 @@ import os
 
 class Config:
     SQLALCHEMY_DATABASE_URI = os.getenv('DATABASE_URL', 'sqlite:///site.db')
+    # SQLAlchemy 2 only accepts the postgresql:// scheme
+    if SQLALCHEMY_DATABASE_URI.startswith('postgres://'):
+        SQLALCHEMY_DATABASE_URI = 'postgresql://' + SQLALCHEMY_DATABASE_URI[len('postgres://'):]
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+
+    # SQLite engine profile: pragmas applied to every new connection (models/engine.py).
+    # WAL lets readers run alongside the single writer; busy_timeout waits for the lock instead of failing
+    SQLITE_JOURNAL_MODE = os.getenv('SQLITE_JOURNAL_MODE', 'WAL')
+    SQLITE_SYNCHRONOUS = os.getenv('SQLITE_SYNCHRONOUS', 'NORMAL')
+    SQLITE_BUSY_TIMEOUT_MS = int(os.getenv('SQLITE_BUSY_TIMEOUT_MS', 5000))
+    SQLITE_MMAP_SIZE = int(os.getenv('SQLITE_MMAP_SIZE', 256 * 1024 * 1024))
+
+    # Server database (Postgres) engine profile: sized pool, stale connections detected and recycled
+    DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', 10))
+    DB_MAX_OVERFLOW = int(os.getenv('DB_MAX_OVERFLOW', 10))
+    DB_POOL_TIMEOUT = int(os.getenv('DB_POOL_TIMEOUT', 30))
+    DB_POOL_RECYCLE = int(os.getenv('DB_POOL_RECYCLE', 1800))
+    DB_POOL_PRE_PING = os.getenv('DB_POOL_PRE_PING', 'true').lower() == 'true'
+
+    if SQLALCHEMY_DATABASE_URI.startswith('sqlite'):
+        SQLALCHEMY_ENGINE_OPTIONS = {'connect_args': {'timeout': SQLITE_BUSY_TIMEOUT_MS / 1000}}
+    else:
+        SQLALCHEMY_ENGINE_OPTIONS = {
+            'pool_size': DB_POOL_SIZE,
+            'max_overflow': DB_MAX_OVERFLOW,
+            'pool_timeout': DB_POOL_TIMEOUT,
+            'pool_recycle': DB_POOL_RECYCLE,
+            'pool_pre_ping': DB_POOL_PRE_PING,
+        }
+
+    # Uploaded PDFs are processed in memory; keeping the originals on disk is opt-in
+    UPLOAD_PERSIST = os.getenv('UPLOAD_PERSIST', 'False').lower() == 'true'
+    UPLOAD_RETENTION_DAYS = int(os.getenv('UPLOAD_RETENTION_DAYS', 7))
+    UPLOAD_MAX_FILES = int(os.getenv('UPLOAD_MAX_FILES', 500))
+
+    # PDF text extraction cache (keyed by SHA-256 of the PDF bytes)
+    EXTRACTION_CACHE_MEMORY_ITEMS = int(os.getenv('EXTRACTION_CACHE_MEMORY_ITEMS', 128))
+    EXTRACTION_CACHE_PATH = os.getenv('EXTRACTION_CACHE_PATH', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'instance', 'extraction_cache.db'))
+    EXTRACTION_CACHE_MAX_BYTES = int(os.getenv('EXTRACTION_CACHE_MAX_BYTES', 256 * 1024 * 1024))
+
+    # PDF text engine: auto (pdfium, then pdfplumber), pdfium, pdfplumber or ocr
+    PDF_EXTRACTION_ENGINE = os.getenv('PDF_EXTRACTION_ENGINE', 'auto')
+
+    # Preflight limits checked on the raw bytes before any parsing
+    PDF_MAX_UPLOAD_BYTES = int(os.getenv('PDF_MAX_UPLOAD_BYTES', 50 * 1024 * 1024))
+    PDF_MAX_IMAGE_PIXELS = int(os.getenv('PDF_MAX_IMAGE_PIXELS', 150_000_000))
+
+    # Hard budgets per document; extraction stops early and returns partial text when one is hit
+    PDF_MAX_PAGES = int(os.getenv('PDF_MAX_PAGES', 30))
+    PDF_MAX_SECONDS = float(os.getenv('PDF_MAX_SECONDS', 60))
+    PDF_MAX_RENDER_PIXELS = int(os.getenv('PDF_MAX_RENDER_PIXELS', 25_000_000))
+
+    # OCR fallback: pages of one document are rendered and OCRed on up to OCR_WORKERS threads
+    OCR_DPI = int(os.getenv('OCR_DPI', 200))
+    OCR_WORKERS = int(os.getenv('OCR_WORKERS', min(4, os.cpu_count() or 1)))
+    # auto uses warm tesseract instances via tesserocr when installed, else a pytesseract subprocess per page
+    OCR_BACKEND = os.getenv('OCR_BACKEND', 'auto')
+    OCR_LANG = os.getenv('OCR_LANG', 'eng')
+    # Warm tesserocr instances per process; one per OCR thread so pages don't queue for an engine
+    OCR_ENGINE_INSTANCES = int(os.getenv('OCR_ENGINE_INSTANCES', OCR_WORKERS))
+    # Greyscale, binarise, deskew and crop before OCR; pages with less ink than this ratio are skipped as blank
+    OCR_PREPROCESS = os.getenv('OCR_PREPROCESS', 'True').lower() == 'true'
+    OCR_BLANK_INK_RATIO = float(os.getenv('OCR_BLANK_INK_RATIO', 0.002))
+
+    # Extraction process pool (keeps CPU-bound parsing off the gevent hub)
+    EXTRACTION_WORKERS = int(os.getenv('EXTRACTION_WORKERS', 2))
+    EXTRACTION_MAX_QUEUE = int(os.getenv('EXTRACTION_MAX_QUEUE', 16))
+    EXTRACTION_TIMEOUT = float(os.getenv('EXTRACTION_TIMEOUT', 120))
+    EXTRACTION_MAX_JOBS_PER_WORKER = int(os.getenv('EXTRACTION_MAX_JOBS_PER_WORKER', 50))
+
+    # LLM provider: gemini, or stub for offline load tests (canned responses, no network or quota)
+    LLM_PROVIDER = os.getenv('LLM_PROVIDER', 'gemini')
+    # Stub latency distribution in ms: fixed:800, uniform:200,1500, normal:800,200 or lognormal:800,0.5
+    LLM_STUB_LATENCY = os.getenv('LLM_STUB_LATENCY', 'lognormal:800,0.5')
+    LLM_STUB_STREAM_CHUNKS = int(os.getenv('LLM_STUB_STREAM_CHUNKS', 8))
+    # Fraction of stub calls that fail with a simulated rate limit (exercises retries and the breaker)
+    LLM_STUB_ERROR_RATE = float(os.getenv('LLM_STUB_ERROR_RATE', 0.0))
+
+    # Gemini model, created lazily on first use; warm-up and health probes run in the background
+    GEMINI_MODEL = os.getenv('GEMINI_MODEL', 'gemini-2.5-flash')
+    LLM_WARMUP = os.getenv('LLM_WARMUP', 'True').lower() == 'true'
+    # Seconds between background health probes (0 disables periodic probing)
+    LLM_HEALTH_PROBE_INTERVAL = float(os.getenv('LLM_HEALTH_PROBE_INTERVAL', 300))
+
+    # Batch ATS and bulk screening score everything locally (TF-IDF) and send only the top-k to Gemini
+    ATS_LLM_TOP_K = int(os.getenv('ATS_LLM_TOP_K', 10))
+
+    # Bulk screening jobs (/api/screening): many PDFs or a zip ranked against one posting
+    SCREENING_MAX_FILES = int(os.getenv('SCREENING_MAX_FILES', 200))
+    SCREENING_CONCURRENCY = int(os.getenv('SCREENING_CONCURRENCY', 4))
+    SCREENING_MAX_ACTIVE_JOBS = int(os.getenv('SCREENING_MAX_ACTIVE_JOBS', 2))
+    # Total uncompressed PDF bytes per job (uploads plus zip contents)
+    SCREENING_MAX_TOTAL_BYTES = int(os.getenv('SCREENING_MAX_TOTAL_BYTES', 200 * 1024 * 1024))
+    # Threads dedicated to screening jobs, so bulk work never holds the shared I/O pool
+    SCREENING_WORKERS = int(os.getenv('SCREENING_WORKERS', 8))
+    SCREENING_MAX_JOBS = int(os.getenv('SCREENING_MAX_JOBS', 100))
+    SCREENING_JOB_TTL = int(os.getenv('SCREENING_JOB_TTL', 24 * 3600))
+
+    # Server-side resume sessions: follow-up endpoints take resume_id instead of the extracted text
+    RESUME_SESSION_MAX_ITEMS = int(os.getenv('RESUME_SESSION_MAX_ITEMS', 1000))
+    RESUME_SESSION_TTL = int(os.getenv('RESUME_SESSION_TTL', 24 * 3600))
+
+    # Bulk resume writes: rows per upsert transaction and the longest a row waits in the buffer (seconds)
+    RESUME_WRITE_BATCH_SIZE = int(os.getenv('RESUME_WRITE_BATCH_SIZE', 100))
+    RESUME_WRITE_MAX_DELAY = float(os.getenv('RESUME_WRITE_MAX_DELAY', 2.0))
+
+    # Full-text resume search (/api/resumes/search): page size default and cap
+    RESUME_SEARCH_PER_PAGE = int(os.getenv('RESUME_SEARCH_PER_PAGE', 20))
+    RESUME_SEARCH_MAX_PER_PAGE = int(os.getenv('RESUME_SEARCH_MAX_PER_PAGE', 100))
+
+    # Durable job queue (local SQLite) drained by the resume store worker, off the request path
+    JOB_QUEUE_PATH = os.getenv('JOB_QUEUE_PATH', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'instance', 'job_queue.db'))
+    JOB_QUEUE_WORKER = os.getenv('JOB_QUEUE_WORKER', 'true').lower() == 'true'
+    JOB_QUEUE_BATCH_SIZE = int(os.getenv('JOB_QUEUE_BATCH_SIZE', 10))
+    JOB_QUEUE_CONCURRENCY = int(os.getenv('JOB_QUEUE_CONCURRENCY', 4))
+    JOB_QUEUE_POLL_SECONDS = float(os.getenv('JOB_QUEUE_POLL_SECONDS', 5))
+    JOB_QUEUE_LEASE_SECONDS = int(os.getenv('JOB_QUEUE_LEASE_SECONDS', 300))
+    JOB_QUEUE_MAX_ATTEMPTS = int(os.getenv('JOB_QUEUE_MAX_ATTEMPTS', 5))
+    JOB_QUEUE_RETRY_BACKOFF = float(os.getenv('JOB_QUEUE_RETRY_BACKOFF', 30))
+
+    # Native threads for concurrent Gemini calls (analysis, structured extraction, ATS scores)
+    LLM_WORKERS = int(os.getenv('LLM_WORKERS', 16))
+
+    # /api/ats/batch: job descriptions per request and Gemini calls in flight per batch
+    ATS_BATCH_MAX_JOBS = int(os.getenv('ATS_BATCH_MAX_JOBS', 50))
+    ATS_BATCH_CONCURRENCY = int(os.getenv('ATS_BATCH_CONCURRENCY', 4))
+
+    # Call governor: concurrency caps, jittered retries on rate limits/5xx and a circuit breaker
+    LLM_MAX_CONCURRENCY = int(os.getenv('LLM_MAX_CONCURRENCY', 8))
+    LLM_DEFAULT_ENDPOINT_CONCURRENCY = int(os.getenv('LLM_DEFAULT_ENDPOINT_CONCURRENCY', 4))
+    # Per-endpoint overrides, e.g. "pdf_analysis=6,resume_store=2"
+    LLM_ENDPOINT_CONCURRENCY = {
+        name.strip(): int(limit)
+        for name, limit in (item.split('=', 1) for item in os.getenv('LLM_ENDPOINT_CONCURRENCY', '').split(',') if '=' in item)
+    }
+    LLM_QUEUE_TIMEOUT = float(os.getenv('LLM_QUEUE_TIMEOUT', 30))
+    LLM_RETRY_ATTEMPTS = int(os.getenv('LLM_RETRY_ATTEMPTS', 3))
+    LLM_RETRY_MAX_WAIT = float(os.getenv('LLM_RETRY_MAX_WAIT', 8))
+    LLM_BREAKER_FAILURES = int(os.getenv('LLM_BREAKER_FAILURES', 5))
+    LLM_BREAKER_RESET_SECONDS = float(os.getenv('LLM_BREAKER_RESET_SECONDS', 30))
+
+    # Gemini response cache keyed by model, generation config and prompt hash
+    LLM_CACHE_ENABLED = os.getenv('LLM_CACHE_ENABLED', 'True').lower() == 'true'
+    LLM_CACHE_TTL = int(os.getenv('LLM_CACHE_TTL', 3600))
+    LLM_CACHE_MEMORY_ITEMS = int(os.getenv('LLM_CACHE_MEMORY_ITEMS', 256))
+    # Set a path (e.g. instance/llm_cache.db) to share cached responses between worker processes
+    LLM_CACHE_PATH = os.getenv('LLM_CACHE_PATH', '')
+    LLM_CACHE_MAX_BYTES = int(os.getenv('LLM_CACHE_MAX_BYTES', 64 * 1024 * 1024))
+    LLM_CACHE_DISABLED_ENDPOINTS = [e.strip() for e in os.getenv('LLM_CACHE_DISABLED_ENDPOINTS', 'hello').split(',') if e.strip()]
+
+    # Join concurrent identical prompts onto one in-flight Gemini call
+    LLM_SINGLE_FLIGHT = os.getenv('LLM_SINGLE_FLIGHT', 'True').lower() == 'true'
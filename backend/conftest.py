@@ -0,0 +1,20 @@
+import pytest
+
+
+@pytest.fixture
+def app():
+    """
+    Minimal Flask app on an in-memory SQLite database, inside an app context
+    """
+    flask = pytest.importorskip('flask')
+    pytest.importorskip('flask_sqlalchemy')
+    from models import db
+
+    app = flask.Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite://'
+    db.init_app(app)
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
@@ -4,5 +4,8 @@ db = SQLAlchemy()
 
 # Import models so Flask-Migrate detects them
 from .resume_data import ResumeData
+from .engine import apply_engine_profile, engine_self_check, database_stats
+from .resume_search import ensure_search_index, rebuild_search_index, search_resumes, include_object
 
-__all__ = ['db', 'ResumeData']
+__all__ = ['db', 'ResumeData', 'apply_engine_profile', 'engine_self_check', 'database_stats',
+           'ensure_search_index', 'rebuild_search_index', 'search_resumes', 'include_object']
@@ -0,0 +1,104 @@
+import logging
+import threading
+from sqlalchemy import event, text
+from config import Config
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# PRAGMA synchronous reads back as a number
+SYNCHRONOUS_LEVELS = {0: 'OFF', 1: 'NORMAL', 2: 'FULL', 3: 'EXTRA'}
+
+_last_report = None
+_report_lock = threading.Lock()
+
+def sqlite_pragmas():
+    """
+    The pragmas every SQLite connection gets, in the order they are applied
+    """
+    return {
+        'journal_mode': Config.SQLITE_JOURNAL_MODE,
+        'synchronous': Config.SQLITE_SYNCHRONOUS,
+        'busy_timeout': Config.SQLITE_BUSY_TIMEOUT_MS,
+        'mmap_size': Config.SQLITE_MMAP_SIZE,
+    }
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    try:
+        for name, value in sqlite_pragmas().items():
+            cursor.execute(f"PRAGMA {name}={value}")
+    finally:
+        cursor.close()
+
+def apply_engine_profile(engine):
+    """
+    Hook the SQLite pragmas into the engine's connect event; server databases get
+    their pool settings from SQLALCHEMY_ENGINE_OPTIONS. Call before the first connection.
+    """
+    if engine.dialect.name == 'sqlite' and not event.contains(engine, 'connect', _set_sqlite_pragmas):
+        event.listen(engine, 'connect', _set_sqlite_pragmas)
+
+def _pool_settings(engine):
+    pool = engine.pool
+    settings = {'class': type(pool).__name__}
+    if hasattr(pool, 'size'):
+        settings['size'] = pool.size()
+    settings['max_overflow'] = getattr(pool, '_max_overflow', None)
+    settings['timeout'] = getattr(pool, '_timeout', None)
+    settings['recycle'] = getattr(pool, '_recycle', None)
+    settings['pre_ping'] = getattr(pool, '_pre_ping', None)
+    return settings
+
+def engine_self_check(engine):
+    """
+    Connect once and report the settings actually in effect: SQLite pragmas as
+    read back from the connection (with any that didn't take), pool settings
+    for everything else. Logged at startup and kept for /api/metrics.
+    """
+    global _last_report
+    report = {
+        'dialect': engine.dialect.name,
+        'driver': engine.driver,
+        'url': engine.url.render_as_string(hide_password=True),
+        'pool': _pool_settings(engine),
+        'ok': True,
+    }
+    try:
+        with engine.connect() as conn:
+            if engine.dialect.name == 'sqlite':
+                active = {}
+                for name in sqlite_pragmas():
+                    active[name] = conn.execute(text(f"PRAGMA {name}")).scalar()
+                active['synchronous'] = SYNCHRONOUS_LEVELS.get(active['synchronous'], active['synchronous'])
+                report['pragmas'] = active
+                report['mismatches'] = [
+                    name for name, wanted in sqlite_pragmas().items()
+                    if str(active[name]).lower() != str(wanted).lower()
+                ]
+            else:
+                conn.execute(text('SELECT 1'))
+    except Exception as e:
+        report['ok'] = False
+        report['error'] = str(e)
+
+    if not report['ok']:
+        logger.error(f"Database self-check failed for {report['url']}: {report['error']}")
+    elif report.get('mismatches'):
+        # e.g. WAL is unavailable on some network filesystems, and mmap_size is capped at compile time
+        logger.warning(f"Database self-check: pragmas not applied as configured: {report['mismatches']} ({report['pragmas']})")
+    else:
+        logger.info(f"Database self-check: {report['dialect']} ({report['driver']}) pool {report['pool']} pragmas {report.get('pragmas', {})}")
+
+    with _report_lock:
+        _last_report = report
+    return report
+
+def database_stats(engine):
+    """
+    Startup self-check plus the live pool status
+    """
+    with _report_lock:
+        stats = dict(_last_report) if _last_report else {'dialect': engine.dialect.name}
+    stats['pool_status'] = engine.pool.status()
+    return stats
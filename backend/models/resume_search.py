@@ -0,0 +1,175 @@
+import re
+import time
+import logging
+from sqlalchemy import text, select, func, or_, and_
+from .resume_data import ResumeData
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# FTS5 index over the searchable ResumeData columns (external content: the text lives in resume_data only)
+SEARCH_TABLE = 'resume_fts'
+SEARCH_COLUMNS = ('skills', 'experience', 'projects', 'certifications')
+# bm25 column weights, in SEARCH_COLUMNS order: a skill match counts most
+SEARCH_WEIGHTS = (3.0, 1.0, 1.0, 1.5)
+# Columns a search result exposes; the endpoint is unauthenticated, so no name or email
+RESULT_COLUMNS = ('id', 'skills', 'created_at')
+# Terms keep + and # so c++ and c# are searchable
+TERM_PATTERN = re.compile(r"[\w+#]+", re.UNICODE)
+
+_COLUMNS = ', '.join(SEARCH_COLUMNS)
+_NEW_VALUES = ', '.join(f'new.{column}' for column in SEARCH_COLUMNS)
+_OLD_VALUES = ', '.join(f'old.{column}' for column in SEARCH_COLUMNS)
+_RESULT_SELECT = ', '.join(f'r.{column}' for column in RESULT_COLUMNS)
+
+# Triggers keep the index in sync with every write, including the bulk INSERT ... ON CONFLICT upserts
+SCHEMA = [
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} USING fts5(
+        {_COLUMNS}, content='resume_data', content_rowid='id', tokenize="unicode61 tokenchars '+#'"
+    )""",
+    f"""CREATE TRIGGER IF NOT EXISTS {SEARCH_TABLE}_ai AFTER INSERT ON resume_data BEGIN
+        INSERT INTO {SEARCH_TABLE} (rowid, {_COLUMNS}) VALUES (new.id, {_NEW_VALUES});
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {SEARCH_TABLE}_ad AFTER DELETE ON resume_data BEGIN
+        INSERT INTO {SEARCH_TABLE} ({SEARCH_TABLE}, rowid, {_COLUMNS}) VALUES ('delete', old.id, {_OLD_VALUES});
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {SEARCH_TABLE}_au AFTER UPDATE ON resume_data BEGIN
+        INSERT INTO {SEARCH_TABLE} ({SEARCH_TABLE}, rowid, {_COLUMNS}) VALUES ('delete', old.id, {_OLD_VALUES});
+        INSERT INTO {SEARCH_TABLE} (rowid, {_COLUMNS}) VALUES (new.id, {_NEW_VALUES});
+    END""",
+]
+
+# Engines (by URL) whose FTS5 index exists; others fall back to a LIKE scan
+_indexed = set()
+
+def search_index_available(engine):
+    return str(engine.url) in _indexed
+
+def ensure_search_index(engine):
+    """
+    Create the FTS5 table and sync triggers if missing (SQLite only); a new index
+    is filled from the existing rows. Returns False when FTS5 can't be used.
+    """
+    if engine.dialect.name != 'sqlite':
+        return False
+    try:
+        with engine.begin() as conn:
+            existed = conn.execute(
+                text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"), {'name': SEARCH_TABLE}
+            ).first() is not None
+            for statement in SCHEMA:
+                conn.execute(text(statement))
+            if not existed:
+                conn.execute(text(f"INSERT INTO {SEARCH_TABLE} ({SEARCH_TABLE}) VALUES ('rebuild')"))
+        _indexed.add(str(engine.url))
+        logger.info(f"Resume search index ready ({'existing' if existed else 'built'})")
+        return True
+    except Exception as e:
+        # Builds without FTS5 still work, just with the slower LIKE scan
+        logger.warning(f"Resume search index unavailable, falling back to LIKE: {e}")
+        return False
+
+def rebuild_search_index(engine):
+    """
+    Recreate the index contents from resume_data; returns (rows indexed, seconds)
+    """
+    if not ensure_search_index(engine):
+        raise RuntimeError('FTS5 search index is not available for this database')
+    started = time.perf_counter()
+    with engine.begin() as conn:
+        conn.execute(text(f"INSERT INTO {SEARCH_TABLE} ({SEARCH_TABLE}) VALUES ('rebuild')"))
+        conn.execute(text(f"INSERT INTO {SEARCH_TABLE} ({SEARCH_TABLE}) VALUES ('optimize')"))
+        rows = conn.execute(text('SELECT COUNT(*) FROM resume_data')).scalar()
+    return rows, round(time.perf_counter() - started, 3)
+
+def include_object(object, name, type_, reflected, compare_to):
+    """
+    Alembic autogenerate filter: the FTS5 table and its shadow tables aren't in the
+    models' metadata and must not be picked up as tables to drop
+    """
+    return not (type_ == 'table' and reflected and compare_to is None and name.startswith(SEARCH_TABLE))
+
+def search_terms(query):
+    """
+    Free text -> distinct lower-cased terms (FTS5 syntax is never passed through)
+    """
+    terms = []
+    for term in TERM_PATTERN.findall((query or '').lower()):
+        if term not in terms:
+            terms.append(term)
+    return terms
+
+def fts_query(terms, match_all=True, prefix=False):
+    """
+    Quoted terms joined with AND/OR; prefix matches the last term as a prefix (search-as-you-type)
+    """
+    quoted = [f'"{term}"' for term in terms]
+    if prefix and quoted:
+        quoted[-1] += '*'
+    return (' AND ' if match_all else ' OR ').join(quoted)
+
+def _fts_search(conn, terms, match_all, prefix, limit, offset):
+    match = fts_query(terms, match_all, prefix)
+    weights = ', '.join(str(weight) for weight in SEARCH_WEIGHTS)
+    total = conn.execute(
+        text(f"SELECT COUNT(*) FROM {SEARCH_TABLE} WHERE {SEARCH_TABLE} MATCH :match"), {'match': match}
+    ).scalar()
+    rows = conn.execute(text(f"""
+        SELECT {_RESULT_SELECT},
+               bm25({SEARCH_TABLE}, {weights}) AS bm25_rank,
+               snippet({SEARCH_TABLE}, -1, '[', ']', '...', 12) AS snippet
+        FROM {SEARCH_TABLE} JOIN resume_data r ON r.id = {SEARCH_TABLE}.rowid
+        WHERE {SEARCH_TABLE} MATCH :match
+        ORDER BY bm25_rank LIMIT :limit OFFSET :offset
+    """), {'match': match, 'limit': limit, 'offset': offset}).mappings().all()
+    results = []
+    for row in rows:
+        result = dict(row)
+        # bm25 is lower-is-better; report a positive relevance score
+        result['score'] = round(-result.pop('bm25_rank'), 4)
+        results.append(result)
+    return total, results
+
+def _like_search(conn, terms, match_all, limit, offset):
+    table = ResumeData.__table__
+    term_clauses = [
+        or_(*[table.c[column].ilike(f"%{term.replace('_', '!_')}%", escape='!') for column in SEARCH_COLUMNS])
+        for term in terms
+    ]
+    where = and_(*term_clauses) if match_all else or_(*term_clauses)
+    total = conn.execute(select(func.count()).select_from(table).where(where)).scalar()
+    rows = conn.execute(
+        select(*[table.c[column] for column in RESULT_COLUMNS])
+        .where(where).order_by(table.c.id.desc()).limit(limit).offset(offset)
+    ).mappings().all()
+    return total, [dict(row, score=None, snippet=None) for row in rows]
+
+def search_resumes(engine, query, page=1, per_page=20, match_all=True, prefix=False):
+    """
+    Ranked, paginated matches for query over skills, experience, projects and
+    certifications. Uses the FTS5 index (bm25, skills weighted highest) when
+    available, otherwise an unranked LIKE scan, newest first.
+    Results carry only RESULT_COLUMNS plus score and snippet, never contact details.
+    """
+    terms = search_terms(query)
+    page, per_page = max(1, int(page)), max(1, int(per_page))
+    result = {'query': query, 'terms': terms, 'page': page, 'per_page': per_page, 'total': 0, 'results': []}
+    if not terms:
+        return result
+
+    started = time.perf_counter()
+    offset = (page - 1) * per_page
+    with engine.connect() as conn:
+        if search_index_available(engine):
+            result['engine'] = 'fts5'
+            result['total'], rows = _fts_search(conn, terms, match_all, prefix, per_page, offset)
+        else:
+            result['engine'] = 'like'
+            result['total'], rows = _like_search(conn, terms, match_all, per_page, offset)
+    for row in rows:
+        if row.get('created_at') is not None and not isinstance(row['created_at'], str):
+            row['created_at'] = row['created_at'].isoformat()
+    result['results'] = rows
+    result['pages'] = (result['total'] + per_page - 1) // per_page
+    result['took_ms'] = round((time.perf_counter() - started) * 1000, 2)
+    return result
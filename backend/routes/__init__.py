@@ -16,7 +16,13 @@ except ImportError as e:
     logger.error(f"Failed to import pdf_bp: {e}")
     raise
 
+try:
+    from .screening_routes import screening_bp
+except ImportError as e:
+    logger.error(f"Failed to import screening_bp: {e}")
+    raise
+
 # Export blueprints for easy import
-__all__ = ['api_bp', 'pdf_bp']
+__all__ = ['api_bp', 'pdf_bp', 'screening_bp']
 
 
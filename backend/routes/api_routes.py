@@ -1,9 +1,15 @@
 import datetime
 import logging
 from flask import Blueprint, request, jsonify
+from config import Config
 
 try:
-    from Controllers import load_gemini_model, prompt
+    from Controllers import LLMUnavailable, get_model, model_status, governor_stats, prompt, extraction_cache_stats, extraction_engine_stats, extraction_pool_stats, llm_cache_stats
+    from Controllers.resume_session import resume_session_stats
+    from Controllers.screening import screening_stats
+    from Controllers.resume_store_queue import resume_store_queue_stats
+    from Controllers.concurrency import submit_io, wait_for
+    from models import db, database_stats, search_resumes
 except ImportError as e:
     logging.error(f"Import error in api_routes: {e}")
     raise
@@ -14,15 +20,6 @@ api_bp = Blueprint('api', __name__)
 # Configure logging
 logger = logging.getLogger(__name__)
 
-# Load model once when the blueprint is imported
-try:
-    model = load_gemini_model()
-    if not model:
-        logger.warning("Gemini model not initialized in api_routes")
-except Exception as e:
-    logger.error(f"Error loading Gemini model in api_routes: {e}")
-    model = None
-
 def log_error(error_type, error_message, context=""):
     """Utility function for consistent error logging"""
     timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
@@ -35,11 +32,14 @@ def log_error(error_type, error_message, context=""):
 def api_health_check():
     """API health check endpoint"""
     try:
+        model = get_model()
         status = {
             'success': True,
             'service': 'General API Service',
             'status': 'healthy' if model else 'degraded',
             'model_available': model is not None,
+            'model': model_status(),
+            'llm_governor': governor_stats(),
             'timestamp': datetime.datetime.now().isoformat(),
             'version': '1.0.0'
         }
@@ -47,6 +47,12 @@ def api_health_check():
         if not model:
             status['success'] = False
             status['warnings'] = ['AI model not available']
+        elif status['llm_governor']['breaker']['state'] != 'closed':
+            status['status'] = 'degraded'
+            status['warnings'] = [f"AI circuit breaker is {status['llm_governor']['breaker']['state']}"]
+        elif status['model']['probe']['status'] == 'unhealthy':
+            status['status'] = 'degraded'
+            status['warnings'] = [f"AI model probe failed: {status['model']['probe']['error']}"]
             
         return jsonify(status), 200 if model else 503
         
@@ -60,10 +66,72 @@ def api_health_check():
             'timestamp': datetime.datetime.now().isoformat()
         }), 500
 
+@api_bp.route('/metrics', methods=['GET'])
+def api_metrics():
+    """Cache and pipeline counters used for capacity sizing"""
+    try:
+        return jsonify({
+            'success': True,
+            'extraction_cache': extraction_cache_stats(),
+            'extraction_engines': extraction_engine_stats(),
+            'extraction_pool': extraction_pool_stats(),
+            'llm_cache': llm_cache_stats(),
+            'llm_governor': governor_stats(),
+            'resume_sessions': resume_session_stats(),
+            'screening': screening_stats(),
+            'resume_store_queue': resume_store_queue_stats(),
+            'database': database_stats(db.engine),
+            'timestamp': datetime.datetime.now().isoformat()
+        }), 200
+
+    except Exception as e:
+        log_error("APIMetrics", str(e))
+        return jsonify({
+            'success': False,
+            'error': 'Metrics collection failed',
+            'timestamp': datetime.datetime.now().isoformat()
+        }), 500
+
+@api_bp.route('/resumes/search', methods=['GET'])
+def search_stored_resumes():
+    """
+    Full-text search over stored resumes (skills, experience, projects, certifications).
+    ?q=terms&page=1&per_page=20; match=any returns resumes with any term instead of all,
+    prefix=true treats the last term as a prefix. Results are ranked by relevance and
+    identify resumes by id only (no name or email), since the endpoint is unauthenticated.
+    """
+    try:
+        query = (request.args.get('q') or '').strip()
+        if not query:
+            return jsonify({
+                'success': False,
+                'error': 'No search query provided',
+                'message': 'Please provide search terms as q'
+            }), 400
+
+        page = max(1, request.args.get('page', 1, type=int))
+        per_page = request.args.get('per_page', Config.RESUME_SEARCH_PER_PAGE, type=int)
+        per_page = min(max(1, per_page), Config.RESUME_SEARCH_MAX_PER_PAGE)
+        match_all = request.args.get('match', 'all').lower() != 'any'
+        prefix = request.args.get('prefix', 'false').lower() == 'true'
+
+        # The query runs on the I/O pool so it doesn't block other requests on the hub
+        result = wait_for(submit_io(search_resumes, db.engine, query, page, per_page, match_all, prefix))
+        return jsonify({'success': True, **result}), 200
+
+    except Exception as e:
+        log_error("ResumeSearch", str(e), "search_stored_resumes function")
+        return jsonify({
+            'success': False,
+            'error': 'Search failed',
+            'message': 'Unable to search resumes'
+        }), 500
+
 @api_bp.route('/hello', methods=['GET'])
 def hello_world():
     """Simple hello endpoint with AI integration"""
     try:
+        model = get_model()
         if not model:
             return jsonify({
                 'success': False,
@@ -74,7 +142,7 @@ def hello_world():
         if request.method == "GET":
             try:
                 # Generate AI response with error handling
-                response = prompt(model, "who is prime minister of india?", "Gujarat cm name")
+                response = prompt(model, "who is prime minister of india?", "Gujarat cm name", endpoint="hello")
                 
                 if not response:
                     log_error("EmptyAIResponse", "No response from AI model", "hello endpoint")
@@ -90,6 +158,13 @@ def hello_world():
                     'timestamp': datetime.datetime.now().isoformat()
                 }), 200
                 
+            except LLMUnavailable as e:
+                log_error("AIUnavailable", str(e), "hello endpoint")
+                return jsonify({
+                    'success': False,
+                    'error': 'AI service temporarily unavailable',
+                    'message': 'Service temporarily unavailable'
+                }), 503, {'Retry-After': str(e.retry_after or 5)}
             except Exception as e:
                 log_error("AIPromptError", str(e), "hello endpoint")
                 return jsonify({
@@ -1,11 +1,16 @@
-import os
 import datetime
 from flask import Blueprint, request, jsonify, current_app
 from werkzeug.utils import secure_filename
 
 try:
-    from validation import allowed_file
-    from Controllers import pdf_to_text, load_gemini_model, prompt, resume_store_data, generate_cover_letter, generate_ats_score
+    from validation import allowed_file, preflight_pdf
+    from Controllers import run_extraction, ExtractionQueueFull, ExtractionTimeout, LLMUnavailable, get_model, model_status, governor_stats, prompt, prompt_stream, resume_store_data, enqueue_resume_store, generate_cover_letter, generate_cover_letter_stream, generate_ats_score, generate_ats_scores
+    from Controllers.upload_store import persist_upload, prune_uploads
+    from Controllers.resume_session import create_resume_session, get_resume_session
+    from Controllers.ats import AI_UNAVAILABLE_ERROR
+    from Controllers.ats_prescore import prescore_ats, keyword_report, score_agreement
+    from Controllers.concurrency import submit_io, run_in_background, wait_for
+    from routes.sse import wants_stream, sse_response
     
 except ImportError as e:
     print(f"Import error: {e}")
@@ -14,14 +19,8 @@ except ImportError as e:
 # Create blueprint for PDF analysis routes
 pdf_bp = Blueprint('pdf', __name__)
 
-# Load model once when the blueprint is imported
-try:
-    model = load_gemini_model()
-    if not model:
-        print("Warning: Gemini model not initialized")
-except Exception as e:
-    print(f"Error loading Gemini model: {e}")
-    model = None
+# What the analysis prompt tells the model to answer when the text isn't a resume
+NO_RESUME_RESPONSE = "No resume provided for analysis. Please upload a valid PDF resume."
 
 def log_error(error_type, error_message, context=""):
     """
@@ -33,16 +32,113 @@ def log_error(error_type, error_message, context=""):
         log_message += f" | Context: {context}"
     print(log_message)
 
+def ai_unavailable_response(error, context=""):
+    """
+    503 with Retry-After when the call governor refuses a Gemini call or retries run out
+    """
+    log_error("AIUnavailable", str(error), context)
+    return jsonify({
+        'success': False,
+        'error': 'AI service temporarily unavailable',
+        'output': 'The AI service is busy, please try again shortly'
+    }), 503, {'Retry-After': str(error.retry_after or 5)}
+
+def resolve_resume_text():
+    """
+    Resume text for the follow-up endpoints: the session created by /api/pdf-analysis
+    (resume_id in the form, query string or JSON body), else resume_text.
+    Returns (resume_text, session_expired); session_expired is True when a resume_id
+    was sent, is no longer stored, and no resume_text was sent as a fallback.
+    """
+    payload = request.get_json(silent=True) if request.is_json else None
+    payload = payload if isinstance(payload, dict) else {}
+    resume_id = request.form.get('resume_id') or request.args.get('resume_id') or payload.get('resume_id')
+    if resume_id:
+        session = get_resume_session(resume_id)
+        if session is not None:
+            return session['text'], False
+    resume_text = request.form.get('resume_text') or payload.get('resume_text')
+    return resume_text, bool(resume_id) and not resume_text
+
+def resume_session_expired_response():
+    return jsonify({
+        'success': False,
+        'error': 'Resume session expired',
+        'output': 'Please upload your resume again'
+    }), 404
+
+def build_analysis_prompt(extracted_text, job_description):
+    """
+    Resume analysis prompt shared by the blocking and streaming responses
+    """
+    return f"""
+You are an advanced career coach and AI resume expert. Please analyze the resume content provided below and deliver structured, in-depth feedback based on the following dimensions. Your goal is to help improve this resume's effectiveness, clarity, and alignment with industry standards and job expectations.
+
+---
+
+✅ Evaluation Criteria:
+
+1. Structure & Readability
+– Is the resume well-organized with logical flow? Are section headings clear and consistent?
+
+2. Professional Summary
+– Does it effectively communicate the candidate's career goals, value proposition, and core strengths in 2–4 sentences?
+
+3. Skills Relevance
+– Are the skills listed relevant to the candidate's industry or target role? Are there any missing in-demand skills?
+
+4. Work Experience Impact
+– Are achievements action-oriented and quantified where possible? Do they demonstrate progression, leadership, or business value?
+
+5. ATS Optimization
+– Does the resume use keywords likely to pass through an Applicant Tracking System (ATS)? Highlight any key terms that should be added.
+
+6. Grammar, Style & Tone
+– Point out any grammar, spelling, or tone inconsistencies. Suggest ways to enhance professionalism.
+
+7. Visual Formatting
+– Is the layout clean, scannable, and aligned with modern resume standards? Are fonts, bullet points, and white space appropriately used?
+
+8. Tailoring to Job Description (Optional)
+– If a job description is provided below, assess how well the resume aligns with it. Suggest key customizations.
+
+---
+
+📄 Resume Text:
+{extracted_text}
+
+📌 (Optional) Target Job Description:
+{job_description}
+
+---
+
+🔚 Output Format:
+
+- Strengths Summary
+- Section-by-Section Analysis
+- Improvement Recommendations
+- Rewritten Bullet Examples (if applicable)
+- Final Verdict: Ready / Needs Work / Major Revision
+
+Please respond with your full analysis and without any additional text or explanations.
+
+NOTE: 1.If user not provided resume pdf then just response with this "No resume provided for analysis. Please upload a valid PDF resume."
+2.Use markdown to format your text: # Heading 1, ## Heading 2, ### Heading 3, blank lines for paragraphs, * for bullet lists, 1. 2. for numbered lists, **bold** for bold, *italic* for italics.
+"""
+
 @pdf_bp.route('/health', methods=['GET'])
 def health_check():
     """
     Health check endpoint to verify service status
     """
     try:
+        model = get_model()
         status = {
             'success': True,
             'status': 'healthy',
             'model_available': model is not None,
+            'model': model_status(),
+            'llm_governor': governor_stats(),
             'timestamp': datetime.datetime.now().isoformat()
         }
         
@@ -50,6 +146,10 @@ def health_check():
             status['success'] = False
             status['status'] = 'degraded'
             status['warning'] = 'AI model not available'
+        elif status['llm_governor']['breaker']['state'] != 'closed':
+            # Gemini calls are failing fast until the breaker lets a trial call through
+            status['status'] = 'degraded'
+            status['warning'] = f"AI circuit breaker is {status['llm_governor']['breaker']['state']}"
             
         return jsonify(status), 200 if model else 503
         
@@ -66,6 +166,7 @@ def health_check():
 def upload_pdf():
     try:
         # Check if model is available
+        model = get_model()
         if not model:
             return jsonify({
                 'success': False,
@@ -95,14 +196,35 @@ def upload_pdf():
                 filename = secure_filename(file.filename)
                 filename = f"{datetime.datetime.now().strftime('%Y%m%d%H%M%S')}_{filename}"
                 
-                # Get upload folder from app config
-                upload_folder = current_app.config['UPLOAD_FOLDER']
-                file_path = os.path.join(upload_folder, filename)
-                file.save(file_path)
+                # Keep the upload in memory (werkzeug spools large bodies to a temp file)
+                pdf_bytes = file.read()
+
+                # Reject junk, encrypted or corrupt files before any parsing
+                preflight = preflight_pdf(pdf_bytes)
+                if not preflight['valid']:
+                    return jsonify({
+                        'success': False,
+                        'error': 'Invalid PDF file',
+                        'output': preflight['error']
+                    }), 400
+
+                # Persisting the original is opt-in and subject to the retention policy
+                if current_app.config['UPLOAD_PERSIST']:
+                    try:
+                        upload_folder = current_app.config['UPLOAD_FOLDER']
+                        persist_upload(pdf_bytes, filename, upload_folder)
+                        prune_uploads(
+                            upload_folder,
+                            max_age_days=current_app.config['UPLOAD_RETENTION_DAYS'],
+                            max_files=current_app.config['UPLOAD_MAX_FILES']
+                        )
+                    except Exception as e:
+                        log_error("UploadPersist", str(e), f"File: {filename}")
 
                 # Process the PDF file
                 try:
-                    extracted_text = pdf_to_text(file_path)
+                    extraction = run_extraction(pdf_bytes, hints=preflight)
+                    extracted_text = extraction['text']
                     
                     if not extracted_text:
                         return jsonify({
@@ -110,6 +232,20 @@ def upload_pdf():
                             'error': 'Text extraction failed',
                             'output': 'Failed to extract text from PDF'
                         }), 400
+                except ExtractionQueueFull as e:
+                    log_error("PDFExtractionBusy", str(e), f"File: {filename}")
+                    return jsonify({
+                        'success': False,
+                        'error': 'Server busy',
+                        'output': 'Too many documents are being processed, please try again shortly'
+                    }), 503, {'Retry-After': '5'}
+                except ExtractionTimeout as e:
+                    log_error("PDFExtractionTimeout", str(e), f"File: {filename}")
+                    return jsonify({
+                        'success': False,
+                        'error': 'PDF processing timed out',
+                        'output': 'The PDF took too long to process'
+                    }), 504
                 except Exception as e:
                     log_error("PDFExtraction", str(e), f"File: {filename}")
                     return jsonify({
@@ -120,66 +256,70 @@ def upload_pdf():
                 
                 try:
                     job_description = request.form.get('job_description', 'Software Engineer')
+                    include_text = (request.form.get('include_text') or request.args.get('include_text', 'false')).lower() == 'true'
                     
-                    prompt_text = f"""
-You are an advanced career coach and AI resume expert. Please analyze the resume content provided below and deliver structured, in-depth feedback based on the following dimensions. Your goal is to help improve this resume's effectiveness, clarity, and alignment with industry standards and job expectations.
-
----
-
-✅ Evaluation Criteria:
-
-1. Structure & Readability
-– Is the resume well-organized with logical flow? Are section headings clear and consistent?
-
-2. Professional Summary
-– Does it effectively communicate the candidate's career goals, value proposition, and core strengths in 2–4 sentences?
-
-3. Skills Relevance
-– Are the skills listed relevant to the candidate's industry or target role? Are there any missing in-demand skills?
-
-4. Work Experience Impact
-– Are achievements action-oriented and quantified where possible? Do they demonstrate progression, leadership, or business value?
-
-5. ATS Optimization
-– Does the resume use keywords likely to pass through an Applicant Tracking System (ATS)? Highlight any key terms that should be added.
-
-6. Grammar, Style & Tone
-– Point out any grammar, spelling, or tone inconsistencies. Suggest ways to enhance professionalism.
-
-7. Visual Formatting
-– Is the layout clean, scannable, and aligned with modern resume standards? Are fonts, bullet points, and white space appropriately used?
-
-8. Tailoring to Job Description (Optional)
-– If a job description is provided below, assess how well the resume aligns with it. Suggest key customizations.
-
----
-
-📄 Resume Text:
-{extracted_text}
-
-📌 (Optional) Target Job Description:
-{job_description}
-
----
-
-🔚 Output Format:
-
-- Strengths Summary
-- Section-by-Section Analysis
-- Improvement Recommendations
-- Rewritten Bullet Examples (if applicable)
-- Final Verdict: Ready / Needs Work / Major Revision
-
-Please respond with your full analysis and without any additional text or explanations.
-
-NOTE: 1.If user not provided resume pdf then just response with this "No resume provided for analysis. Please upload a valid PDF resume."
-2.Use markdown to format your text: # Heading 1, ## Heading 2, ### Heading 3, blank lines for paragraphs, * for bullet lists, 1. 2. for numbered lists, **bold** for bold, *italic* for italics.
-"""
-
-
-                    response = prompt(model, prompt_text)
+                    prompt_text = build_analysis_prompt(extracted_text, job_description)
+                    # Follow-up requests (cover letter, ATS) can send resume_id instead of the text
+                    resume_session = create_resume_session(extracted_text, {'filename': filename})
+                    metadata = {
+                        'text_length': len(extracted_text),
+                        'page_count': extraction['page_count'],
+                        'pages_processed': extraction.get('pages_processed', extraction['page_count']),
+                        'ocr_pages': extraction['ocr_pages'],
+                        'blank_pages': extraction.get('blank_pages', 0),
+                        'extraction_seconds': extraction['seconds'],
+                        'truncated': extraction.get('truncated', False),
+                        'truncation_reason': extraction.get('truncation_reason'),
+                        'pages': extraction['pages'],
+                        'job_description': job_description,
+                        'processed_at': datetime.datetime.now().isoformat()
+                    }
+
+                    app = current_app._get_current_object()
+
+                    def store_resume():
+                        # Structured extraction + DB write go through the durable queue (drained in
+                        # batches by the resume store worker), only once the analysis has succeeded
+                        try:
+                            wait_for(submit_io(enqueue_resume_store, extracted_text, {'filename': filename}))
+                        except Exception as e:
+                            log_error("ResumeStoreQueue", str(e), f"File: {filename}")
+                            run_in_background(app, resume_store_data, model, extracted_text,
+                                              description=f"resume_store_data ({filename})")
+
+                    # The optional ATS pre-score is the local TF-IDF score: instant, so it never holds
+                    # the response back. The LLM score is a follow-up /api/ats call with resume_id.
+                    local_score = None
+                    if request.form.get('ats_prescore', 'false').lower() == 'true':
+                        local_score = prescore_ats(extracted_text, job_description)
+
+                    # Streaming mode: metadata first, then the analysis as it is generated
+                    if wants_stream():
+                        streamed = []
+
+                        def analysis_chunks():
+                            for text in prompt_stream(model, prompt_text, endpoint="pdf_analysis"):
+                                streamed.append(text)
+                                yield text
+
+                        def finish_stream():
+                            analysis = ''.join(streamed).strip()
+                            if analysis and analysis != NO_RESUME_RESPONSE:
+                                store_resume()
+                            return {}
+
+                        return sse_response(
+                            analysis_chunks(),
+                            'pdf_analysis',
+                            before={'resume_id': resume_session['id'], 'filename': filename, 'metadata': metadata,
+                                    'local_score': local_score,
+                                    **({'resume_text': extracted_text} if include_text else {})},
+                            after=finish_stream
+                        )
+
+                    response = wait_for(submit_io(prompt, model, prompt_text, endpoint="pdf_analysis"))
                     
-                    if response == "No resume provided for analysis. Please upload a valid PDF resume.":
+                    if response == NO_RESUME_RESPONSE:
                         return jsonify({
                             'success': False,
                             'error': 'No resume provided',
@@ -192,29 +332,25 @@ NOTE: 1.If user not provided resume pdf then just response with this "No resume
                             'error': 'Analysis generation failed',
                             'output': 'Failed to generate analysis'
                         }), 500
-                    
-                    # Store resume data in the database
-                    try:
-                        resume_data_response = resume_store_data(model, extracted_text)
-                        print(f"Resume data stored successfully")
-                    except Exception as e:
-                        log_error("ResumeStorage", str(e), f"File: {filename}")
-                        # Continue with analysis even if storage fails
 
-                    # Return successful response
-                    return jsonify({
+                    store_resume()
+
+                    # Return successful response; follow-up requests send resume_id,
+                    # the extracted text is only echoed back when asked for (include_text=true)
+                    payload = {
                         'success': True,
                         'output': response,
-                        #temorary
-                        'resume_text': extracted_text,
+                        'resume_id': resume_session['id'],
                         'filename': filename,
-                        'metadata': {
-                            'text_length': len(extracted_text),
-                            'job_description': job_description,
-                            'processed_at': datetime.datetime.now().isoformat()
-                        }
-                    }), 200
-
+                        'local_score': local_score,
+                        'metadata': metadata
+                    }
+                    if include_text:
+                        payload['resume_text'] = extracted_text
+                    return jsonify(payload), 200
+
+                except LLMUnavailable as e:
+                    return ai_unavailable_response(e, f"File: {filename}")
                 except Exception as e:
                     log_error("AIAnalysis", str(e), f"File: {filename}")
                     return jsonify({
@@ -250,10 +386,11 @@ def cover_letter():
     """
     Endpoint to generate a cover letter
     job_description is query parameter
-    resume_text is in request body
+    resume_id (from /api/pdf-analysis) or resume_text is in request body
     """
     if request.method == "POST":
         try:
+            model = get_model()
             if not model:
                 return jsonify({
                     'success': False,
@@ -262,7 +399,9 @@ def cover_letter():
                 }), 503
             
 
-            resume_text = request.form.get('resume_text')
+            resume_text, session_expired = resolve_resume_text()
+            if session_expired:
+                return resume_session_expired_response()
             job_description = request.args.get('job_description')
             company_name = request.args.get('company_name', 'Unknown Company')
             hiring_manager_name = request.args.get('hiring_manager_name', '')
@@ -273,9 +412,16 @@ def cover_letter():
                 return jsonify({
                     'success': False,
                     'error': 'No resume text provided',
-                    'output': 'Please provide resume text in the request body'
+                    'output': 'Please provide resume_id or resume text in the request body'
                 }), 400
 
+            # Streaming mode: send the letter as it is generated
+            if wants_stream():
+                return sse_response(
+                    generate_cover_letter_stream(model, job_description, resume_text, company_name, hiring_manager_name, desired_tone),
+                    'cover_letter'
+                )
+
             # Generate cover letter using AI model
             response = generate_cover_letter(model, job_description, resume_text, company_name, hiring_manager_name, desired_tone)
             
@@ -293,6 +439,8 @@ def cover_letter():
                 'timestamp': datetime.datetime.now().isoformat()
             }), 200
 
+        except LLMUnavailable as e:
+            return ai_unavailable_response(e, "cover_letter function")
         except Exception as e:
             log_error("CoverLetterError", str(e), "cover_letter function")
             return jsonify({
@@ -305,8 +453,10 @@ def cover_letter():
 def ats_optimization():
     """
     Endpoint to optimize resume for ATS
+    resume_id (from /api/pdf-analysis) or resume_text is in request body
     """
     try:
+        model = get_model()
         if not model:
             return jsonify({
                 'success': False,
@@ -314,7 +464,9 @@ def ats_optimization():
                 'output': 'Please try again later'
             }), 503
 
-        resume_text = request.form.get('resume_text')
+        resume_text, session_expired = resolve_resume_text()
+        if session_expired:
+            return resume_session_expired_response()
         job_description = request.args.get('job_description', '')
         print(f"Job Description: {job_description}")
 
@@ -323,7 +475,7 @@ def ats_optimization():
             return jsonify({
                 'success': False,
                 'error': 'No resume text provided',
-                'output': 'Please provide resume text in the request body'
+                'output': 'Please provide resume_id or resume text in the request body'
             }), 400
 
         score = generate_ats_score(model, resume_text, job_description)
@@ -337,12 +489,141 @@ def ats_optimization():
         return jsonify({
             'success': True,
             'ats_score': score,
+            'local_score': prescore_ats(resume_text, job_description),
+            'keywords': keyword_report(resume_text, job_description),
             'timestamp': datetime.datetime.now().isoformat()
         }), 200
+    except LLMUnavailable as e:
+        return ai_unavailable_response(e, "ats_optimization function")
     except Exception as e:
         log_error("ATSOptimizationError", str(e), "ats_optimization function")
         return jsonify({
             'success': False,
             'error': 'An unexpected error occurred',
             'message': 'Failed to optimize resume for ATS',
-        }), 500
\ No newline at end of file
+        }), 500
+
+@pdf_bp.route('/ats/batch', methods=['POST'])
+def ats_batch():
+    """
+    Score one resume against many job descriptions.
+    JSON body: {"resume_id" or "resume_text", "job_descriptions": ["...", ...], "llm_top_k": 10}
+    (form posts may repeat the job_descriptions field instead).
+    Every posting gets a local score; the llm_top_k best are re-scored by Gemini.
+    Results come back in request order with a final rank; failed items are reported individually.
+    If none of the shortlisted LLM calls succeed the request fails (503 when the AI
+    service was unavailable) with the local results still attached.
+    """
+    try:
+        model = get_model()
+        if not model:
+            return jsonify({
+                'success': False,
+                'error': 'AI service temporarily unavailable',
+                'output': 'Please try again later'
+            }), 503
+
+        resume_text, session_expired = resolve_resume_text()
+        if session_expired:
+            return resume_session_expired_response()
+        if not resume_text:
+            return jsonify({
+                'success': False,
+                'error': 'No resume text provided',
+                'output': 'Please provide resume_id or resume text in the request body'
+            }), 400
+
+        payload = request.get_json(silent=True) if request.is_json else None
+        if isinstance(payload, dict):
+            job_descriptions = payload.get('job_descriptions') or []
+        else:
+            job_descriptions = request.form.getlist('job_descriptions')
+        if not isinstance(job_descriptions, list) or not all(isinstance(jd, str) for jd in job_descriptions):
+            return jsonify({
+                'success': False,
+                'error': 'Invalid job descriptions',
+                'output': 'job_descriptions must be a list of strings'
+            }), 400
+        job_descriptions = [jd.strip() for jd in job_descriptions]
+        if not job_descriptions or not all(job_descriptions):
+            return jsonify({
+                'success': False,
+                'error': 'No job descriptions provided',
+                'output': 'Please provide at least one non-empty job description'
+            }), 400
+
+        max_jobs = current_app.config['ATS_BATCH_MAX_JOBS']
+        if len(job_descriptions) > max_jobs:
+            return jsonify({
+                'success': False,
+                'error': 'Too many job descriptions',
+                'output': f'At most {max_jobs} job descriptions per request'
+            }), 400
+
+        llm_top_k = current_app.config['ATS_LLM_TOP_K']
+        if isinstance(payload, dict) and payload.get('llm_top_k') is not None:
+            try:
+                llm_top_k = int(payload['llm_top_k'])
+            except (TypeError, ValueError):
+                return jsonify({
+                    'success': False,
+                    'error': 'Invalid llm_top_k',
+                    'output': 'llm_top_k must be an integer'
+                }), 400
+        llm_top_k = max(0, min(llm_top_k, len(job_descriptions)))
+
+        started = datetime.datetime.now()
+        results = generate_ats_scores(model, resume_text, job_descriptions,
+                                      current_app.config['ATS_BATCH_CONCURRENCY'], llm_top_k)
+        failed = sum(1 for result in results if not result['success'])
+        unavailable = sum(1 for result in results if result['error'] == AI_UNAVAILABLE_ERROR)
+        llm_scored = sum(1 for result in results if result['llm_scored'] and result['success'])
+        if failed:
+            log_error("ATSBatch", f"{failed} of {llm_top_k} LLM scores failed ({unavailable} AI unavailable)")
+
+        summary = {
+            'total': len(results),
+            'llm_requested': llm_top_k,
+            'llm_scored': llm_scored,
+            'failed': failed,
+            'llm_unavailable': unavailable > 0,
+            'agreement': score_agreement(
+                [result['local_score'] for result in results],
+                [result['ats_score'] for result in results]
+            ),
+            'seconds': round((datetime.datetime.now() - started).total_seconds(), 3)
+        }
+
+        # No LLM score at all is a failed request; the local scores still come back so the client can show them
+        if llm_top_k and not llm_scored:
+            if unavailable == failed:
+                return jsonify({
+                    'success': False,
+                    'error': AI_UNAVAILABLE_ERROR,
+                    'output': 'The AI service is busy, please try again shortly',
+                    'results': results,
+                    'summary': summary,
+                    'timestamp': datetime.datetime.now().isoformat()
+                }), 503, {'Retry-After': '5'}
+            return jsonify({
+                'success': False,
+                'error': 'ATS score generation failed',
+                'output': 'Failed to generate ATS scores',
+                'results': results,
+                'summary': summary,
+                'timestamp': datetime.datetime.now().isoformat()
+            }), 500
+
+        return jsonify({
+            'success': True,
+            'results': results,
+            'summary': summary,
+            'timestamp': datetime.datetime.now().isoformat()
+        }), 200
+    except Exception as e:
+        log_error("ATSBatchError", str(e), "ats_batch function")
+        return jsonify({
+            'success': False,
+            'error': 'An unexpected error occurred',
+            'output': 'Failed to score job descriptions',
+        }), 500
@@ -0,0 +1,174 @@
+import datetime
+import logging
+import zipfile
+from flask import Blueprint, Response, request, jsonify, current_app, stream_with_context, url_for
+from werkzeug.utils import secure_filename
+
+try:
+    from validation import allowed_file
+    from Controllers import get_model, screening_jobs, read_zip_pdfs, ScreeningLimitExceeded
+    from Controllers.concurrency import sleep
+    from routes.sse import sse_event
+except ImportError as e:
+    logging.error(f"Import error in screening_routes: {e}")
+    raise
+
+# Create blueprint for bulk screening routes
+screening_bp = Blueprint('screening', __name__)
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Progress stream: poll interval and the longest a client may stay connected
+EVENTS_POLL_SECONDS = 0.5
+EVENTS_MAX_SECONDS = 3600
+
+def log_error(error_type, error_message, context=""):
+    """Utility function for consistent error logging"""
+    timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    log_message = f"[{timestamp}] {error_type}: {error_message}"
+    if context:
+        log_message += f" | Context: {context}"
+    logger.error(log_message)
+
+def job_not_found():
+    return jsonify({
+        'success': False,
+        'error': 'Screening job not found',
+        'output': 'The job does not exist or has expired'
+    }), 404
+
+def collect_documents():
+    """
+    [(filename, bytes)] from repeated pdf_files fields and/or one zip_file of PDFs
+    """
+    max_files = current_app.config['SCREENING_MAX_FILES']
+    max_bytes = current_app.config['PDF_MAX_UPLOAD_BYTES']
+    max_total_bytes = current_app.config['SCREENING_MAX_TOTAL_BYTES']
+    documents = []
+    for file in request.files.getlist('pdf_files'):
+        if file and file.filename and allowed_file(file.filename):
+            documents.append((secure_filename(file.filename), file.read()))
+    archive = request.files.get('zip_file')
+    if archive and archive.filename:
+        if not archive.filename.lower().endswith('.zip'):
+            raise ValueError('zip_file must be a .zip archive')
+        uploaded = sum(len(content) for _, content in documents)
+        documents.extend(read_zip_pdfs(archive.read(), max_files, max_bytes, max(1, max_total_bytes - uploaded)))
+    if len(documents) > max_files:
+        raise ScreeningLimitExceeded(f"At most {max_files} PDFs per screening job")
+    if sum(len(content) for _, content in documents) > max_total_bytes:
+        raise ScreeningLimitExceeded(f"At most {max_total_bytes} bytes of PDFs per screening job")
+    return documents
+
+@screening_bp.route('/screening', methods=['POST'])
+def create_screening_job():
+    """
+    Start a bulk screening job: many PDFs (pdf_files, repeated) or a zip (zip_file)
+    ranked against one job_description. Every resume is scored locally and the
+    llm_top_k best (default ATS_LLM_TOP_K) are re-ranked by Gemini.
+    Returns 202 with the job id; poll
+    /api/screening/<job_id> or stream /api/screening/<job_id>/events.
+    """
+    try:
+        model = get_model()
+        if not model:
+            return jsonify({
+                'success': False,
+                'error': 'AI service temporarily unavailable',
+                'output': 'Please try again later'
+            }), 503
+
+        job_description = (request.form.get('job_description') or '').strip()
+        if not job_description:
+            return jsonify({
+                'success': False,
+                'error': 'No job description provided',
+                'output': 'Please provide a job_description'
+            }), 400
+
+        try:
+            documents = collect_documents()
+        except (ValueError, zipfile.BadZipFile) as e:
+            return jsonify({
+                'success': False,
+                'error': 'Invalid upload',
+                'output': str(e)
+            }), 400
+        if not documents:
+            return jsonify({
+                'success': False,
+                'error': 'No PDF files provided',
+                'output': 'Upload PDFs as pdf_files or a zip_file containing PDFs'
+            }), 400
+
+        llm_top_k = request.form.get('llm_top_k', type=int)
+        if llm_top_k is not None:
+            llm_top_k = max(0, llm_top_k)
+        job = screening_jobs.start(model, job_description, documents, llm_top_k=llm_top_k)
+        logger.info(f"Screening job {job.id} started with {job.total} documents")
+        return jsonify({
+            'success': True,
+            'job_id': job.id,
+            'status': job.status,
+            'total': job.total,
+            'status_url': url_for('screening.get_screening_job', job_id=job.id),
+            'events_url': url_for('screening.screening_job_events', job_id=job.id)
+        }), 202
+
+    except ScreeningLimitExceeded as e:
+        log_error("ScreeningLimit", str(e))
+        return jsonify({
+            'success': False,
+            'error': 'Screening limit exceeded',
+            'output': str(e)
+        }), 429, {'Retry-After': '30'}
+    except Exception as e:
+        log_error("ScreeningError", str(e), "create_screening_job function")
+        return jsonify({
+            'success': False,
+            'error': 'An unexpected error occurred',
+            'output': 'Failed to start screening job'
+        }), 500
+
+@screening_bp.route('/screening/<job_id>', methods=['GET'])
+def get_screening_job(job_id):
+    """
+    Progress, the ranked results so far and local/LLM score agreement; ?top=N limits the results
+    """
+    job = screening_jobs.get(job_id)
+    if job is None:
+        return job_not_found()
+    snapshot = job.snapshot()
+    top = request.args.get('top', type=int)
+    if top:
+        snapshot['results'] = snapshot['results'][:top]
+    return jsonify({'success': True, **snapshot}), 200
+
+@screening_bp.route('/screening/<job_id>/events', methods=['GET'])
+def screening_job_events(job_id):
+    """
+    Server-sent events: 'progress' whenever a document finishes, then 'done' with the ranked results
+    """
+    job = screening_jobs.get(job_id)
+    if job is None:
+        return job_not_found()
+
+    def generate():
+        seen = None
+        started = datetime.datetime.now()
+        while (datetime.datetime.now() - started).total_seconds() < EVENTS_MAX_SECONDS:
+            if job.version != seen:
+                seen = job.version
+                yield sse_event('progress', job.progress())
+            if job.finished:
+                yield sse_event('done', job.snapshot())
+                return
+            sleep(EVENTS_POLL_SECONDS)
+        yield sse_event('error', {'success': False, 'error': 'Stream timed out, poll the job instead'})
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
@@ -0,0 +1,58 @@
+import json
+import time
+import logging
+from flask import Response, request, stream_with_context
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+def wants_stream():
+    """
+    True when the client asked for server-sent events (?stream=true or Accept: text/event-stream)
+    """
+    if request.args.get('stream', '').lower() == 'true':
+        return True
+    return 'text/event-stream' in request.headers.get('Accept', '')
+
+def sse_event(event, data):
+    """
+    Format one server-sent event; data is JSON-encoded so chunks may contain newlines
+    """
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+def sse_response(chunks, label, before=None, after=None):
+    """
+    Stream text chunks to the client as server-sent events:
+    an optional 'metadata' event, one 'chunk' event per piece of text, then 'done'
+    (or 'error' if the generator fails). after may be a dict or a callable evaluated
+    once the text is complete; its keys are merged into 'done'.
+    Time-to-first-byte is logged per label.
+    """
+    started = time.perf_counter()
+
+    def generate():
+        first = True
+        length = 0
+        try:
+            if before is not None:
+                yield sse_event('metadata', before)
+            for text in chunks:
+                if first:
+                    logger.info(f"SSE {label} time to first byte: {time.perf_counter() - started:.3f}s")
+                    first = False
+                length += len(text)
+                yield sse_event('chunk', {'text': text})
+            done = {'success': True, 'length': length}
+            if after is not None:
+                done.update(after() if callable(after) else after)
+            yield sse_event('done', done)
+            logger.info(f"SSE {label} finished: {length} chars in {time.perf_counter() - started:.3f}s")
+        except Exception as e:
+            logger.error(f"SSE {label} stream failed: {e}")
+            yield sse_event('error', {'success': False, 'error': 'Generation failed'})
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
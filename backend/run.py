@@ -2,6 +2,9 @@ import os
 import logging
 import sys
 from app import create_app
+from Controllers import start_model_warmup, start_resume_store_worker
+from config import Config
+from gevent import get_hub
 from gevent.pywsgi import WSGIServer
 
 # Configure logging
@@ -35,6 +38,17 @@ def main():
         
         logger.info(f"Starting server on {host}:{port} (debug={debug_mode})")
         
+        # Requests wait on extraction workers and Gemini calls through the hub's
+        # native thread pool; size it so those waits don't queue behind each other
+        get_hub().threadpool.maxsize = int(os.getenv('GEVENT_THREADPOOL_SIZE', 64))
+
+        # The Gemini model is created on first use; warm it up and probe its health in the background
+        start_model_warmup()
+
+        # Structured resume extraction and DB writes are drained from the durable job queue
+        if Config.JOB_QUEUE_WORKER:
+            start_resume_store_worker(app)
+
         # Run the application
         http_server = WSGIServer((host, port), app)
         http_server.serve_forever()
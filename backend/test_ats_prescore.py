@@ -0,0 +1,107 @@
+import math
+from collections import Counter
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from Controllers.ats_prescore import (
+    COSINE_WEIGHT, COVERAGE_WEIGHT, keyword_report, prescore_ats, prescore_matrix,
+    rerank, score_agreement, tokenize, top_k_indices
+)
+
+JOB = "Senior Python developer: Flask, SQLAlchemy, PostgreSQL, Docker and AWS. Kubernetes a plus."
+MATCHING = "Python developer with Flask and SQLAlchemy APIs on PostgreSQL, shipped with Docker on AWS."
+UNRELATED = "Pastry chef: laminated doughs, sourdough, plated desserts and kitchen inventory."
+
+
+def full_vocabulary_scores(resumes, jobs):
+    # Straightforward dense TF-IDF over every term of every document
+    counts = [Counter(tokenize(doc)) for doc in resumes + jobs]
+    df = Counter(term for doc in counts for term in doc)
+    idf = {term: math.log((1 + len(counts)) / (1 + n)) + 1 for term, n in df.items()}
+    weights = [{t: (1 + math.log(c)) * idf[t] for t, c in doc.items()} for doc in counts]
+    resume_w, job_w = weights[:len(resumes)], weights[len(resumes):]
+    scores = []
+    for r in resume_w:
+        row = []
+        for j in job_w:
+            mass = sum(j.values())
+            if not mass:
+                row.append(0.0)
+                continue
+            coverage = sum(w for t, w in j.items() if t in r) / mass
+            norm = math.sqrt(sum(w * w for w in r.values())) * math.sqrt(sum(w * w for w in j.values()))
+            cosine = sum(w * r.get(t, 0.0) for t, w in j.items()) / norm if norm else 0.0
+            row.append(100 * (COVERAGE_WEIGHT * coverage + COSINE_WEIGHT * cosine))
+        scores.append(row)
+    return np.array(scores)
+
+
+def test_prescore_matrix_shape_and_ordering():
+    scores = prescore_matrix([MATCHING, UNRELATED], [JOB, "pastry chef desserts"])
+
+    assert scores.shape == (2, 2)
+    assert scores[0, 0] > scores[1, 0]
+    assert scores[1, 1] > scores[0, 1]
+    assert ((scores >= 0) & (scores <= 100)).all()
+
+
+def test_prescore_matrix_matches_full_vocabulary_tfidf():
+    resumes = [MATCHING, UNRELATED, "Go and Rust engineer, some Python, lots of Docker and Docker Compose."]
+    jobs = [JOB, "Rust systems engineer", "Docker Docker Docker"]
+
+    expected = np.round(np.clip(full_vocabulary_scores(resumes, jobs), 0, 100), 1)
+
+    assert np.allclose(prescore_matrix(resumes, jobs), expected, atol=0.11)
+
+
+def test_prescore_matrix_edge_cases():
+    assert prescore_matrix([], [JOB]).shape == (0, 1)
+    assert prescore_matrix([MATCHING], []).shape == (1, 0)
+    # A posting with nothing but stopwords can't be covered
+    assert prescore_matrix([MATCHING], ["the and of"])[0, 0] == 0.0
+    assert prescore_ats(MATCHING, JOB) == float(prescore_matrix([MATCHING], [JOB])[0, 0])
+
+
+def test_keyword_report_orders_by_frequency_in_the_posting():
+    report = keyword_report("python flask", "docker python docker flask python docker aws")
+
+    assert report['matched'][:2] == ['python', 'flask']
+    assert report['missing'][0] == 'docker'
+    assert 'aws' in report['missing']
+
+
+def test_top_k_indices():
+    assert top_k_indices([10, 30, 20, 30], 2) == [1, 3]
+    assert top_k_indices([1, 2], 5) == [1, 0]
+    assert top_k_indices([1, 2], 0) == []
+
+
+def test_rerank_puts_llm_scored_items_first():
+    local = [90, 80, 70, 60]
+    llm = [None, 50, 95, None]
+
+    assert rerank(local, llm) == [3, 2, 1, 4]
+    assert rerank([5, 5, 9], [None, None, None]) == [2, 3, 1]
+
+
+def test_rerank_keeps_failed_llm_calls_in_the_shortlist_by_local_score():
+    local = [90, 80, 70, 60]
+    llm = [None, 50, 95, None]
+
+    # Item 0 was shortlisted but its LLM call failed: it stays in the top tier on its local 90
+    assert rerank(local, llm, shortlisted=[0, 1, 2]) == [2, 3, 1, 4]
+    # Every LLM call failed: the shortlist falls back to local order, still ahead of the rest
+    assert rerank([10, 90, 50], [None, None, None], shortlisted=[0]) == [1, 2, 3]
+
+
+def test_score_agreement():
+    report = score_agreement([10, 20, 30, None], [15, 25, 40, 50])
+
+    assert report['pairs'] == 3
+    assert report['spearman'] == 1.0
+    assert report['pearson'] > 0.9
+    assert report['mean_abs_diff'] == round((5 + 5 + 10) / 3, 2)
+
+    assert score_agreement([1, 2], [None, None]) == {'pairs': 0, 'spearman': None, 'pearson': None, 'mean_abs_diff': None}
+    assert score_agreement([1, 2, 3], [5, 5, 5])['spearman'] is None
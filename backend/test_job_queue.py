@@ -0,0 +1,109 @@
+import time
+import pytest
+from Controllers.job_queue import JobQueue
+
+
+@pytest.fixture
+def queue(tmp_path):
+    return JobQueue(str(tmp_path / 'jobs.db'), max_attempts=3, retry_backoff=10)
+
+
+def test_lease_claims_oldest_ready_jobs_once(queue):
+    ids = [queue.enqueue('q', {'n': n}) for n in range(3)]
+    queue.enqueue('other', {'n': 99})
+
+    jobs = queue.lease('q', 2, lease_seconds=60)
+
+    assert [job.id for job in jobs] == ids[:2]
+    assert [job.payload for job in jobs] == [{'n': 0}, {'n': 1}]
+    assert all(job.attempts == 1 for job in jobs)
+    assert [job.id for job in queue.lease('q', 10, lease_seconds=60)] == ids[2:]
+    assert queue.lease('q', 10, lease_seconds=60) == []
+
+
+def test_delayed_job_is_not_leased_early(queue):
+    queue.enqueue('q', {}, delay=60)
+    assert queue.lease('q', 10, lease_seconds=60) == []
+
+
+def test_expired_lease_is_handed_out_again(queue):
+    queue.enqueue('q', {})
+    first = queue.lease('q', 1, lease_seconds=0.01)
+    time.sleep(0.05)
+
+    second = queue.lease('q', 1, lease_seconds=60)
+
+    assert [job.id for job in second] == [first[0].id]
+    assert second[0].attempts == 2
+    assert second[0].lease_token != first[0].lease_token
+
+
+def test_job_that_keeps_losing_its_lease_is_parked(queue):
+    queue.enqueue('q', {})
+    for _ in range(3):
+        assert queue.lease('q', 1, lease_seconds=0.01)
+        time.sleep(0.05)
+
+    assert queue.lease('q', 1, lease_seconds=60) == []
+    assert queue.stats('q')['dead'] == 1
+
+
+def test_complete_requires_the_current_lease_token(queue):
+    queue.enqueue('q', {})
+    stale = queue.lease('q', 1, lease_seconds=0.01)
+    time.sleep(0.05)
+    current = queue.lease('q', 1, lease_seconds=60)
+
+    assert queue.complete(stale) == 0
+    assert queue.stats('q')['leased'] == 1
+    assert queue.complete(current) == 1
+    assert queue.stats('q')['leased'] == 0
+
+
+def test_fail_backs_off_exponentially_then_goes_dead(queue):
+    job_id = queue.enqueue('q', {})
+    assert [queue.retry_delay(n) for n in (1, 2, 3)] == [10, 20, 40]
+
+    job = queue.lease('q', 1, lease_seconds=60)[0]
+    before = time.time()
+    assert queue.fail(job, 'boom') == 'queued'
+    # Not ready until the backoff has passed
+    assert queue.lease('q', 1, lease_seconds=60) == []
+    available_at = queue._connect().execute('SELECT available_at FROM jobs WHERE id = ?', (job_id,)).fetchone()[0]
+    assert before + 10 <= available_at <= time.time() + 10
+
+    queue._connect().execute('UPDATE jobs SET available_at = 0')
+    job = queue.lease('q', 1, lease_seconds=60)[0]
+    assert queue.fail(job, 'boom', retry=False) == 'dead'
+    assert queue.stats('q')['dead'] == 1
+
+
+def test_fail_with_a_stale_lease_changes_nothing(queue):
+    queue.enqueue('q', {})
+    stale = queue.lease('q', 1, lease_seconds=0.01)[0]
+    time.sleep(0.05)
+    queue.lease('q', 1, lease_seconds=60)
+
+    queue.fail(stale, 'late failure', retry=False)
+
+    assert queue.stats('q')['leased'] == 1
+    assert queue.stats('q')['dead'] == 0
+
+
+def test_release_does_not_use_up_an_attempt(queue):
+    queue.enqueue('q', {})
+    for _ in range(5):
+        job = queue.lease('q', 1, lease_seconds=60)[0]
+        assert job.attempts == 1
+        queue.release(job, delay=0, error='AI service temporarily unavailable')
+
+    assert queue.stats('q')['queued'] == 1
+
+
+def test_requeue_dead_resets_attempts(queue):
+    queue.enqueue('q', {})
+    queue.fail(queue.lease('q', 1, lease_seconds=60)[0], 'boom', retry=False)
+
+    assert queue.requeue_dead('q') == 1
+    job = queue.lease('q', 1, lease_seconds=60)[0]
+    assert job.attempts == 1
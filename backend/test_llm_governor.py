@@ -0,0 +1,157 @@
+import time
+import pytest
+
+pytest.importorskip('tenacity')
+
+from Controllers.llm_governor import (
+    CallGovernor, CircuitBreaker, CircuitOpenError, LLMOverloaded, LLMUnavailable
+)
+
+
+def make_governor(retry_attempts=3, failure_threshold=5, reset_timeout=60, queue_timeout=0.05, max_concurrency=4):
+    return CallGovernor(
+        max_concurrency=max_concurrency,
+        endpoint_limits={},
+        default_endpoint_limit=max_concurrency,
+        queue_timeout=queue_timeout,
+        retry_attempts=retry_attempts,
+        retry_max_wait=0,
+        breaker=CircuitBreaker(failure_threshold, reset_timeout),
+    )
+
+
+class Flaky:
+    """Raises the given errors in order, then returns 'ok'"""
+
+    def __init__(self, *errors):
+        self.errors = list(errors)
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return 'ok'
+
+
+def test_breaker_opens_after_threshold_and_rejects():
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+
+    breaker.before_call()
+    breaker.record_failure()
+    breaker.before_call()
+    breaker.record_failure()
+
+    with pytest.raises(CircuitOpenError) as raised:
+        breaker.before_call()
+    assert raised.value.retry_after >= 1
+    assert breaker.stats()['state'] == 'open'
+    assert breaker.stats()['rejected'] == 1
+
+
+def test_breaker_half_open_lets_one_trial_through_and_closes_on_success():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.05)
+    breaker.record_failure()
+    time.sleep(0.06)
+
+    assert breaker.stats()['state'] == 'half_open'
+    breaker.before_call()
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+    breaker.record_success()
+    assert breaker.stats()['state'] == 'closed'
+    breaker.before_call()
+
+
+def test_breaker_failed_trial_reopens():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.05)
+    breaker.record_failure()
+    time.sleep(0.06)
+
+    breaker.before_call()
+    breaker.record_failure()
+
+    assert breaker.stats()['state'] == 'open'
+    assert breaker.stats()['opened'] == 2
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+
+def test_breaker_released_trial_can_be_taken_again():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.05)
+    breaker.record_failure()
+    time.sleep(0.06)
+
+    breaker.before_call()
+    breaker.release_trial()
+    breaker.before_call()
+
+
+def test_governor_retries_retryable_errors_then_succeeds():
+    governor = make_governor(retry_attempts=3)
+    fn = Flaky(ConnectionError('reset'), TimeoutError('slow'))
+
+    assert governor.call('ats', fn) == 'ok'
+    assert fn.calls == 3
+    stats = governor.stats()
+    assert stats['retries'] == 2
+    assert stats['succeeded'] == 1
+    assert stats['breaker']['state'] == 'closed'
+
+
+def test_governor_gives_up_with_llm_unavailable():
+    governor = make_governor(retry_attempts=2)
+    fn = Flaky(ConnectionError('down'), ConnectionError('down'), ConnectionError('down'))
+
+    with pytest.raises(LLMUnavailable):
+        governor.call('ats', fn)
+    assert fn.calls == 2
+    assert governor.stats()['failed'] == 1
+    assert governor.stats()['breaker']['consecutive_failures'] == 2
+
+
+def test_governor_does_not_retry_other_errors():
+    governor = make_governor(retry_attempts=3)
+    fn = Flaky(ValueError('bad prompt'))
+
+    with pytest.raises(ValueError):
+        governor.call('ats', fn)
+    assert fn.calls == 1
+    assert governor.stats()['retries'] == 0
+    # The service answered, so it counts as up
+    assert governor.stats()['breaker']['consecutive_failures'] == 0
+
+
+def test_governor_short_circuits_while_breaker_is_open():
+    governor = make_governor(retry_attempts=1, failure_threshold=1)
+    with pytest.raises(LLMUnavailable):
+        governor.call('ats', Flaky(ConnectionError('down')))
+
+    fn = Flaky()
+    with pytest.raises(CircuitOpenError):
+        governor.call('ats', fn)
+    assert fn.calls == 0
+    assert governor.stats()['short_circuited'] == 1
+
+
+def test_governor_recovers_through_half_open_trial():
+    governor = make_governor(retry_attempts=1, failure_threshold=1, reset_timeout=0.05)
+    with pytest.raises(LLMUnavailable):
+        governor.call('ats', Flaky(ConnectionError('down')))
+    time.sleep(0.06)
+
+    assert governor.call('ats', Flaky()) == 'ok'
+    assert governor.stats()['breaker']['state'] == 'closed'
+
+
+def test_governor_overloaded_when_no_slot_frees_up():
+    governor = make_governor(max_concurrency=1, queue_timeout=0.05)
+    fn = Flaky()
+
+    with governor.slot('ats'):
+        with pytest.raises(LLMOverloaded):
+            governor.call('ats', fn)
+    assert fn.calls == 0
+    assert governor.stats()['overloaded'] == 1
+    assert governor.call('ats', fn) == 'ok'
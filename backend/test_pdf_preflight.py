@@ -0,0 +1,79 @@
+import pytest
+
+pytest.importorskip('pdfplumber')
+
+from validation.pdf_preflight import preflight_pdf
+
+
+def make_pdf(pages=2, trailer_extra=b''):
+    """
+    A minimal valid PDF with correct xref offsets and one line of text per page
+    """
+    kids = ' '.join(f'{3 + 2 * i} 0 R' for i in range(pages))
+    objects = [
+        b'<< /Type /Catalog /Pages 2 0 R >>',
+        f'<< /Type /Pages /Kids [{kids}] /Count {pages} >>'.encode(),
+    ]
+    font = 3 + 2 * pages
+    for i in range(pages):
+        content = f'BT /F1 12 Tf 72 720 Td (Page {i + 1}) Tj ET'.encode()
+        objects.append(
+            f'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents {4 + 2 * i} 0 R '
+            f'/Resources << /Font << /F1 {font} 0 R >> >> >>'.encode()
+        )
+        objects.append(b'<< /Length %d >>\nstream\n' % len(content) + content + b'\nendstream')
+    objects.append(b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>')
+
+    out = bytearray(b'%PDF-1.4\n')
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b'%d 0 obj\n' % number + body + b'\nendobj\n'
+    xref = len(out)
+    out += b'xref\n0 %d\n0000000000 65535 f \n' % (len(objects) + 1)
+    for offset in offsets:
+        out += b'%010d 00000 n \n' % offset
+    out += b'trailer\n<< /Size %d /Root 1 0 R %s>>\nstartxref\n%d\n%%%%EOF\n' % (len(objects) + 1, trailer_extra, xref)
+    return bytes(out)
+
+
+def test_valid_pdf_passes_with_parsed_page_count():
+    report = preflight_pdf(make_pdf(pages=2))
+
+    assert report['valid'], report['error']
+    assert report['page_count'] == 2
+    assert report['text_layer'] is True
+    assert report['warnings'] == []
+
+
+def test_trailing_bytes_after_eof_are_a_warning_when_the_file_opens():
+    report = preflight_pdf(make_pdf(pages=2) + b'\0' * 5000)
+
+    assert report['valid'], report['error']
+    assert report['page_count'] == 2
+    assert report['warnings'] == ['PDF is truncated (no end-of-file marker)']
+
+
+def test_truncated_pdf_that_does_not_open_is_rejected():
+    report = preflight_pdf(make_pdf(pages=2)[:40])
+
+    assert not report['valid']
+    assert report['error'] == 'PDF is truncated (no end-of-file marker)'
+
+
+def test_orphaned_page_objects_do_not_inflate_the_page_count():
+    # Readers ignore bytes after %%EOF, the byte scan still sees two more /Type /Page
+    report = preflight_pdf(make_pdf(pages=1) + b'% << /Type /Page >> << /Type /Page >>\n')
+
+    assert report['page_count'] == 1
+
+
+@pytest.mark.parametrize('data, error', [
+    (b'', 'File is empty'),
+    (b'hello world', 'Not a PDF file'),
+])
+def test_junk_is_rejected(data, error):
+    report = preflight_pdf(data)
+
+    assert not report['valid']
+    assert report['error'] == error
@@ -0,0 +1,122 @@
+import pytest
+
+pytest.importorskip('flask_sqlalchemy')
+
+import Controllers.resume_persistence as persistence
+from Controllers.resume_persistence import ResumeBatchWriter, upsert_resume, upsert_resumes, upsert_statement
+from models import db, ResumeData
+
+
+def resume(email, name='Ada', **fields):
+    return {'name': name, 'email': email, **fields}
+
+
+def stored():
+    return {row.email: row for row in ResumeData.query.order_by(ResumeData.id).all()}
+
+
+def test_upsert_statement_only_for_dialects_with_on_conflict():
+    rows = [resume('ada@example.com')]
+
+    assert upsert_statement(rows, 'mysql') is None
+    for dialect in ('sqlite', 'postgresql'):
+        assert 'ON CONFLICT' in str(upsert_statement(rows, dialect)).upper()
+
+
+def test_upsert_inserts_then_updates_in_place(app):
+    upsert_resume(resume('ada@example.com', skills='python'))
+    first = stored()['ada@example.com']
+    first_id, first_created = first.id, first.created_at
+
+    upsert_resume(resume('ada@example.com', name='Ada L.', skills='rust'))
+    db.session.expire_all()
+
+    rows = stored()
+    assert len(rows) == 1
+    assert rows['ada@example.com'].id == first_id
+    assert rows['ada@example.com'].created_at == first_created
+    assert rows['ada@example.com'].name == 'Ada L.'
+    assert rows['ada@example.com'].skills == 'rust'
+
+
+def test_upsert_batch_keeps_the_last_row_per_email(app):
+    written = upsert_resumes([
+        resume('ada@example.com', skills='python'),
+        resume('bob@example.com'),
+        resume('ada@example.com', skills='go'),
+    ])
+
+    assert written == 2
+    assert stored()['ada@example.com'].skills == 'go'
+
+
+def test_upsert_rejects_rows_without_email_and_clips_long_values(app):
+    with pytest.raises(ValueError):
+        upsert_resumes([resume('ada@example.com'), resume(None)])
+    assert stored() == {}
+
+    upsert_resume(resume('ada@example.com', phone='1' * 50))
+    assert len(stored()['ada@example.com'].phone) == ResumeData.__table__.c.phone.type.length
+
+
+def test_fallback_path_inserts_and_updates(app, monkeypatch):
+    monkeypatch.setattr(persistence, 'upsert_statement', lambda rows, dialect: None)
+
+    upsert_resume(resume('ada@example.com', skills='python'))
+    upsert_resume(resume('ada@example.com', skills='rust'))
+
+    rows = stored()
+    assert len(rows) == 1
+    assert rows['ada@example.com'].skills == 'rust'
+
+
+def test_batch_writer_flushes_on_size_and_on_flush(app):
+    writer = ResumeBatchWriter(max_rows=2, max_delay=float('inf'))
+
+    writer.add(resume('a@example.com'))
+    assert stored() == {}
+    writer.add(resume('b@example.com'))
+    assert set(stored()) == {'a@example.com', 'b@example.com'}
+
+    writer.add(resume('c@example.com'))
+    assert writer.stats()['buffered'] == 1
+    assert writer.flush() == 1
+    assert writer.stats() == {'added': 3, 'written': 3, 'flushes': 2, 'failed_flushes': 0, 'buffered': 0}
+    assert writer.flush() == 0
+
+
+def test_batch_writer_flushes_when_the_oldest_row_is_due(app):
+    writer = ResumeBatchWriter(max_rows=100, max_delay=0)
+
+    writer.add(resume('a@example.com'))
+
+    assert set(stored()) == {'a@example.com'}
+
+
+def test_batch_writer_puts_rows_back_when_a_flush_fails(app, monkeypatch):
+    writer = ResumeBatchWriter(max_rows=100, max_delay=float('inf'))
+    writer.add(resume('a@example.com'))
+    writer.add(resume('b@example.com'))
+
+    def broken(rows):
+        raise RuntimeError('database is locked')
+
+    with monkeypatch.context() as patched:
+        patched.setattr(persistence, 'upsert_resumes', broken)
+        with pytest.raises(RuntimeError):
+            writer.flush()
+    assert writer.stats()['buffered'] == 2
+    assert writer.stats()['failed_flushes'] == 1
+    assert stored() == {}
+
+    writer.add(resume('c@example.com'))
+    assert writer.flush() == 3
+    assert set(stored()) == {'a@example.com', 'b@example.com', 'c@example.com'}
+
+
+def test_batch_writer_context_manager_flushes_on_exit(app):
+    with ResumeBatchWriter(max_rows=100, max_delay=float('inf')) as writer:
+        writer.add(resume('a@example.com'))
+        assert stored() == {}
+
+    assert set(stored()) == {'a@example.com'}
@@ -0,0 +1,115 @@
+import pytest
+
+pytest.importorskip('flask_sqlalchemy')
+
+import models.resume_search as resume_search
+from Controllers.resume_persistence import upsert_resume, upsert_resumes
+from models import db, ResumeData, ensure_search_index, search_resumes
+
+
+def resume(email, skills, **fields):
+    return {'name': 'Ada', 'email': email, 'skills': skills, **fields}
+
+
+def matched_skills(query, **options):
+    return sorted(result['skills'] for result in search_resumes(db.engine, query, **options)['results'])
+
+
+@pytest.fixture
+def indexed(app):
+    if not ensure_search_index(db.engine):
+        pytest.skip('SQLite build without FTS5')
+    return app
+
+
+def test_index_follows_inserts_upserts_and_deletes(indexed):
+    upsert_resume(resume('ada@example.com', 'python flask'))
+    found = search_resumes(db.engine, 'python')
+    assert found['engine'] == 'fts5'
+    assert found['total'] == 1
+    assert found['results'][0]['score'] is not None
+    assert '[python]' in found['results'][0]['snippet']
+
+    # ON CONFLICT DO UPDATE fires the update trigger, not a second insert
+    upsert_resume(resume('ada@example.com', 'rust tokio'))
+    assert search_resumes(db.engine, 'python')['total'] == 0
+    assert matched_skills('rust') == ['rust tokio']
+
+    db.session.delete(ResumeData.query.filter_by(email='ada@example.com').one())
+    db.session.commit()
+    assert search_resumes(db.engine, 'rust')['total'] == 0
+
+
+def test_index_picks_up_rows_written_before_it_existed(app):
+    upsert_resume(resume('ada@example.com', 'python'))
+
+    if not ensure_search_index(db.engine):
+        pytest.skip('SQLite build without FTS5')
+
+    assert matched_skills('python') == ['python']
+
+
+def test_results_never_expose_contact_details(indexed):
+    upsert_resume(resume('ada@example.com', 'python', phone='555-0100'))
+
+    result = search_resumes(db.engine, 'python')['results'][0]
+
+    assert set(result) == set(resume_search.RESULT_COLUMNS) | {'score', 'snippet'}
+
+
+def test_match_all_any_and_prefix(indexed):
+    upsert_resumes([
+        resume('a@example.com', 'python flask'),
+        resume('b@example.com', 'python django'),
+        resume('c@example.com', 'c++ qt'),
+    ])
+
+    assert matched_skills('python flask') == ['python flask']
+    assert matched_skills('flask django', match_all=False) == ['python django', 'python flask']
+    assert matched_skills('pyth') == []
+    assert matched_skills('pyth', prefix=True) == ['python django', 'python flask']
+    assert matched_skills('C++') == ['c++ qt']
+    assert search_resumes(db.engine, '"*" OR')['terms'] == ['or']
+
+
+def test_like_fallback_finds_the_same_rows(app, monkeypatch):
+    upsert_resumes([
+        resume('a@example.com', 'python flask'),
+        resume('b@example.com', 'python django'),
+        resume('c@example.com', 'rust'),
+    ])
+    monkeypatch.setattr(resume_search, '_indexed', set())
+
+    found = search_resumes(db.engine, 'python')
+
+    assert found['engine'] == 'like'
+    assert sorted(result['skills'] for result in found['results']) == ['python django', 'python flask']
+    assert all(result['score'] is None and result['snippet'] is None for result in found['results'])
+    assert matched_skills('python flask') == ['python flask']
+    assert matched_skills('flask rust', match_all=False) == ['python flask', 'rust']
+
+
+@pytest.mark.parametrize('use_index', [True, False])
+def test_pagination(app, monkeypatch, use_index):
+    upsert_resumes([resume(f'{n}@example.com', f'python {n}') for n in range(5)])
+    if use_index:
+        if not ensure_search_index(db.engine):
+            pytest.skip('SQLite build without FTS5')
+    else:
+        monkeypatch.setattr(resume_search, '_indexed', set())
+
+    pages = [search_resumes(db.engine, 'python', page=page, per_page=2) for page in (1, 2, 3, 4)]
+
+    assert [page['total'] for page in pages] == [5] * 4
+    assert [page['pages'] for page in pages] == [3] * 4
+    assert [len(page['results']) for page in pages] == [2, 2, 1, 0]
+    ids = [result['id'] for page in pages for result in page['results']]
+    assert sorted(ids) == sorted(row.id for row in ResumeData.query.all())
+
+
+def test_empty_query_returns_no_results(app):
+    found = search_resumes(db.engine, '  !!  ')
+
+    assert found['terms'] == []
+    assert found['total'] == 0
+    assert found['results'] == []
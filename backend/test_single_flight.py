@@ -0,0 +1,87 @@
+import time
+import threading
+import pytest
+from Controllers.concurrency import SingleFlight
+
+
+def run_in_thread(fn, *args):
+    outcome = {}
+
+    def target():
+        try:
+            outcome['result'] = fn(*args)
+        except Exception as e:
+            outcome['error'] = e
+
+    thread = threading.Thread(target=target)
+    thread.start()
+    return thread, outcome
+
+
+def wait_until(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, 'timed out waiting for condition'
+        time.sleep(0.005)
+
+
+def test_concurrent_callers_share_one_call():
+    flight = SingleFlight()
+    started, release = threading.Event(), threading.Event()
+    calls = []
+
+    def work():
+        calls.append(1)
+        started.set()
+        release.wait(2)
+        return 'answer'
+
+    leader, leader_outcome = run_in_thread(flight.do, 'key', work)
+    started.wait(2)
+    follower, follower_outcome = run_in_thread(flight.do, 'key', work)
+    wait_until(lambda: flight.stats()['coalesced'] == 1)
+    release.set()
+    leader.join(2)
+    follower.join(2)
+
+    assert leader_outcome['result'] == ('answer', False)
+    assert follower_outcome['result'] == ('answer', True)
+    assert len(calls) == 1
+    assert flight.stats() == {'leaders': 1, 'coalesced': 1, 'in_flight': 0}
+
+
+def test_leader_exception_reaches_every_caller():
+    flight = SingleFlight()
+    started, release = threading.Event(), threading.Event()
+
+    def work():
+        started.set()
+        release.wait(2)
+        raise ConnectionError('down')
+
+    leader, leader_outcome = run_in_thread(flight.do, 'key', work)
+    started.wait(2)
+    follower, follower_outcome = run_in_thread(flight.do, 'key', work)
+    wait_until(lambda: flight.stats()['coalesced'] == 1)
+    release.set()
+    leader.join(2)
+    follower.join(2)
+
+    assert isinstance(leader_outcome['error'], ConnectionError)
+    assert isinstance(follower_outcome['error'], ConnectionError)
+
+
+def test_nothing_is_remembered_after_the_call():
+    flight = SingleFlight()
+    calls = []
+
+    def work(value):
+        calls.append(value)
+        return value
+
+    assert flight.do('key', work, 1) == (1, False)
+    assert flight.do('key', work, 2) == (2, False)
+    assert calls == [1, 2]
+    with pytest.raises(KeyError):
+        flight.do('other', {}.__getitem__, 'missing')
+    assert flight.stats()['in_flight'] == 0
@@ -20,11 +20,18 @@ except ImportError as e:
     logger.error(f"Failed to import upload validation functions: {e}")
     raise
 
+try:
+    from .pdf_preflight import preflight_pdf
+except ImportError as e:
+    logger.error(f"Failed to import PDF preflight validation: {e}")
+    raise
+
 # Export functions for easy import
 __all__ = [
     "clean_json_response",
     "extract_basic_info_fallback", 
     "is_valid_email",
     "is_valid_phone",
-    "allowed_file"
+    "allowed_file",
+    "preflight_pdf"
 ]
\ No newline at end of file
@@ -0,0 +1,176 @@
+import io
+import re
+import logging
+import pdfplumber
+from config import Config
+
+try:
+    import pypdfium2 as pdfium
+except ImportError:  # pragma: no cover - pinned in requirements, optional at runtime
+    pdfium = None
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# The header may be preceded by up to 1KB of junk, the trailer is expected in the last few KB
+HEADER_WINDOW = 1024
+TRAILER_WINDOW = 4096
+XREF_SLACK = 64
+
+_HEADER_RE = re.compile(rb'%PDF-(\d\.\d)')
+_STARTXREF_RE = re.compile(rb'startxref\s+(\d+)\s+%%EOF')
+_XREF_TARGET_RE = re.compile(rb'\s*(xref|\d+\s+\d+\s+obj)')
+_PAGE_RE = re.compile(rb'/Type\s*/Page(?![A-Za-z])')
+_IMAGE_RE = re.compile(rb'/Subtype\s*/Image')
+_WIDTH_RE = re.compile(rb'/Width\s+(\d+)')
+_HEIGHT_RE = re.compile(rb'/Height\s+(\d+)')
+
+def _reject(report, error):
+    report['valid'] = False
+    report['error'] = error
+    logger.warning(f"PDF rejected by preflight: {error}")
+    return report
+
+def _xref_at(data, offset):
+    """
+    True if a classic xref table or an xref stream object starts at (or, for
+    writers with slightly-off offsets, just around) the startxref offset
+    """
+    if _XREF_TARGET_RE.match(data, offset):
+        return True
+    window = data[max(0, offset - XREF_SLACK):offset + XREF_SLACK]
+    return b'xref' in window or re.search(rb'\d+\s+\d+\s+obj', window) is not None
+
+def _parsed_page_count(data):
+    """
+    Page count from an actual parse (pdfium, then pdfplumber), opening with an
+    empty password so owner-password-only PDFs still count. None if neither can open it.
+    """
+    if pdfium is not None:
+        try:
+            pdf = pdfium.PdfDocument(data)
+            try:
+                return len(pdf)
+            finally:
+                pdf.close()
+        except Exception as e:
+            logger.debug(f"pdfium could not open the PDF: {e}")
+    try:
+        with pdfplumber.open(io.BytesIO(data), password='') as pdf:
+            return len(pdf.pages)
+    except Exception as e:
+        logger.debug(f"pdfplumber could not open the PDF: {e}")
+    return None
+
+def _declared_image_sizes(data):
+    """
+    (width, height) of every image XObject whose dictionary is stored uncompressed
+    """
+    sizes = []
+    for match in _IMAGE_RE.finditer(data):
+        start = data.rfind(b'<<', 0, match.start())
+        end = data.find(b'>>', match.end())
+        if start == -1 or end == -1:
+            continue
+        dictionary = data[start:end]
+        width = _WIDTH_RE.search(dictionary)
+        height = _HEIGHT_RE.search(dictionary)
+        if width and height:
+            sizes.append((int(width.group(1)), int(height.group(1))))
+    return sizes
+
+def preflight_pdf(data):
+    """
+    Cheap structural checks on raw PDF bytes before any full parse: header magic,
+    trailer/startxref, encryption, page count and declared image sizes.
+    The page count from the byte scan is only a hint (it also counts orphaned
+    page objects); it is replaced by the parser's count whenever the file opens.
+
+    Returns a report dict. report['valid'] is False with report['error'] set for
+    uploads that should be rejected; structural problems the parser copes with
+    (e.g. junk after %%EOF) are listed in report['warnings']. The remaining keys
+    are hints for the extractor (page_count and text_layer are None when they
+    can't be told without a full parse, e.g. when objects live in compressed
+    object streams).
+    """
+    report = {
+        'valid': True,
+        'error': None,
+        'version': None,
+        'size': len(data) if data else 0,
+        'encrypted': False,
+        'page_count': None,
+        'text_layer': None,
+        'image_count': 0,
+        'max_image_pixels': 0,
+        'warnings': []
+    }
+
+    try:
+        if not data:
+            return _reject(report, 'File is empty')
+
+        if report['size'] > Config.PDF_MAX_UPLOAD_BYTES:
+            return _reject(report, f"File is larger than {Config.PDF_MAX_UPLOAD_BYTES // (1024 * 1024)}MB")
+
+        header = _HEADER_RE.search(data[:HEADER_WINDOW])
+        if not header:
+            return _reject(report, 'Not a PDF file')
+        report['version'] = header.group(1).decode('ascii')
+
+        parsed_page_count = _parsed_page_count(data)
+
+        # Trailer problems are only fatal if the parser can't open the file either:
+        # writers (and mail gateways) often append bytes after %%EOF, which readers ignore
+        tail = data[-TRAILER_WINDOW:]
+        xref_offset = None
+        trailer_error = None
+        startxrefs = _STARTXREF_RE.findall(tail)
+        if b'%%EOF' not in tail:
+            trailer_error = 'PDF is truncated (no end-of-file marker)'
+        elif not startxrefs:
+            trailer_error = 'PDF trailer is missing startxref'
+        else:
+            xref_offset = int(startxrefs[-1])
+            if xref_offset >= report['size'] or not _xref_at(data, xref_offset):
+                trailer_error = 'PDF cross-reference table is corrupt'
+                xref_offset = None
+        if trailer_error:
+            if parsed_page_count is None:
+                return _reject(report, trailer_error)
+            report['warnings'].append(trailer_error)
+            logger.warning(f"PDF preflight: {trailer_error}, but the file opens; accepting it")
+
+        # The encryption dictionary is referenced from the trailer (or the xref stream dictionary).
+        # PDFs with only an owner password open with an empty one and are fine to read.
+        trailer = data[xref_offset:xref_offset + TRAILER_WINDOW] if xref_offset is not None else b''
+        if b'/Encrypt' in tail or b'/Encrypt' in trailer:
+            report['encrypted'] = True
+            if parsed_page_count is None:
+                return _reject(report, 'Password-protected PDFs are not supported')
+
+        # Object streams hide page and font dictionaries from a byte scan
+        has_object_streams = b'/ObjStm' in data
+
+        page_count = parsed_page_count if parsed_page_count is not None else len(_PAGE_RE.findall(data))
+        if page_count:
+            report['page_count'] = page_count
+        elif parsed_page_count is not None or not has_object_streams:
+            return _reject(report, 'PDF has no pages')
+
+        if b'/Font' in data:
+            report['text_layer'] = True
+        elif not has_object_streams:
+            report['text_layer'] = False
+
+        sizes = _declared_image_sizes(data)
+        report['image_count'] = len(sizes)
+        report['max_image_pixels'] = max((w * h for w, h in sizes), default=0)
+        if report['max_image_pixels'] > Config.PDF_MAX_IMAGE_PIXELS:
+            return _reject(report, 'PDF contains an image that is too large to process')
+
+        return report
+
+    except Exception as e:
+        logger.error(f"Error in preflight_pdf: {e}")
+        return _reject(report, 'PDF could not be validated')
@@ -18,8 +18,8 @@ const Analys = () => {
   useEffect(() => {
     const savedMessage = localStorage.getItem('message');
     const savedFileName = localStorage.getItem('last_pdf_filename');
-    const savedResumeText = localStorage.getItem('resume_text');
-    if (savedMessage && savedResumeText && savedFileName) {
+    const savedResumeId = localStorage.getItem('resume_id');
+    if (savedMessage && savedResumeId && savedFileName) {
       setLastMessage(savedMessage);
       setLastFileName(savedFileName);
       // setLastResumeText(savedResumeText);
@@ -79,7 +79,9 @@ const Analys = () => {
       // Store message and file name in localStorage
       localStorage.setItem('message', response.data.output || '');
       localStorage.setItem('last_pdf_filename', pdfFile.name);
-      localStorage.setItem('resume_text', response.data.resume_text || '');
+      // Follow-up pages send this id; the extracted text stays on the server
+      localStorage.setItem('resume_id', response.data.resume_id || '');
+      localStorage.removeItem('resume_text');
       setLastMessage(response.data.output || '');
       setLastFileName(pdfFile.name);
       // setLastResumeText(response.data.resume_text || '');
@@ -123,9 +123,9 @@ const AtsScore = () => {
   const [loading, setLoading] = useState(false);
   const [error, setError] = useState<string | null>(null);
 
-  const resumeText = localStorage.getItem('resume_text');
+  const resumeId = localStorage.getItem('resume_id');
   const lastMessage = localStorage.getItem('message');
-  const missingResume = !resumeText || !lastMessage;
+  const missingResume = !resumeId || !lastMessage;
 
   if (missingResume) {
     return (
@@ -157,8 +157,8 @@ const AtsScore = () => {
     setError(null);
     setScore(null);
     
-    const resumeText = localStorage.getItem('resume_text');
-    if (!resumeText) {
+    const resumeId = localStorage.getItem('resume_id');
+    if (!resumeId) {
       setError('Please analyze your resume first on the Analysis page.');
       setLoading(false);
       return;
@@ -171,7 +171,7 @@ const AtsScore = () => {
     localStorage.setItem('job_description', jobDescription);
     try {
       const formData = new FormData();
-      formData.append('resume_text', resumeText);
+      formData.append('resume_id', resumeId);
       const res = await axios.post(`/api/ats?job_description=${encodeURIComponent(jobDescription)}`,
         formData
       );
@@ -181,7 +181,13 @@ const AtsScore = () => {
         setError('Failed to get ATS score.');
       }
     } catch (err: any) {
-      setError(err.response?.data?.message || err.message || 'An error occurred.');
+      if (err.response?.status === 404) {
+        // The server-side resume session expired; the resume has to be analyzed again
+        localStorage.removeItem('resume_id');
+        setError('Your resume session expired. Please analyze your resume again on the Analysis page.');
+      } else {
+        setError(err.response?.data?.message || err.message || 'An error occurred.');
+      }
     } finally {
       setLoading(false);
     }
@@ -8,18 +8,17 @@ export default function CoverLatter() {
   const [companyName, setCompanyName] = useState('');
   const [hiringManagerName, setHiringManagerName] = useState('');
   const [desiredTone, setDesiredTone] = useState('');
-  const [resumeText, setResumeText] = useState<string | null>(null);
+  const [resumeId, setResumeId] = useState<string | null>(null);
   const [coverLetter, setCoverLetter] = useState<string | null>(null);
   const [loading, setLoading] = useState(false);
   const [error, setError] = useState<string | null>(null);
   const [copied, setCopied] = useState(false);
 
   useEffect(() => {
-    const storedResume = localStorage.getItem('resume_text');
-    setResumeText(storedResume);
+    setResumeId(localStorage.getItem('resume_id'));
   }, []);
 
-  const missingResume = !localStorage.getItem('resume_text') || !localStorage.getItem('message');
+  const missingResume = !localStorage.getItem('resume_id') || !localStorage.getItem('message');
   if (missingResume) {
     return (
       <div className="min-h-screen flex flex-col items-center justify-center bg-gradient-to-br from-gray-900 via-gray-800 to-black text-white pt-24 px-2">
@@ -52,7 +51,7 @@ export default function CoverLatter() {
       if (hiringManagerName) params.append('hiring_manager_name', hiringManagerName);
       if (desiredTone) params.append('desired_tone', desiredTone);
       const formData = new FormData();
-      formData.append('resume_text', resumeText || '');
+      formData.append('resume_id', resumeId || '');
       const response = await axios.post(
         `/api/cover_letter?${params.toString()}`,
         formData
@@ -73,7 +72,13 @@ export default function CoverLatter() {
         setError('Failed to generate cover letter.');
       }
     } catch (err: any) {
-      setError(err.response?.data?.message || err.message || 'An error occurred.');
+      if (err.response?.status === 404) {
+        // The server-side resume session expired; the resume has to be analyzed again
+        localStorage.removeItem('resume_id');
+        setError('Your resume session expired. Please analyze your resume again on the Analysis page.');
+      } else {
+        setError(err.response?.data?.message || err.message || 'An error occurred.');
+      }
     } finally {
       setLoading(false);
     }
@@ -91,7 +96,7 @@ export default function CoverLatter() {
     <div className="min-h-screen flex flex-col items-center justify-center bg-gradient-to-br from-gray-900 via-gray-800 to-black text-white pt-24 px-2">
       <SpotlightCard className="w-full max-w-3xl bg-gray-900/80 rounded-2xl shadow-2xl p-8 border border-gray-800">
         <h1 className="text-3xl font-bold text-purple-400 mb-6 text-center">Generate Cover Letter</h1>
-        {!resumeText ? (
+        {!resumeId ? (
           <div className="text-center text-lg text-red-400 font-semibold py-12">
             Please analyze your resume first on the <a href="/analys" className="underline text-purple-400">Analysis</a> page before generating a cover letter.
           </div>